@@ -0,0 +1,10 @@
+from django.apps import AppConfig  # type: ignore
+
+
+class CoreConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core'
+
+    def ready(self):
+        # Signal handlers live alongside the Celery tasks
+        from . import tasks  # noqa: F401
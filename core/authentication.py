@@ -0,0 +1,148 @@
+"""
+JWT authentication that resolves users from a cache.
+
+simplejwt's ``JWTAuthentication`` loads the whole ``User`` row on every
+request. ``CachedJWTAuthentication`` builds the user from the few columns
+request handling reads (``CACHED_USER_FIELDS``), looked up first in a small
+per-process LRU, then in Redis, and only then in the database. Every other
+column is deferred: reading one loads them all in a single query (see
+``User.refresh_from_db``).
+
+Saving or deleting a user drops its Redis entry and this process's copy.
+Other processes keep theirs for at most ``AUTH_USER_LOCAL_CACHE_TIMEOUT``
+seconds, which bounds how long a deactivated user can keep making requests.
+Queryset ``update()`` calls skip the signal; Redis entries then expire after
+``AUTH_USER_CACHE_TIMEOUT``.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+
+from django.conf import settings  # type: ignore
+from django.core.cache import cache  # type: ignore
+from django.db import router, transaction  # type: ignore
+from django.utils.translation import gettext_lazy as _  # type: ignore
+from drf_spectacular.contrib.rest_framework_simplejwt import SimpleJWTScheme  # type: ignore
+from rest_framework_simplejwt.authentication import JWTAuthentication  # type: ignore
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken  # type: ignore
+from rest_framework_simplejwt.settings import api_settings  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+USER_CACHE_NAMESPACE = 'auth:user'
+# What permissions and views read from request.user without loading the row
+CACHED_USER_FIELDS = frozenset(('id', 'username', 'user_type', 'is_active', 'is_staff', 'is_superuser'))
+LOCAL_CACHE_SIZE = 1024
+
+
+class LocalCache:
+    """A small LRU of recently resolved users, private to this process."""
+
+    def __init__(self, size):
+        self.size = size
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout):
+        with self.lock:
+            self.entries[key] = (time.monotonic() + timeout, value)
+            self.entries.move_to_end(key)
+            if len(self.entries) > self.size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+
+local_users = LocalCache(LOCAL_CACHE_SIZE)
+
+
+@lru_cache(maxsize=None)
+def _columns():
+    from .models import User
+
+    # Model.from_db takes values in concrete field order
+    return tuple(f.attname for f in User._meta.concrete_fields if f.attname in CACHED_USER_FIELDS)
+
+
+def _key(user_id):
+    return f'{USER_CACHE_NAMESPACE}:{user_id}'
+
+
+def _load(user_id):
+    from .models import User
+
+    key = _key(user_id)
+    values = local_users.get(key)
+    if values is not None:
+        return values
+    try:
+        values = cache.get(key)
+    except Exception as e:
+        logger.warning('Could not read cached user: %s', e)
+    if values is None or len(values) != len(_columns()):
+        values = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).values_list(*_columns()).first()
+        if values is None:
+            return None
+        try:
+            cache.set(key, values, timeout=settings.AUTH_USER_CACHE_TIMEOUT)
+        except Exception as e:
+            logger.warning('Could not cache user: %s', e)
+    local_users.set(key, values, settings.AUTH_USER_LOCAL_CACHE_TIMEOUT)
+    return values
+
+
+def forget_user(user_id):
+    """Drop the cached fields of ``user_id`` now and once the transaction commits."""
+    _forget(user_id)
+    # A request may cache the old row before the change commits
+    transaction.on_commit(lambda: _forget(user_id))
+
+
+def _forget(user_id):
+    key = _key(user_id)
+    local_users.delete(key)
+    try:
+        cache.delete(key)
+    except Exception as e:
+        logger.warning('Could not invalidate cached user: %s', e)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+
+    def get_user(self, validated_token):
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # Needs the password hash, which stays out of the cache
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError as e:
+            raise InvalidToken(_("Token contained no recognizable user identification")) from e
+
+        values = _load(user_id)
+        if values is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        user = self.user_model.from_db(router.db_for_read(self.user_model), _columns(), values)
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        return user
+
+
+class CachedJWTScheme(SimpleJWTScheme):
+    target_class = 'core.authentication.CachedJWTAuthentication'
@@ -0,0 +1,131 @@
+"""
+Response cache for anonymous job advert listings.
+
+Entries are keyed on a generation number plus the normalized query string.
+Any write to adverts, their skills or their categories bumps the generation,
+which orphans every cached page at once; orphans simply expire.
+"""
+
+import hashlib
+import logging
+
+from django.conf import settings  # type: ignore
+from django.core.cache import cache  # type: ignore
+from rest_framework.response import Response  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+ADVERT_LIST_NAMESPACE = 'adverts:list'
+SKILLS_NAMESPACE = 'skills'
+CATEGORIES_NAMESPACE = 'categories'
+
+# Multi-valued filters whose order and duplicates don't change the result
+CANONICAL_LIST_PARAMS = ('skills', 'categories')
+
+STATS = ('hits', 'misses', 'invalidations')
+
+
+def _generation_key(namespace):
+    return f'{namespace}:generation'
+
+
+def _stats_key(namespace, name):
+    return f'{namespace}:stats:{name}'
+
+
+def _incr(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def get_generation(namespace=ADVERT_LIST_NAMESPACE):
+    key = _generation_key(namespace)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, 1, timeout=None)
+        generation = cache.get(key, 1)
+    return generation
+
+
+def bump_generation(namespace=ADVERT_LIST_NAMESPACE):
+    """Invalidate every cached page in ``namespace``."""
+    try:
+        _incr(_generation_key(namespace))
+        _incr(_stats_key(namespace, 'invalidations'))
+    except Exception as e:
+        logger.warning('Could not invalidate %s cache: %s', namespace, e)
+
+
+def record(name, namespace=ADVERT_LIST_NAMESPACE):
+    try:
+        _incr(_stats_key(namespace, name))
+    except Exception:
+        pass
+
+
+def get_stats(namespace=ADVERT_LIST_NAMESPACE):
+    keys = {name: _stats_key(namespace, name) for name in STATS}
+    values = cache.get_many(list(keys.values()))
+    stats = {name: values.get(key, 0) for name, key in keys.items()}
+    stats['generation'] = cache.get(_generation_key(namespace), 1)
+    return stats
+
+
+def normalize_query(query_params):
+    """
+    Return a canonical query string: params sorted, and skill/category lists
+    sorted and de-duplicated.
+    """
+    items = []
+    for name in sorted(query_params.keys()):
+        values = query_params.getlist(name)
+        if name in CANONICAL_LIST_PARAMS:
+            values = sorted(set(values), key=lambda value: (len(value), value))
+        items.extend(f'{name}={value}' for value in values)
+    return '&'.join(items)
+
+
+def listing_cache_key(request, namespace=ADVERT_LIST_NAMESPACE):
+    # Pagination links are absolute, so the host is part of the key
+    raw = f'{request.get_host()}{request.path}?{normalize_query(request.query_params)}'
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return f'{namespace}:v{get_generation(namespace)}:{digest}'
+
+
+class AnonymousListCacheMixin:
+    """
+    Serve anonymous ``list()`` responses from the cache.
+
+    A hit returns the stored response data without touching the ORM or the
+    serializer. Authenticated requests always bypass the cache.
+    """
+    cache_namespace = ADVERT_LIST_NAMESPACE
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+
+        try:
+            key = listing_cache_key(request, self.cache_namespace)
+            data = cache.get(key)
+        except Exception as e:
+            logger.warning('Listing cache unavailable: %s', e)
+            return super().list(request, *args, **kwargs)
+
+        if data is not None:
+            record('hits', self.cache_namespace)
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+            return response
+
+        record('misses', self.cache_namespace)
+        response = super().list(request, *args, **kwargs)
+        if response.status_code == 200:
+            try:
+                cache.set(key, response.data, timeout=settings.ADVERT_LIST_CACHE_TIMEOUT)
+            except Exception as e:
+                logger.warning('Could not cache listing: %s', e)
+        response['X-Cache'] = 'MISS'
+        return response
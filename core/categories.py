@@ -0,0 +1,121 @@
+"""
+The category hierarchy as a closure table.
+
+``CategoryClosure`` holds a row for every (ancestor, descendant) pair, each
+category paired with itself at depth 0. "Everything under these categories"
+is then one indexed lookup on ``ancestor`` rather than a query per tree
+level, and advert counts roll up to every ancestor in a single GROUP BY.
+
+Signal handlers in ``core.tasks`` add a new category's rows and relink a
+subtree when its root's ``parent`` changes. Raw saves (fixtures) and
+queryset ``update()`` calls skip them; ``rebuild_category_closure()``
+recomputes the table from ``parent`` links.
+"""
+
+from django.apps import apps as global_apps  # type: ignore
+from django.db import transaction  # type: ignore
+from django.db.models import Count  # type: ignore
+
+
+def subtree_ids(category_ids):
+    """Subquery of the ids of ``category_ids`` and all their descendants."""
+    from .models import CategoryClosure
+
+    return CategoryClosure.objects.filter(ancestor_id__in=category_ids).values('descendant_id')
+
+
+def creates_cycle(category_id, parent_id):
+    """Whether making ``parent_id`` the parent of ``category_id`` would put it under itself."""
+    from .models import CategoryClosure
+
+    return CategoryClosure.objects.filter(ancestor_id=category_id, descendant_id=parent_id).exists()
+
+
+def _links(parent_id, subtree):
+    """Rows linking ``parent_id`` and its ancestors to each ``(descendant, depth)`` in ``subtree``."""
+    from .models import CategoryClosure
+
+    ancestors = CategoryClosure.objects.filter(descendant_id=parent_id).values_list('ancestor_id', 'depth')
+    return [
+        CategoryClosure(ancestor_id=ancestor_id, descendant_id=descendant_id, depth=depth + 1 + below)
+        for ancestor_id, depth in ancestors
+        for descendant_id, below in subtree
+    ]
+
+
+def add_category(category):
+    """Link a new ``category`` to itself and to its parent's ancestors."""
+    from .models import CategoryClosure
+
+    rows = [CategoryClosure(ancestor_id=category.pk, descendant_id=category.pk, depth=0)]
+    if category.parent_id:
+        rows += _links(category.parent_id, [(category.pk, 0)])
+    CategoryClosure.objects.bulk_create(rows, ignore_conflicts=True)
+
+
+def move_category(category):
+    """Relink ``category`` and its descendants under its current parent."""
+    from .models import CategoryClosure
+
+    with transaction.atomic():
+        subtree = list(CategoryClosure.objects.filter(ancestor_id=category.pk).values_list('descendant_id', 'depth'))
+        descendant_ids = [descendant_id for descendant_id, _ in subtree]
+        # Drop the old ancestors' links into the subtree, keep the ones inside it
+        CategoryClosure.objects.filter(descendant_id__in=descendant_ids).exclude(
+            ancestor_id__in=descendant_ids
+        ).delete()
+        if category.parent_id:
+            CategoryClosure.objects.bulk_create(_links(category.parent_id, subtree), batch_size=1000)
+
+
+def advert_counts():
+    """Map category ids to their active adverts, including those filed under a descendant."""
+    from .models import CategoryClosure
+
+    # distinct: an advert filed under a parent and its child counts once for the parent
+    rows = CategoryClosure.objects.filter(
+        descendant__jobadvertcategory__job_advert__is_active=True
+    ).order_by().values('ancestor_id').annotate(
+        total=Count('descendant__jobadvertcategory__job_advert_id', distinct=True)
+    )
+    return {row['ancestor_id']: row['total'] for row in rows}
+
+
+def category_tree(categories, counts):
+    """
+    Arrange ``categories`` into a forest: each gets ``tree_children`` and
+    ``advert_count`` attributes; return the roots in their original order.
+    """
+    by_id = {category.pk: category for category in categories}
+    roots = []
+    for category in categories:
+        category.tree_children = []
+        category.advert_count = counts.get(category.pk, 0)
+    for category in categories:
+        parent = by_id.get(category.parent_id)
+        if parent is None:
+            roots.append(category)
+        else:
+            parent.tree_children.append(category)
+    return roots
+
+
+def rebuild_category_closure(apps=global_apps):
+    """Recompute the whole closure table from ``Category.parent``."""
+    Category = apps.get_model('core', 'Category')
+    CategoryClosure = apps.get_model('core', 'CategoryClosure')
+
+    parents = dict(Category.objects.values_list('id', 'parent_id'))
+    rows = []
+    for category_id in parents:
+        ancestor_id, depth, seen = category_id, 0, set()
+        # ``seen`` stops at a cycle left behind by raw edits
+        while ancestor_id is not None and ancestor_id not in seen:
+            seen.add(ancestor_id)
+            rows.append(CategoryClosure(ancestor_id=ancestor_id, descendant_id=category_id, depth=depth))
+            ancestor_id, depth = parents.get(ancestor_id), depth + 1
+
+    with transaction.atomic():
+        CategoryClosure.objects.all().delete()
+        CategoryClosure.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
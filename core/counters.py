@@ -0,0 +1,189 @@
+"""
+Counters denormalized onto job adverts.
+
+Detail views add to a Redis hash instead of writing the advert row; the
+``flush_advert_view_counts`` Celery task periodically folds the hash into
+``views_count`` with batched ``F()`` updates, which leave ``updated_at`` alone.
+Flushes take a Redis lock, and each one first requeues the views of any
+flush that died part way.
+
+``applications_count`` moves by +1/-1 as applications enter or leave an
+active status. Saves move the stored status with a compare-and-set
+(``claim_status_change``), so concurrent saves of one application each count
+the transition they actually made. ``reconcile_application_counts`` repairs
+drift from writes that bypass the signals.
+"""
+
+import logging
+from collections import defaultdict
+from uuid import uuid4
+
+from django.db import transaction  # type: ignore
+from django.db.models import Count, F, OuterRef, Subquery, Value  # type: ignore
+from django.db.models.functions import Coalesce  # type: ignore
+from redis.exceptions import LockError, ResponseError  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+PENDING_VIEWS_KEY = 'adverts:views:pending'
+FLUSH_BATCH_SIZE = 500
+FLUSH_LOCK_KEY = f'{PENDING_VIEWS_KEY}:lock'
+# Far longer than a flush takes; only bounds how long a crashed one blocks the next
+FLUSH_LOCK_TIMEOUT = 600
+
+
+def get_redis():
+    from django_redis import get_redis_connection  # type: ignore
+    return get_redis_connection('default')
+
+
+def record_advert_view(advert_id):
+    """
+    Buffer one view of ``advert_id`` and return how many views of it are not
+    yet reflected in the database.
+    """
+    try:
+        return get_redis().hincrby(PENDING_VIEWS_KEY, advert_id, 1)
+    except Exception as e:
+        # Without Redis, fall back to an atomic in-place increment
+        logger.warning('Could not buffer advert view: %s', e)
+        from .models import JobAdvert
+        JobAdvert.objects.filter(pk=advert_id).update(views_count=F('views_count') + 1)
+        return 1
+
+
+def _requeue_views(client, flushing, pending):
+    """Add ``pending`` views back to the buffer and drop the ``flushing`` hash."""
+    pipe = client.pipeline()
+    for advert_id, count in pending.items():
+        pipe.hincrby(PENDING_VIEWS_KEY, advert_id, count)
+    pipe.delete(flushing)
+    pipe.execute()
+
+
+def _read_views(client, key):
+    return {int(advert_id): int(count) for advert_id, count in client.hgetall(key).items()}
+
+
+def flush_advert_views():
+    """
+    Write buffered views to the database and return how many were flushed.
+    Returns 0 without flushing while another flush holds the lock.
+    """
+    client = get_redis()
+    lock = client.lock(FLUSH_LOCK_KEY, timeout=FLUSH_LOCK_TIMEOUT)
+    if not lock.acquire(blocking=False):
+        return 0
+    try:
+        return _flush_advert_views(client)
+    finally:
+        try:
+            lock.release()
+        except LockError:
+            # Expired mid-flush; another flush may already hold it
+            pass
+
+
+def _flush_advert_views(client):
+    from .models import JobAdvert
+
+    # Only the lock holder touches flushing hashes, so any found now were left
+    # by a flush that died before deleting its own. Requeue them; one that
+    # died between its commit and the delete gets counted twice.
+    for leftover in client.scan_iter(match=f'{PENDING_VIEWS_KEY}:flushing:*'):
+        _requeue_views(client, leftover, _read_views(client, leftover))
+
+    # Renaming is atomic, so views recorded during the flush go to a fresh hash
+    flushing = f'{PENDING_VIEWS_KEY}:flushing:{uuid4().hex}'
+    try:
+        client.rename(PENDING_VIEWS_KEY, flushing)
+    except ResponseError:
+        # Nothing buffered since the last flush
+        return 0
+    pending = _read_views(client, flushing)
+
+    # Adverts with the same number of pending views share one UPDATE
+    by_count = defaultdict(list)
+    for advert_id, count in pending.items():
+        by_count[count].append(advert_id)
+
+    try:
+        with transaction.atomic():
+            for count, advert_ids in by_count.items():
+                for start in range(0, len(advert_ids), FLUSH_BATCH_SIZE):
+                    JobAdvert.objects.filter(id__in=advert_ids[start:start + FLUSH_BATCH_SIZE]).update(
+                        views_count=F('views_count') + count
+                    )
+    except Exception:
+        # Put the views back so the next flush retries them
+        _requeue_views(client, flushing, pending)
+        raise
+
+    client.delete(flushing)
+    return sum(pending.values())
+
+
+def application_count_delta(old_status, new_status):
+    from .models import JobApplication
+
+    active = JobApplication.ACTIVE_STATUSES
+    return int(new_status in active) - int(old_status in active)
+
+
+def claim_status_change(application_id, expected, status):
+    """
+    Set the stored status of application ``application_id`` to ``status`` and
+    return the status it replaced (None if the row is gone). ``expected`` is
+    the status the caller loaded, if known; when another save changed it
+    meanwhile, the claim retries from the status actually stored.
+    """
+    from .models import JobApplication
+
+    rows = JobApplication.objects.filter(pk=application_id)
+    while True:
+        if expected is None:
+            expected = rows.values_list('status', flat=True).first()
+            if expected is None:
+                return None
+        if rows.filter(status=expected).update(status=status):
+            return expected
+        expected = None
+
+
+def adjust_applications_count(advert_id, delta):
+    """Atomically add ``delta`` to an advert's applications_count."""
+    from .models import JobAdvert
+
+    if not delta:
+        return
+    adverts = JobAdvert.objects.filter(pk=advert_id)
+    if delta < 0:
+        # Never go below zero; reconciliation repairs any drift
+        adverts = adverts.filter(applications_count__gte=-delta)
+    adverts.update(applications_count=F('applications_count') + delta)
+
+
+def reconcile_application_counts(batch_size=FLUSH_BATCH_SIZE * 10):
+    """
+    Recompute applications_count for every advert, one id range per UPDATE,
+    and return how many adverts were corrected.
+    """
+    from .models import JobAdvert, JobApplication
+
+    actual = Coalesce(Subquery(
+        JobApplication.objects.filter(
+            job_advert=OuterRef('pk'), status__in=JobApplication.ACTIVE_STATUSES
+        ).order_by().values('job_advert').annotate(total=Count('id')).values('total')
+    ), Value(0))
+
+    bounds = JobAdvert.objects.order_by('id').values_list('id', flat=True)
+    first, last = bounds.first(), bounds.last()
+    if first is None:
+        return 0
+
+    fixed = 0
+    for start in range(first, last + 1, batch_size):
+        fixed += JobAdvert.objects.filter(id__gte=start, id__lt=start + batch_size).alias(
+            actual=actual
+        ).exclude(applications_count=F('actual')).update(applications_count=actual)
+    return fixed
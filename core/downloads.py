@@ -0,0 +1,134 @@
+"""
+Permission-checked delivery of stored files.
+
+Views decide who may read a file; ``serve()`` then hands the bytes over
+without pushing them through Python where it can:
+
+- ``MEDIA_SENDFILE = 'nginx'`` answers with an ``X-Accel-Redirect`` to an
+  ``internal`` nginx location under ``MEDIA_ACCEL_PREFIX``, and
+  ``'xsendfile'`` with an ``X-Sendfile`` path for Apache/lighttpd. The web
+  server then sends the file and handles ranges itself.
+- Otherwise a ``FileResponse`` is returned, which WSGI servers with
+  ``wsgi.file_wrapper`` (gunicorn) send with ``os.sendfile``. Single byte
+  ranges are answered with ``206 Partial Content`` by positioning the file
+  at the range start and capping the length, so sendfile copies only that
+  slice.
+"""
+
+import mimetypes
+import os
+import re
+
+from django.conf import settings  # type: ignore
+from django.http import FileResponse, HttpResponse  # type: ignore
+from django.utils.cache import patch_cache_control  # type: ignore
+from django.utils.encoding import filepath_to_uri  # type: ignore
+from django.utils.http import content_disposition_header, http_date  # type: ignore
+
+RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+# Shown in the browser; anything else is sent as an attachment so uploaded
+# markup never renders under our origin
+INLINE_CONTENT_TYPES = {'application/pdf', 'image/jpeg', 'image/png', 'image/gif', 'image/webp'}
+
+
+def parse_range(header, size):
+    """
+    Return the ``(start, end)`` byte range (inclusive) asked for by a Range
+    ``header`` on a file of ``size`` bytes, ``None`` to send the whole file,
+    or ``False`` when the range can't be satisfied.
+    """
+    match = RANGE_RE.match(header.strip()) if header and size else None
+    if match is None:
+        # Absent, malformed or multiple ranges, or an empty file: the whole file is a valid answer
+        return None
+    first, last = match.groups()
+    if not first:
+        if not last:
+            return None
+        # Suffix range: the final ``last`` bytes
+        length = int(last)
+        if not length:
+            return False
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        return False
+    return start, end
+
+
+class FileRange:
+    """
+    ``length`` bytes of ``file`` from ``start``. Reads stop at the end of
+    the range; ``fileno()`` lets sendfile copy it from the current position.
+    """
+
+    def __init__(self, file, start, length):
+        file.seek(start)
+        self.file = file
+        self.remaining = length
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file.read(size) if size else b''
+        self.remaining -= len(data)
+        return data
+
+    def fileno(self):
+        return self.file.fileno()
+
+    def close(self):
+        self.file.close()
+
+
+def _headers(response, name, content_type, filename):
+    response['Content-Disposition'] = content_disposition_header(
+        content_type not in INLINE_CONTENT_TYPES, filename or os.path.basename(name)
+    )
+    # Access is per user, so shared caches must not keep a copy
+    patch_cache_control(response, private=True)
+    return response
+
+
+def _offload(storage, name, content_type):
+    response = HttpResponse(content_type=content_type)
+    if settings.MEDIA_SENDFILE == 'nginx':
+        response['X-Accel-Redirect'] = settings.MEDIA_ACCEL_PREFIX.rstrip('/') + '/' + filepath_to_uri(name)
+    else:
+        response['X-Sendfile'] = storage.path(name)
+    # The web server fills in the body
+    return response
+
+
+def serve(request, field_file, filename=None):
+    """Respond with the stored file behind ``field_file``."""
+    storage, name = field_file.storage, field_file.name
+    content_type = mimetypes.guess_type(name)[0] or 'application/octet-stream'
+    if settings.MEDIA_SENDFILE:
+        return _headers(_offload(storage, name, content_type), name, content_type, filename)
+
+    size = storage.size(name)
+    last_modified = http_date(storage.get_modified_time(name).timestamp())
+    byte_range = parse_range(request.headers.get('Range'), size)
+    if_range = request.headers.get('If-Range')
+    if byte_range is not None and if_range and if_range != last_modified:
+        # The client's partial copy is stale; start over
+        byte_range = None
+
+    if byte_range is False:
+        response = HttpResponse(status=416, content_type=content_type)
+        response['Content-Range'] = f'bytes */{size}'
+    elif byte_range is None:
+        response = FileResponse(storage.open(name, 'rb'), content_type=content_type)
+    else:
+        start, end = byte_range
+        length = end - start + 1
+        response = FileResponse(FileRange(storage.open(name, 'rb'), start, length), status=206,
+                                content_type=content_type)
+        response['Content-Length'] = length
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Accept-Ranges'] = 'bytes'
+    response['Last-Modified'] = last_modified
+    return _headers(response, name, content_type, filename)
@@ -0,0 +1,105 @@
+"""
+Streaming export of an employer's applications as CSV or NDJSON.
+
+Rows come from one flat ``values_list`` query read through a server-side
+cursor (``iterator(chunk_size=...)``) and are encoded as they arrive, so
+memory stays flat however many applications there are; the CSV header goes
+out before the query even runs.
+"""
+
+import csv
+from datetime import datetime
+
+import orjson  # type: ignore
+from django.urls import reverse  # type: ignore
+
+EXPORT_CHUNK_SIZE = 2000
+# Rows encoded per chunk handed to the response
+BATCH_SIZE = 500
+
+EXPORT_COLUMNS = (
+    ('application_id', 'id'),
+    ('applied_at', 'applied_at'),
+    ('updated_at', 'updated_at'),
+    ('status', 'status'),
+    ('match_score', 'match_score'),
+    ('job_advert_id', 'job_advert_id'),
+    ('job_advert_title', 'job_advert__title'),
+    ('job_seeker_id', 'job_seeker_id'),
+    ('username', 'job_seeker__username'),
+    ('first_name', 'job_seeker__first_name'),
+    ('last_name', 'job_seeker__last_name'),
+    ('email', 'job_seeker__email'),
+    ('phone_number', 'job_seeker__phone_number'),
+    ('location', 'job_seeker__location'),
+    ('cover_letter', 'cover_letter'),
+    ('resume', 'resume'),
+)
+HEADER = tuple(name for name, _lookup in EXPORT_COLUMNS)
+ID_COLUMN = HEADER.index('application_id')
+RESUME_COLUMN = HEADER.index('resume')
+
+# Spreadsheets run cells starting with these as formulas
+FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def resume_url(request):
+    """Return a function turning an application id into the absolute URL of its resume download."""
+    # Reverse once and splice ids in, rather than resolving the route per row
+    prefix, suffix = request.build_absolute_uri(
+        reverse('jobapplication-resume', kwargs={'pk': 0})
+    ).rsplit('0', 1)
+    return lambda pk: f'{prefix}{pk}{suffix}'
+
+
+def export_rows(queryset, request):
+    """Yield one row per application in ``queryset``, in ``HEADER`` order."""
+    url = resume_url(request)
+    rows = queryset.order_by('-applied_at', '-id').values_list(*(lookup for _name, lookup in EXPORT_COLUMNS))
+    for row in rows.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        row = list(row)
+        if row[RESUME_COLUMN]:
+            row[RESUME_COLUMN] = url(row[ID_COLUMN])
+        yield row
+
+
+class _Buffer(list):
+    write = list.append
+
+
+def _cell(value):
+    if isinstance(value, str):
+        return "'" + value if value.startswith(FORMULA_PREFIXES) else value
+    return value.isoformat() if isinstance(value, datetime) else value
+
+
+def stream_csv(rows):
+    buffer = _Buffer()
+    writer = csv.writer(buffer)
+    writer.writerow(HEADER)
+    yield ''.join(buffer)
+    buffer.clear()
+    for count, row in enumerate(rows, 1):
+        writer.writerow([_cell(value) for value in row])
+        if count % BATCH_SIZE == 0:
+            yield ''.join(buffer)
+            buffer.clear()
+    if buffer:
+        yield ''.join(buffer)
+
+
+def stream_ndjson(rows):
+    batch = []
+    for row in rows:
+        batch.append(orjson.dumps(dict(zip(HEADER, row)), option=orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE))
+        if len(batch) == BATCH_SIZE:
+            yield b''.join(batch)
+            batch = []
+    if batch:
+        yield b''.join(batch)
+
+
+STREAMS = {
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+}
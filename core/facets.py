@@ -0,0 +1,244 @@
+"""
+Facet counts for job advert listings.
+
+``JobAdvertFacetCount`` holds a small cube of active-advert counts keyed on
+``(job_type, experience_level, is_remote)`` plus an optional skill. Signal
+handlers move an advert between cells as it changes, so a request filtered
+only on those three fields reads its facets from a few hundred rows instead
+of grouping the whole result set. Any other filter (search, salary,
+skills, ...) falls back to a GROUP BY over the filtered set.
+
+Category counts include adverts filed under a subcategory, as the
+``categories`` filter does. Cube cells can't be summed up the tree without
+counting an advert filed under both a parent and its child twice, so they
+are always grouped through ``CategoryClosure``, each advert counted once.
+"""
+
+from collections import Counter
+
+from django.apps import apps as global_apps  # type: ignore
+from django.db import IntegrityError, transaction  # type: ignore
+from django.db.models import Count, F, Sum  # type: ignore
+from rest_framework.exceptions import ValidationError  # type: ignore
+
+FACETS = ('job_type', 'experience_level', 'is_remote', 'skills', 'categories')
+
+# Query parameters the cube can answer for; anything else forces the fallback
+CUBE_FILTERS = ('job_type', 'experience_level', 'is_remote')
+PASSIVE_PARAMS = ('facets', 'ordering', 'cursor', 'page_size', 'is_active', 'fields', 'expand')
+
+FALLBACK_FIELDS = {
+    'job_type': 'job_type',
+    'experience_level': 'experience_level',
+    'is_remote': 'is_remote',
+    'skills': 'skills__skill_id',
+}
+
+
+def advert_cells(job_type, experience_level, is_remote, skill_ids=()):
+    base = (job_type, experience_level, is_remote)
+    return [base + (0,)] + [base + (skill_id,) for skill_id in skill_ids]
+
+
+# Columns advert_dims() reads
+DIM_FIELDS = ('job_type', 'experience_level', 'is_remote', 'is_active')
+
+
+def advert_dims(advert):
+    """Return the cube dimensions of ``advert``, or None when it isn't counted."""
+    if advert is None or not advert.is_active:
+        return None
+    return (advert.job_type, advert.experience_level, advert.is_remote)
+
+
+def load_advert_dims(advert_id):
+    """Return the stored cube dimensions of advert ``advert_id``."""
+    from .models import JobAdvert
+
+    return advert_dims(JobAdvert.objects.filter(pk=advert_id).only(*DIM_FIELDS).first())
+
+
+def apply_deltas(deltas):
+    """Add ``{cell: delta}`` to the cube, creating missing cells."""
+    from .models import JobAdvertFacetCount
+
+    for cell, delta in deltas.items():
+        if not delta:
+            continue
+        job_type, experience_level, is_remote, skill_id = cell
+        lookup = {
+            'job_type': job_type, 'experience_level': experience_level,
+            'is_remote': is_remote, 'skill_id': skill_id,
+        }
+        cells = JobAdvertFacetCount.objects.filter(**lookup)
+        if cells.update(count=F('count') + delta):
+            continue
+        try:
+            with transaction.atomic():
+                JobAdvertFacetCount.objects.create(count=delta, **lookup)
+        except IntegrityError:
+            cells.update(count=F('count') + delta)
+
+
+def move_advert(advert, old_dims, new_dims):
+    """Move ``advert`` and its skills between cube cells."""
+    if old_dims == new_dims:
+        return
+    skill_ids = list(advert.skills.values_list('skill_id', flat=True))
+    deltas = Counter()
+    if old_dims:
+        deltas.subtract(advert_cells(*old_dims, skill_ids))
+    if new_dims:
+        deltas.update(advert_cells(*new_dims, skill_ids))
+    apply_deltas(deltas)
+
+
+def uncount_advert(advert):
+    """Remove a deleted advert from its base cell."""
+    dims = advert_dims(advert)
+    if dims:
+        apply_deltas({advert_cells(*dims)[0]: -1})
+
+
+def count_tags(dims, skill_ids=(), sign=1):
+    """Count skills of an advert in cube cell ``dims``."""
+    if not dims:
+        return
+    cells = advert_cells(*dims, skill_ids)[1:]
+    apply_deltas({cell: sign for cell in cells})
+
+
+def add_advert_tags(advert, skill_ids=(), sign=1):
+    """Count skills attached to ``advert`` (e.g. after bulk_create)."""
+    count_tags(advert_dims(advert), skill_ids, sign)
+
+
+def rebuild_facet_counts(apps=global_apps):
+    """Recompute the whole cube from scratch."""
+    JobAdvert = apps.get_model('core', 'JobAdvert')
+    JobAdvertSkill = apps.get_model('core', 'JobAdvertSkill')
+    JobAdvertFacetCount = apps.get_model('core', 'JobAdvertFacetCount')
+
+    dims = ('job_type', 'experience_level', 'is_remote')
+    related_dims = tuple(f'job_advert__{dim}' for dim in dims)
+    rows = []
+    for row in JobAdvert.objects.filter(is_active=True).order_by().values(*dims).annotate(total=Count('id')):
+        rows.append(JobAdvertFacetCount(count=row['total'], **{dim: row[dim] for dim in dims}))
+    groups = JobAdvertSkill.objects.filter(job_advert__is_active=True).order_by().values(
+        *related_dims, 'skill_id'
+    ).annotate(total=Count('id'))
+    for row in groups:
+        values = {dim: row[f'job_advert__{dim}'] for dim in dims}
+        rows.append(JobAdvertFacetCount(count=row['total'], skill_id=row['skill_id'], **values))
+
+    with transaction.atomic():
+        JobAdvertFacetCount.objects.all().delete()
+        JobAdvertFacetCount.objects.bulk_create(rows, batch_size=1000)
+
+
+def parse_facets(request):
+    raw = request.query_params.get('facets')
+    if not raw:
+        return []
+    facets = [name.strip() for name in raw.split(',') if name.strip()]
+    unknown = [name for name in facets if name not in FACETS]
+    if unknown:
+        raise ValidationError({'facets': f"Unknown facets: {', '.join(unknown)}. Choose from {', '.join(FACETS)}."})
+    return list(dict.fromkeys(facets))
+
+
+def _format(rows, key):
+    counts = {}
+    for row in rows:
+        if row['total'] > 0:
+            value = row[key]
+            counts[str(value).lower() if isinstance(value, bool) else str(value)] = row['total']
+    return counts
+
+
+def category_counts(adverts):
+    """Count ``adverts`` per category, including those filed under a subcategory."""
+    from .models import CategoryClosure
+
+    rows = CategoryClosure.objects.filter(
+        descendant__jobadvertcategory__job_advert__in=adverts.values('pk')
+    ).order_by().values('ancestor_id').annotate(
+        total=Count('descendant__jobadvertcategory__job_advert_id', distinct=True)
+    )
+    return _format(rows, 'ancestor_id')
+
+
+def cube_counts(facets, filters):
+    from .models import JobAdvert, JobAdvertFacetCount
+
+    cells = JobAdvertFacetCount.objects.filter(**filters).order_by()
+    result = {}
+    for facet in facets:
+        if facet == 'categories':
+            result[facet] = category_counts(JobAdvert.objects.filter(is_active=True, **filters))
+            continue
+        if facet == 'skills':
+            rows = cells.exclude(skill_id=0).values('skill_id')
+            key = 'skill_id'
+        else:
+            rows = cells.filter(skill_id=0).values(facet)
+            key = facet
+        result[facet] = _format(rows.annotate(total=Sum('count')), key)
+    return result
+
+
+def grouped_counts(facets, queryset):
+    queryset = queryset.order_by()
+    result = {}
+    for facet in facets:
+        if facet == 'categories':
+            result[facet] = category_counts(queryset)
+            continue
+        field = FALLBACK_FIELDS[facet]
+        rows = queryset.filter(**{f'{field}__isnull': False}).values(field).annotate(
+            total=Count('id', distinct=True)
+        )
+        result[facet] = _format(rows, field)
+    return result
+
+
+class FacetCountsMixin:
+    """
+    Add a ``facets`` object to list responses when ``?facets=`` is given.
+    """
+
+    def list(self, request, *args, **kwargs):
+        facets = parse_facets(request)
+        response = super().list(request, *args, **kwargs)
+        if facets and response.status_code == 200:
+            response.data['facets'] = self.get_facet_counts(facets)
+        return response
+
+    def get_facet_counts(self, facets):
+        filters = self.get_cube_filters()
+        if filters is not None:
+            return cube_counts(facets, filters)
+        queryset = self.filter_queryset(self.get_queryset())
+        return grouped_counts(facets, queryset)
+
+    def get_cube_filters(self):
+        """
+        Return cube lookups equivalent to the request's filters, or None when
+        the request filters on something the cube doesn't track.
+        """
+        params = self.request.query_params
+        for name in params:
+            if name not in CUBE_FILTERS + PASSIVE_PARAMS and any(params.getlist(name)):
+                return None
+
+        filterset = None
+        for backend in self.filter_backends:
+            if hasattr(backend, 'get_filterset'):
+                filterset = backend().get_filterset(self.request, self.get_queryset().none(), self)
+        if filterset is None or not filterset.is_valid():
+            return None
+
+        data = filterset.form.cleaned_data
+        if data.get('is_active') not in (None, True):
+            return None
+        return {name: data[name] for name in CUBE_FILTERS if data.get(name) not in (None, '')}
@@ -0,0 +1,189 @@
+"""
+Sparse fieldsets (``?fields=``) and explicit expansion (``?expand=``).
+
+``?fields=id,status,job_advert.title`` keeps only the listed fields; dotted
+names select inside a nested object. Once either parameter is present,
+nested objects are collapsed to their primary key(s) unless they appear in
+``?expand=`` (e.g. ``?expand=job_advert,job_advert.employer``) or have
+fields selected through ``?fields=``. Requests without either parameter get
+the full representation, as before.
+
+``SparseFieldsetMixin`` walks the pruned serializer to decide which columns
+to load (``only``) and which relations to join or prefetch, so a small
+fieldset costs a small query.
+"""
+
+from django.core.exceptions import FieldDoesNotExist  # type: ignore
+from django.db.models import Prefetch  # type: ignore
+from rest_framework import serializers  # type: ignore
+from rest_framework.exceptions import ValidationError  # type: ignore
+
+FIELDS_PARAM = 'fields'
+EXPAND_PARAM = 'expand'
+
+
+def _split(raw):
+    return [tuple(part for part in name.strip().split('.') if part) for name in raw.split(',') if name.strip()]
+
+
+def parse_fieldset(request):
+    """
+    Return ``(fields, expand)`` for ``request``: a tree of selected field
+    names (``{}`` meaning everything) and a set of expanded paths, or
+    ``None`` when the request asks for neither.
+    """
+    if request is None:
+        return None
+    if not hasattr(request, '_sparse_fieldset'):
+        params = getattr(request, 'query_params', request.GET)
+        fieldset = None
+        if FIELDS_PARAM in params or EXPAND_PARAM in params:
+            tree = {}
+            for path in _split(params.get(FIELDS_PARAM, '')):
+                node = tree
+                for name in path:
+                    node = node.setdefault(name, {})
+            fieldset = (tree, set(_split(params.get(EXPAND_PARAM, ''))))
+        request._sparse_fieldset = fieldset
+    return request._sparse_fieldset
+
+
+class SparseFieldsMixin:
+    """
+    Serializer mixin applying the request's ``?fields=`` and ``?expand=``,
+    both at the top level and when nested inside another serializer.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fieldset = parse_fieldset(self.context.get('request'))
+        if fieldset is None:
+            return fields
+        tree, expand = fieldset
+        path = self.fieldset_path()
+
+        selected = tree
+        for name in path:
+            selected = selected.get(name) or {}
+        if selected:
+            unknown = [name for name in selected if name not in fields]
+            if unknown:
+                prefix = '.'.join(path + ('',))
+                raise ValidationError({FIELDS_PARAM: f"Unknown fields: {', '.join(prefix + name for name in unknown)}."})
+            fields = {name: field for name, field in fields.items() if name in selected}
+
+        for name, field in list(fields.items()):
+            nested = field.child if isinstance(field, serializers.ListSerializer) else field
+            if not isinstance(nested, serializers.BaseSerializer):
+                continue
+            if path + (name,) in expand or selected.get(name):
+                continue
+            fields[name] = serializers.PrimaryKeyRelatedField(
+                read_only=True, source=field.source, many=isinstance(field, serializers.ListSerializer)
+            )
+        return fields
+
+    def fieldset_path(self):
+        """Field names leading from the root serializer to this one."""
+        path, node = [], self
+        while node.parent is not None:
+            if node.field_name:
+                path.append(node.field_name)
+            node = node.parent
+        return tuple(reversed(path))
+
+
+def _collect(serializer, model, prefix, only, select, prefetch):
+    only.add(prefix + model._meta.pk.name)
+    for field in serializer.fields.values():
+        if field.write_only or field.source == '*':
+            continue
+        *relations, name = field.source.split('.')
+
+        # Dotted sources such as "skill.name" follow forward relations
+        current, path = model, prefix
+        for relation in relations:
+            try:
+                model_field = current._meta.get_field(relation)
+            except FieldDoesNotExist:
+                current = None
+                break
+            if not (model_field.many_to_one or model_field.one_to_one):
+                current = None
+                break
+            only.add(path + relation)
+            select.add(path + relation)
+            path += relation + '__'
+            current = model_field.related_model
+            only.add(path + current._meta.pk.name)
+        if current is None:
+            continue
+
+        try:
+            model_field = current._meta.get_field(name)
+        except FieldDoesNotExist:
+            # A property or annotation; nothing to load
+            continue
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+
+        if model_field.one_to_many or model_field.many_to_many:
+            related = model_field.related_model
+            sub_only, sub_select, sub_prefetch = set(), set(), []
+            if isinstance(nested, serializers.BaseSerializer):
+                _collect(nested, related, '', sub_only, sub_select, sub_prefetch)
+            sub_only.add(related._meta.pk.name)
+            if model_field.one_to_many:
+                # The prefetch joins rows back to their parent through this key
+                sub_only.add(model_field.field.name)
+            queryset = related.objects.only(*sub_only).prefetch_related(*sub_prefetch)
+            if sub_select:
+                queryset = queryset.select_related(*sub_select)
+            prefetch.append(Prefetch(path + name, queryset=queryset))
+        elif model_field.is_relation:
+            only.add(path + model_field.name)
+            if isinstance(nested, serializers.BaseSerializer):
+                select.add(path + model_field.name)
+                _collect(nested, model_field.related_model, path + model_field.name + '__', only, select, prefetch)
+        else:
+            only.add(path + model_field.name)
+
+
+def query_plan(serializer, model):
+    """
+    Return ``(only, select_related, prefetches)`` covering exactly what
+    ``serializer`` renders from ``model`` instances.
+    """
+    if isinstance(serializer, serializers.ListSerializer):
+        serializer = serializer.child
+    only, select, prefetch = set(), set(), []
+    _collect(serializer, model, '', only, select, prefetch)
+    return only, select, prefetch
+
+
+class SparseFieldsetMixin:
+    """
+    View mixin narrowing the queryset to the requested fieldset. Requests
+    without ``?fields=``/``?expand=`` keep the view's own queryset.
+    """
+
+    def filter_queryset(self, queryset):
+        return self.sparse_queryset(super().filter_queryset(queryset))
+
+    def sparse_queryset(self, queryset):
+        if parse_fieldset(self.request) is None:
+            return queryset
+        only, select, prefetch = query_plan(self.get_serializer(), queryset.model)
+
+        # Ordering columns stay loaded; pagination reads them for its cursors
+        ordering = list(queryset.query.order_by or queryset.model._meta.ordering or getattr(self, 'ordering', None) or [])
+        for term in ordering:
+            if isinstance(term, str):
+                try:
+                    only.add(queryset.model._meta.get_field(term.lstrip('-')).name)
+                except FieldDoesNotExist:
+                    pass
+
+        queryset = queryset.select_related(None).prefetch_related(None).only(*only)
+        if select:
+            queryset = queryset.select_related(*select)
+        return queryset.prefetch_related(*prefetch)
@@ -0,0 +1,165 @@
+"""
+Content-addressed storage for uploaded files.
+
+The upload handlers below hash each file (SHA-256) chunk by chunk while
+Django streams it to memory or to a temporary file. ``store()`` then keeps
+one copy per digest under ``<namespace>/<aa>/<bb>/<digest><ext>``; uploading
+content that is already stored skips the write and only takes another
+reference. ``StoredFile`` rows count references, and a file is deleted along
+with its last one.
+
+Files stored before content addressing keep their old names; ``share()``
+registers them the first time they are reused.
+"""
+
+import hashlib
+import logging
+import os
+
+from django.core.files.storage import default_storage  # type: ignore
+from django.core.files.uploadhandler import MemoryFileUploadHandler, TemporaryFileUploadHandler  # type: ignore
+from django.db import IntegrityError, transaction  # type: ignore
+from django.db.models import F  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+RESUME_NAMESPACE = 'resumes/sha256'
+
+
+class HashingUploadMixin:
+    """Record the SHA-256 of an upload as ``upload.sha256`` while it streams in."""
+
+    def new_file(self, *args, **kwargs):
+        # Set first: MemoryFileUploadHandler.new_file raises once it takes the file
+        self.hasher = hashlib.sha256()
+        super().new_file(*args, **kwargs)
+
+    def receive_data_chunk(self, raw_data, start):
+        remaining = super().receive_data_chunk(raw_data, start)
+        if remaining is None:
+            # This handler kept the chunk rather than passing it on
+            self.hasher.update(raw_data)
+        return remaining
+
+    def file_complete(self, file_size):
+        upload = super().file_complete(file_size)
+        if upload is not None:
+            upload.sha256 = self.hasher.hexdigest()
+        return upload
+
+
+class HashingMemoryFileUploadHandler(HashingUploadMixin, MemoryFileUploadHandler):
+    pass
+
+
+class HashingTemporaryFileUploadHandler(HashingUploadMixin, TemporaryFileUploadHandler):
+    pass
+
+
+def file_digest(file):
+    """SHA-256 of ``file``, from the upload handlers when they computed it."""
+    digest = getattr(file, 'sha256', None)
+    if digest is None:
+        hasher = hashlib.sha256()
+        for chunk in file.chunks():
+            hasher.update(chunk)
+        digest = hasher.hexdigest()
+    return digest
+
+
+def content_name(digest, namespace, filename):
+    extension = os.path.splitext(filename)[1].lower()
+    return f'{namespace}/{digest[:2]}/{digest[2:4]}/{digest}{extension}'
+
+
+def _acquire(digest):
+    from .models import StoredFile
+
+    if StoredFile.objects.filter(sha256=digest).update(ref_count=F('ref_count') + 1):
+        return StoredFile.objects.filter(sha256=digest).values_list('name', flat=True).first()
+    return None
+
+
+def _register(digest, name, size, refs):
+    from .models import StoredFile
+
+    try:
+        with transaction.atomic():
+            StoredFile.objects.create(sha256=digest, name=name, size=size, ref_count=refs)
+        return True
+    except IntegrityError:
+        # A concurrent upload of the same content registered it first
+        return False
+
+
+def store(upload, namespace=RESUME_NAMESPACE):
+    """
+    Store ``upload`` unless identical content is already stored, take a
+    reference to it and return its storage name.
+    """
+    digest = file_digest(upload)
+    name = _acquire(digest)
+    if name is not None:
+        return name
+
+    # Taken before saving, which may move the file away
+    size = upload.size
+    target = content_name(digest, namespace, upload.name)
+    # Same name, same bytes: a copy left behind by an earlier upload will do.
+    # Otherwise temporary uploads are moved into place rather than copied.
+    name = target if default_storage.exists(target) else default_storage.save(target, upload)
+    if _register(digest, name, size, 1):
+        return name
+    existing = _acquire(digest)
+    if existing is None:
+        return name
+    if name != target:
+        # Lost a race and saved under a suffixed name; keep the winner's copy
+        default_storage.delete(name)
+    return existing
+
+
+def share(name):
+    """
+    Take another reference to the stored file ``name``, which the caller
+    already holds, and return the name to use for it.
+    """
+    from .models import StoredFile
+
+    if StoredFile.objects.filter(name=name).update(ref_count=F('ref_count') + 1):
+        return name
+
+    # Stored before content addressing: register it, counting the existing holder
+    with default_storage.open(name, 'rb') as file:
+        digest = file_digest(file)
+        size = file.size
+    existing = _acquire(digest)
+    if existing is not None:
+        return existing
+    if _register(digest, name, size, 2):
+        return name
+    return share(name)
+
+
+def release(name):
+    """Drop a reference to ``name``; the file is deleted with its last one."""
+    from .models import StoredFile
+
+    if not name:
+        return
+    StoredFile.objects.filter(name=name, ref_count__gt=0).update(ref_count=F('ref_count') - 1)
+    deleted, _ = StoredFile.objects.filter(name=name, ref_count=0).delete()
+    if deleted:
+        transaction.on_commit(lambda: _delete_unreferenced(name))
+
+
+def _delete_unreferenced(name):
+    from .models import StoredFile
+
+    # An upload of the same content may have re-registered it meanwhile
+    if StoredFile.objects.filter(name=name).exists():
+        return
+    try:
+        default_storage.delete(name)
+    except Exception as e:
+        logger.warning('Could not delete unreferenced file %s: %s', name, e)
@@ -0,0 +1,322 @@
+"""
+Django management command to benchmark the API endpoints against a seeded
+database and record latency percentiles, SQL query counts and response sizes.
+
+Typical use:
+
+    python manage.py seed_data --scale 1
+    python manage.py benchmark_endpoints --output before.json
+    # ... change something ...
+    python manage.py benchmark_endpoints --output after.json --baseline before.json
+
+Two existing result files can also be compared without running anything:
+
+    python manage.py benchmark_endpoints --compare before.json after.json
+
+Every request runs inside a transaction that is rolled back, so writes made
+by the benchmark (applications, view counts) never reach the database.
+Throttling is switched off, since its buckets wouldn't be rolled back.
+"""
+
+import json
+import math
+import platform
+import statistics
+import tempfile
+import time
+from itertools import combinations
+
+from celery import current_app  # type: ignore
+from django.conf import settings  # type: ignore
+from django.core.files.uploadedfile import SimpleUploadedFile  # type: ignore
+from django.core.management.base import BaseCommand, CommandError  # type: ignore
+from django.db import connection, transaction  # type: ignore
+from django.db.models import Count  # type: ignore
+from django.test.utils import CaptureQueriesContext, override_settings  # type: ignore
+from django.urls import reverse  # type: ignore
+from django.utils import timezone  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+from rest_framework_simplejwt.tokens import RefreshToken  # type: ignore
+
+from core.models import User, JobAdvert, JobApplication, Skill, Category
+
+RESULTS_VERSION = 1
+METRICS = ('p50_ms', 'p95_ms', 'p99_ms')
+
+# Latencies below this many milliseconds are treated as noise when comparing
+NOISE_FLOOR_MS = 1.0
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of ``samples``."""
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def response_size(response):
+    if getattr(response, 'streaming', False):
+        return sum(len(chunk) for chunk in response.streaming_content)
+    return len(response.content)
+
+
+def compare_results(baseline, current, threshold):
+    """
+    Return ``(regressions, improvements)`` as lists of human readable lines.
+
+    A query count that grows, or a latency percentile or response size that
+    grows by more than ``threshold`` percent, is a regression.
+    """
+    regressions, improvements = [], []
+    factor = 1 + threshold / 100
+    for name, new in current['results'].items():
+        old = baseline['results'].get(name)
+        if old is None:
+            continue
+        if new['status'] != old['status']:
+            regressions.append(f"{name}: status {old['status']} → {new['status']}")
+        if new['queries'] > old['queries']:
+            regressions.append(f"{name}: queries {old['queries']} → {new['queries']}")
+        elif new['queries'] < old['queries']:
+            improvements.append(f"{name}: queries {old['queries']} → {new['queries']}")
+        if new['bytes'] > old['bytes'] * factor:
+            regressions.append(f"{name}: bytes {old['bytes']} → {new['bytes']}")
+        for metric in METRICS:
+            before, after = old[metric], new[metric]
+            if after > before * factor and after - before > NOISE_FLOOR_MS:
+                regressions.append(f'{name}: {metric} {before:.2f} → {after:.2f}')
+            elif before > after * factor and before - after > NOISE_FLOOR_MS:
+                improvements.append(f'{name}: {metric} {before:.2f} → {after:.2f}')
+    return regressions, improvements
+
+
+class Command(BaseCommand):
+    help = 'Benchmark API endpoints and record latency percentiles, query counts and response sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20,
+                            help='Measured requests per endpoint (default: 20)')
+        parser.add_argument('--warmup', type=int, default=2,
+                            help='Unmeasured requests per endpoint before measuring (default: 2)')
+        parser.add_argument('--max-filters', type=int, default=0,
+                            help='Largest advert filter combination to run; 0 runs every combination')
+        parser.add_argument('--only', default='',
+                            help='Only run endpoints whose name contains this text')
+        parser.add_argument('--output', default='benchmark-results.json',
+                            help='Where to write the JSON results (default: benchmark-results.json)')
+        parser.add_argument('--baseline',
+                            help='Compare this run with an earlier results file and fail on regressions')
+        parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                            help='Compare two existing results files without running the benchmark')
+        parser.add_argument('--threshold', type=float, default=20.0,
+                            help='Percent growth in latency or bytes counted as a regression (default: 20)')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        if options['compare']:
+            baseline, current = (self.load(path) for path in options['compare'])
+            return self.report(baseline, current, options['threshold'])
+
+        if options['iterations'] < 1:
+            raise CommandError('--iterations must be at least 1')
+        self.iterations = options['iterations']
+        self.warmup = max(options['warmup'], 0)
+
+        self.stdout.write('⏱️ Benchmarking API endpoints...')
+        results = {}
+        with tempfile.TemporaryDirectory() as media_root, override_settings(
+            ALLOWED_HOSTS=[*settings.ALLOWED_HOSTS, 'testserver'],
+            # Measure the endpoints, not the HTTPS redirect in front of them
+            SECURE_SSL_REDIRECT=False,
+            # Throttle buckets live in Redis, outside the rolled back transaction
+            REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {}},
+            MEDIA_ROOT=media_root,
+            EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend',
+        ):
+            # Notification tasks run inline instead of waiting on a broker
+            eager = current_app.conf.task_always_eager
+            current_app.conf.task_always_eager = True
+            try:
+                for case in self.get_cases(options['max_filters']):
+                    if options['only'] and options['only'] not in case['name']:
+                        continue
+                    results[case['name']] = self.run_case(case)
+            finally:
+                current_app.conf.task_always_eager = eager
+
+        if not results:
+            raise CommandError('No endpoints matched')
+
+        current = {
+            'version': RESULTS_VERSION,
+            'created_at': timezone.now().isoformat(),
+            'environment': self.describe_environment(),
+            'iterations': self.iterations,
+            'results': results,
+        }
+        with open(options['output'], 'w') as f:
+            json.dump(current, f, indent=2, sort_keys=True)
+        self.stdout.write(self.style.SUCCESS(f"✅ Wrote {len(results)} results to {options['output']}"))
+
+        if options['baseline']:
+            self.report(self.load(options['baseline']), current, options['threshold'])
+
+    def load(self, path):
+        try:
+            with open(path) as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read results from {path}: {e}')
+        if data.get('version') != RESULTS_VERSION:
+            raise CommandError(f'{path} was written by an incompatible version of this command')
+        return data
+
+    def report(self, baseline, current, threshold):
+        regressions, improvements = compare_results(baseline, current, threshold)
+        for line in improvements:
+            self.stdout.write(f'🚀 {line}')
+        for line in regressions:
+            self.stdout.write(self.style.ERROR(f'🐢 {line}'))
+        if regressions:
+            raise CommandError(f'{len(regressions)} regression(s) against the baseline')
+        self.stdout.write(self.style.SUCCESS('✅ No regressions against the baseline'))
+
+    def describe_environment(self):
+        return {
+            'database': connection.vendor,
+            'python': platform.python_version(),
+            'adverts': JobAdvert.objects.count(),
+            'applications': JobApplication.objects.count(),
+            'users': User.objects.count(),
+        }
+
+    # Cases
+
+    def get_cases(self, max_filters):
+        seeker = User.objects.filter(user_type='job_seeker').annotate(
+            total=Count('job_applications')
+        ).order_by('-total', 'id').first()
+        employer = User.objects.filter(user_type='employer').annotate(
+            total=Count('job_adverts__applications')
+        ).order_by('-total', 'id').first()
+        advert = JobAdvert.objects.filter(is_active=True).order_by('-applications_count', 'id').first()
+        if seeker is None or employer is None or advert is None:
+            raise CommandError('Seed the database first, e.g. `python manage.py seed_data --scale 1`')
+
+        seeker_client = self.client_for(seeker)
+        employer_client = self.client_for(employer)
+        anonymous = APIClient(raise_request_exception=False)
+        adverts_url = reverse('jobadvert-list')
+
+        yield self.case('skills', anonymous, reverse('skill-list'))
+        yield self.case('categories', anonymous, reverse('category-list'))
+        yield self.case('advert detail', anonymous, reverse('jobadvert-detail', args=[advert.pk]))
+        yield self.case('advert list (anonymous)', anonymous, adverts_url)
+
+        # Authenticated requests bypass the anonymous listing cache and hit the database
+        filters = self.advert_filters()
+        largest = len(filters) if max_filters < 1 else min(max_filters, len(filters))
+        for size in range(largest + 1):
+            for names in combinations(filters, size):
+                label = '+'.join(names) or 'unfiltered'
+                params = {name: filters[name] for name in names}
+                yield self.case(f'advert list [{label}]', seeker_client, adverts_url, params)
+        for ordering in ('salary_min', '-salary_min', '-views_count', 'relevance'):
+            params = {'ordering': ordering}
+            if ordering == 'relevance':
+                params['search'] = filters['search']
+            yield self.case(f'advert list ordered by {ordering}', seeker_client, adverts_url, params)
+        yield self.case('advert list with facets', seeker_client, adverts_url, {'facets': 'job_type,skills'})
+
+        applications_url = reverse('jobapplication-list')
+        yield self.case('application list (seeker)', seeker_client, applications_url)
+        yield self.case('application list (employer)', employer_client, applications_url)
+        application = JobApplication.objects.filter(job_seeker=seeker).order_by('-applied_at').first()
+        if application is not None:
+            yield self.case('application detail', seeker_client, reverse('jobapplication-detail', args=[application.pk]))
+
+        # Each apply needs an advert the seeker hasn't applied to yet
+        targets = list(JobAdvert.objects.filter(is_active=True).exclude(
+            applications__job_seeker=seeker
+        ).order_by('-created_at').values_list('pk', flat=True)[:self.iterations + self.warmup])
+        if len(targets) == self.iterations + self.warmup:
+            urls = iter(reverse('jobapplication-create', args=[pk]) for pk in targets)
+            yield self.case('apply', seeker_client, urls, method='post', data=self.application_data)
+
+    def advert_filters(self):
+        skill = Skill.objects.annotate(total=Count('jobadvertskill')).order_by('-total', 'id').first()
+        category = Category.objects.annotate(total=Count('jobadvertcategory')).order_by('-total', 'id').first()
+        filters = {
+            'job_type': 'full_time',
+            'experience_level': 'senior',
+            'is_remote': 'true',
+            'min_salary': '80000',
+            'max_salary': '200000',
+            'deadline': 'true',
+            'search': skill.name if skill else 'python',
+        }
+        if skill:
+            filters['skills'] = skill.pk
+        if category:
+            filters['categories'] = category.pk
+        return filters
+
+    def client_for(self, user):
+        client = APIClient(raise_request_exception=False)
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(user).access_token}')
+        return client
+
+    def case(self, name, client, url, params=None, method='get', data=None):
+        return {'name': name, 'client': client, 'url': url, 'params': params or {}, 'method': method, 'data': data}
+
+    def application_data(self):
+        return {
+            'cover_letter': 'Benchmark application.',
+            'resume': SimpleUploadedFile('resume.pdf', b'%PDF-1.4 benchmark', content_type='application/pdf'),
+        }
+
+    # Measurement
+
+    def request(self, case):
+        url = case['url'] if isinstance(case['url'], str) else next(case['url'])
+        send = getattr(case['client'], case['method'])
+        if case['method'] == 'get':
+            return send(url, case['params'])
+        return send(url, case['data'](), format='multipart')
+
+    def run_case(self, case):
+        timings, queries, sizes, statuses = [], [], [], set()
+        for iteration in range(self.warmup + self.iterations):
+            with transaction.atomic():
+                with CaptureQueriesContext(connection) as captured:
+                    started = time.perf_counter()
+                    response = self.request(case)
+                    size = response_size(response)
+                    elapsed = (time.perf_counter() - started) * 1000
+                transaction.set_rollback(True)
+            if iteration < self.warmup:
+                continue
+            timings.append(elapsed)
+            queries.append(len(captured))
+            sizes.append(size)
+            statuses.add(response.status_code)
+
+        result = {
+            'method': case['method'].upper(),
+            'path': case['url'] if isinstance(case['url'], str) else None,
+            'params': {name: str(value) for name, value in case['params'].items()},
+            'status': max(statuses),
+            'p50_ms': round(percentile(timings, 50), 3),
+            'p95_ms': round(percentile(timings, 95), 3),
+            'p99_ms': round(percentile(timings, 99), 3),
+            'mean_ms': round(statistics.fmean(timings), 3),
+            'queries': max(queries),
+            'bytes': max(sizes),
+        }
+        line = (f"{case['name']}: p50 {result['p50_ms']:.1f}ms p95 {result['p95_ms']:.1f}ms "
+                f"p99 {result['p99_ms']:.1f}ms, {result['queries']} queries, {result['bytes']} bytes")
+        if result['status'] >= 400:
+            self.stdout.write(self.style.WARNING(f"⚠️ {line} (HTTP {result['status']})"))
+        elif self.verbosity > 0:
+            self.stdout.write(f'✔️ {line}')
+        return result
@@ -0,0 +1,128 @@
+"""
+Django management command to EXPLAIN the canonical listing queries and flag
+plan regressions (full table scans, explicit sorts).
+
+Run it against seeded data, e.g. after `python manage.py seed_data`.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from core.models import JobApplication, User
+from core.views import JobAdvertListView
+
+# Tables that must never be read in full by a listing query
+LARGE_TABLES = ('core_jobadvert', 'core_jobapplication')
+
+# (name, query params, sort allowed)
+ADVERT_QUERIES = [
+    ('advert list', {}, False),
+    ('advert list by job type', {'job_type': 'full_time'}, False),
+    ('advert list by experience level', {'experience_level': 'senior'}, False),
+    ('advert list by minimum salary', {'min_salary': '100000'}, True),
+    ('advert list ordered by salary', {'ordering': 'salary_min'}, False),
+    ('advert list ordered by salary desc', {'ordering': '-salary_min'}, False),
+    ('advert list ordered by views', {'ordering': '-views_count'}, False),
+    ('advert search', {'search': 'python'}, True),
+    ('advert search by relevance', {'search': 'python', 'ordering': 'relevance'}, True),
+]
+
+
+class Command(BaseCommand):
+    help = 'EXPLAIN the canonical listing queries and fail on full scans of large tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--strict', action='store_true',
+                            help='Also fail when a query needs an explicit sort')
+        parser.add_argument('--natural', action='store_true',
+                            help='Keep sequential scans enabled on PostgreSQL (small datasets will then seq scan)')
+
+    def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
+        self.strict = options['strict']
+
+        if connection.vendor == 'postgresql' and not options['natural']:
+            # On a small dataset the planner prefers seq scans even when a usable index exists
+            with connection.cursor() as cursor:
+                cursor.execute('SET enable_seqscan = off')
+
+        failures = 0
+        for name, queryset, allow_sort in self.get_queries():
+            failures += self.check_plan(name, queryset, allow_sort)
+
+        if connection.vendor == 'postgresql' and not options['natural']:
+            with connection.cursor() as cursor:
+                cursor.execute('RESET enable_seqscan')
+
+        if failures:
+            raise CommandError(f'{failures} query plan(s) regressed')
+        self.stdout.write(self.style.SUCCESS('✅ All query plans use indexes'))
+
+    def get_queries(self):
+        factory = APIRequestFactory()
+        for name, params, allow_sort in ADVERT_QUERIES:
+            request = factory.get('/api/adverts/', params)
+            yield name, self.page_queryset(JobAdvertListView, request), allow_sort
+
+        seeker = User.objects.filter(user_type='job_seeker').order_by('id').first()
+        advert_id = JobApplication.objects.order_by('id').values_list('job_advert_id', flat=True).first()
+        applications = JobApplication.objects.order_by('-applied_at', '-id')
+        if seeker is not None:
+            yield 'seeker applications', applications.filter(job_seeker=seeker)[:21], False
+            yield 'seeker applications by status', applications.filter(job_seeker=seeker, status='pending')[:21], False
+        employer_id = JobApplication.objects.order_by('id').values_list('employer_id', flat=True).first()
+        if employer_id is not None:
+            yield 'employer applications', applications.filter(employer_id=employer_id)[:21], False
+            yield 'employer applications by status', applications.filter(
+                employer_id=employer_id, status='pending'
+            )[:21], False
+        if advert_id is not None:
+            yield 'advert applications', applications.filter(job_advert_id=advert_id)[:21], False
+            yield 'advert applications by status', applications.filter(job_advert_id=advert_id, status='pending')[:21], False
+            ranked = JobApplication.objects.filter(job_advert_id=advert_id).order_by('-match_score', '-id')
+            yield 'ranked advert applications', ranked[:21], False
+
+    def page_queryset(self, view_class, request, user=None):
+        """Build the exact first-page queryset the view would run."""
+        if user is not None:
+            force_authenticate(request, user=user)
+        view = view_class()
+        view.setup(request)
+        view.request = view.initialize_request(request)
+        view.format_kwarg = None
+        queryset = view.filter_queryset(view.get_queryset())
+        return view.paginator.get_page_queryset(queryset, view.request, view)
+
+    def check_plan(self, name, queryset, allow_sort):
+        plan = queryset.explain()
+        problems = []
+        for line in plan.splitlines():
+            if self.is_full_scan(line):
+                problems.append(line.strip())
+            elif self.strict and not allow_sort and self.is_sort(line):
+                problems.append(line.strip())
+
+        if problems:
+            self.stdout.write(self.style.ERROR(f'❌ {name}'))
+            for problem in problems:
+                self.stdout.write(f'     {problem}')
+        else:
+            self.stdout.write(f'✔️ {name}')
+        if self.verbosity > 1 or problems:
+            self.stdout.write(plan)
+        return int(bool(problems))
+
+    def is_full_scan(self, line):
+        if connection.vendor == 'postgresql':
+            return any(f'Seq Scan on {table}' in line for table in LARGE_TABLES)
+        if connection.vendor == 'sqlite':
+            # "SCAN t USING INDEX i" walks an index in order; a bare "SCAN t" reads the table
+            words = line.replace('|', ' ').replace('-', ' ').split()
+            return len(words) == 2 and words[0] == 'SCAN' and words[1] in LARGE_TABLES
+        return False
+
+    def is_sort(self, line):
+        if connection.vendor == 'postgresql':
+            return line.strip().lstrip('-> ').startswith('Sort')
+        return 'TEMP B-TREE FOR ORDER BY' in line
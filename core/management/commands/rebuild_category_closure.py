@@ -0,0 +1,14 @@
+"""
+Django management command to recompute the category closure table.
+"""
+
+from django.core.management.base import BaseCommand
+from core.categories import rebuild_category_closure
+
+
+class Command(BaseCommand):
+    help = 'Recompute CategoryClosure from Category.parent (e.g. after loaddata or queryset updates)'
+
+    def handle(self, *args, **options):
+        rows = rebuild_category_closure()
+        self.stdout.write(self.style.SUCCESS(f'✅ Rebuilt category closure with {rows} rows'))
@@ -0,0 +1,18 @@
+"""
+Django management command to repair drift in denormalized job advert counters.
+"""
+
+from django.core.management.base import BaseCommand
+from core.counters import reconcile_application_counts
+
+
+class Command(BaseCommand):
+    help = 'Recompute JobAdvert.applications_count from the applications table'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=5000,
+                            help='Number of advert ids covered by each UPDATE')
+
+    def handle(self, *args, **options):
+        fixed = reconcile_application_counts(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Corrected applications_count on {fixed} job adverts'))
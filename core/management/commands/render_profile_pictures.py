@@ -0,0 +1,20 @@
+"""
+Django management command to render the resized renditions of profile
+pictures that don't have them yet, e.g. pictures uploaded before renditions
+existed.
+"""
+
+from django.core.management.base import BaseCommand
+from core.models import User
+from core.thumbnails import render_profile_picture
+
+
+class Command(BaseCommand):
+    help = 'Render profile picture renditions for users whose picture has none'
+
+    def handle(self, *args, **options):
+        pending = User.objects.exclude(profile_picture='').exclude(profile_picture=None).filter(
+            profile_picture_renditions={}
+        ).values_list('id', 'profile_picture')
+        rendered = sum(render_profile_picture(user_id, name) for user_id, name in pending.iterator())
+        self.stdout.write(self.style.SUCCESS(f'✅ Rendered {rendered} profile pictures'))
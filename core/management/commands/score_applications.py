@@ -0,0 +1,25 @@
+"""
+Django management command to (re)compute applicant match scores, e.g. after
+upgrading or after bulk-loading applications.
+"""
+
+from django.core.management.base import BaseCommand
+from core.models import JobApplication
+from core.ranking import RESCORE_BATCH_SIZE, score_all
+
+
+class Command(BaseCommand):
+    help = 'Recompute JobApplication.match_score for every application, or for the given advert ids'
+
+    def add_arguments(self, parser):
+        parser.add_argument('advert_ids', nargs='*', type=int,
+                            help='Only rescore applications to these adverts')
+        parser.add_argument('--batch-size', type=int, default=RESCORE_BATCH_SIZE,
+                            help='Number of applications scored per batch')
+
+    def handle(self, *args, **options):
+        applications = JobApplication.objects.all()
+        if options['advert_ids']:
+            applications = applications.filter(job_advert_id__in=options['advert_ids'])
+        scored = score_all(applications, options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(f'✅ Scored {scored} job applications'))
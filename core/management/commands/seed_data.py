@@ -2,18 +2,40 @@
 Django management command to seed the database with sample data for development and testing.
 """
 
-from django.core.management.base import BaseCommand
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 from datetime import timedelta
+from core.cache import bump_generation
+from core.counters import reconcile_application_counts
+from core.facets import rebuild_facet_counts
+from core.management.synthetic import SyntheticDataGenerator, USERNAME_PREFIX
 from core.models import User, JobAdvert, JobApplication, Skill, Category, JobAdvertSkill, JobAdvertCategory
+from core.recommendations import rebuild_skill_matrix
 
 User = get_user_model()
 
 class Command(BaseCommand):
     help = 'Seed database with sample data for development and testing'
 
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', type=float, default=0,
+                            help='Also generate synthetic load-test data: 1,000 users, 5,000 adverts '
+                                 'and 10,000 applications per unit')
+        parser.add_argument('--seed', type=int, default=42,
+                            help='Random seed for synthetic data (same seed and scale give the same data)')
+        parser.add_argument('--chunk-size', type=int, default=5000,
+                            help='Rows written per batch when generating synthetic data')
+
     def handle(self, *args, **options):
+        if options['scale'] < 0:
+            raise CommandError('--scale must be positive')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be at least 1')
+        if options['scale'] and User.objects.filter(username__startswith=f'{USERNAME_PREFIX}_').exists():
+            raise CommandError('Synthetic data already exists; flush the database before generating it again')
+
         self.stdout.write('🌱 Seeding database with sample data...')
 
         # Create superuser
@@ -34,10 +56,33 @@ class Command(BaseCommand):
         # Create job applications
         self.create_job_applications(users, jobs)
 
+        if options['scale']:
+            self.generate_synthetic_data(skills, categories, options)
+
         self.stdout.write(self.style.SUCCESS('✅ Database seeded successfully!'))
         self.stdout.write('🔑 Admin credentials: admin / admin123')
         self.stdout.write('👥 Sample users created with passwords matching usernames')
 
+    def generate_synthetic_data(self, skills, categories, options):
+        """Generate load-test data at the requested scale"""
+        self.stdout.write(f'🏭 Generating synthetic data at scale {options["scale"]:g}...')
+        SyntheticDataGenerator(
+            scale=options['scale'],
+            skills=skills,
+            categories=categories,
+            seed=options['seed'],
+            chunk_size=options['chunk_size'],
+            log=self.stdout.write,
+        ).run()
+
+        # Bulk inserts skip signals, so derived data is rebuilt in one pass
+        rebuild_facet_counts()
+        reconcile_application_counts()
+        bump_generation()
+        rebuild_skill_matrix()
+        call_command('score_applications', stdout=self.stdout)
+        self.stdout.write('🧮 Rebuilt facet counts, application counters, match scores and recommendations')
+
     def create_superuser(self):
         """Create superuser"""
         if not User.objects.filter(username='admin').exists():
@@ -0,0 +1,292 @@
+"""
+Deterministic synthetic data generator used by `seed_data --scale`.
+
+Rows are produced lazily and written in fixed-size chunks (COPY on
+PostgreSQL, bulk_create elsewhere), so memory stays flat apart from compact
+arrays of generated ids and timestamps needed to wire up foreign keys.
+"""
+
+import json
+import random
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone as dt_timezone
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection, models, transaction
+from django.utils import timezone
+
+from core.models import User, JobAdvert, JobApplication, JobAdvertSkill, JobAdvertCategory, UserSkill
+
+# Rows generated per unit of --scale
+USERS_PER_SCALE = 1000
+ADVERTS_PER_SCALE = 5000
+APPLICATIONS_PER_SCALE = 10000
+
+EMPLOYER_SHARE = 0.1
+USERNAME_PREFIX = 'loadtest'
+HISTORY_DAYS = 365
+
+JOB_TYPES = (('full_time', 60), ('part_time', 10), ('contract', 15), ('freelance', 8), ('internship', 7))
+EXPERIENCE_LEVELS = (('entry', 20), ('mid', 45), ('senior', 28), ('executive', 7))
+STATUSES = (('pending', 50), ('reviewed', 20), ('interview', 10), ('rejected', 15), ('accepted', 3), ('withdrawn', 2))
+BASE_SALARY = {'entry': 55000, 'mid': 90000, 'senior': 130000, 'executive': 190000}
+
+ROLES = ('Developer', 'Engineer', 'Analyst', 'Designer', 'Architect', 'Consultant', 'Manager', 'Specialist')
+LEVEL_TITLES = {'entry': 'Junior', 'mid': '', 'senior': 'Senior', 'executive': 'Head of'}
+CITIES = (
+    'San Francisco, CA', 'New York, NY', 'Austin, TX', 'Seattle, WA', 'Boston, MA', 'Chicago, IL',
+    'Denver, CO', 'Atlanta, GA', 'Portland, OR', 'Los Angeles, CA', 'Miami, FL', 'Remote',
+)
+
+
+def weighted(rng, choices):
+    values, weights = zip(*choices)
+    return rng.choices(values, weights)[0]
+
+
+def popular(rng, items, k):
+    """Pick ``k`` distinct items with a Zipf-like bias towards the first ones."""
+    picked = {}
+    while len(picked) < min(k, len(items)):
+        item = items[min(int(len(items) * rng.random() ** 2.5), len(items) - 1)]
+        picked[item.pk] = item
+    return list(picked.values())
+
+
+@contextmanager
+def explicit_timestamps(*models):
+    """Let bulk_create keep the created/updated values we generate."""
+    fields = [
+        field for model in models for field in model._meta.fields
+        if getattr(field, 'auto_now', False) or getattr(field, 'auto_now_add', False)
+    ]
+    saved = [(field, field.auto_now, field.auto_now_add) for field in fields]
+    for field in fields:
+        field.auto_now = field.auto_now_add = False
+    try:
+        yield
+    finally:
+        for field, auto_now, auto_now_add in saved:
+            field.auto_now, field.auto_now_add = auto_now, auto_now_add
+
+
+def copy_value(value):
+    if value is None:
+        return ''
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+def db_value(field, obj):
+    value = getattr(obj, field.attname)
+    if isinstance(field, models.JSONField):
+        # get_db_prep_save wraps JSON in a driver adapter whose str() isn't JSON
+        return None if value is None else json.dumps(field.get_prep_value(value), cls=field.encoder)
+    return field.get_db_prep_save(value, connection)
+
+
+def bulk_insert(model, objs, chunk_size):
+    """
+    Insert ``objs`` chunk by chunk and return how many rows were written.
+    PostgreSQL gets COPY; other databases get bulk_create.
+    """
+    fields = [field for field in model._meta.concrete_fields if not field.primary_key]
+    total = 0
+    chunk = []
+
+    def flush():
+        if connection.vendor == 'postgresql':
+            buffer = StringIO()
+            for obj in chunk:
+                buffer.write(','.join(
+                    copy_value(db_value(field, obj)) for field in fields
+                ))
+                buffer.write('\n')
+            buffer.seek(0)
+            columns = ', '.join(connection.ops.quote_name(field.column) for field in fields)
+            with connection.cursor() as cursor:
+                cursor.copy_expert(
+                    f'COPY {connection.ops.quote_name(model._meta.db_table)} ({columns}) FROM STDIN WITH (FORMAT csv)',
+                    buffer
+                )
+        else:
+            model.objects.bulk_create(chunk, batch_size=chunk_size)
+
+    for obj in objs:
+        chunk.append(obj)
+        if len(chunk) >= chunk_size:
+            with transaction.atomic():
+                flush()
+            total += len(chunk)
+            chunk = []
+    if chunk:
+        with transaction.atomic():
+            flush()
+        total += len(chunk)
+    return total
+
+
+def ids_after(model, last_id, chunk_size):
+    """Read back ids generated after ``last_id`` into a compact array."""
+    ids = array('q')
+    rows = model.objects.filter(pk__gt=last_id).order_by('pk').values_list('pk', flat=True)
+    for pk in rows.iterator(chunk_size=chunk_size):
+        ids.append(pk)
+    return ids
+
+
+def max_id(model):
+    return model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+
+class SyntheticDataGenerator:
+    def __init__(self, scale, skills, categories, seed=42, chunk_size=5000, log=print):
+        self.scale = scale
+        self.skills = list(skills)
+        self.categories = list(categories)
+        self.seed = seed
+        self.chunk_size = chunk_size
+        self.log = log
+        # Anchored to midnight so reruns on the same day produce identical rows
+        self.now = timezone.now().replace(hour=0, minute=0, second=0, microsecond=0)
+
+    def rng(self, stream):
+        # Each table gets its own stream so counts for one don't shift the others
+        return random.Random(f'{self.seed}:{stream}')
+
+    def run(self):
+        users = int(self.scale * USERS_PER_SCALE)
+        employers = max(1, int(users * EMPLOYER_SHARE))
+        seekers = max(1, users - employers)
+
+        employer_ids = self.create_users('employer', employers)
+        seeker_ids = self.create_users('job_seeker', seekers)
+        self.create_seeker_skills(seeker_ids)
+        advert_ids, advert_times, advert_employers = self.create_adverts(
+            employer_ids, int(self.scale * ADVERTS_PER_SCALE)
+        )
+        self.create_advert_tags(advert_ids)
+        self.create_applications(
+            seeker_ids, advert_ids, advert_times, advert_employers, int(self.scale * APPLICATIONS_PER_SCALE)
+        )
+
+    def create_users(self, user_type, count):
+        rng = self.rng(f'users:{user_type}')
+        password = make_password(USERNAME_PREFIX)
+        last_id = max_id(User)
+
+        def rows():
+            for i in range(count):
+                username = f'{USERNAME_PREFIX}_{user_type}_{i}'
+                yield User(
+                    username=username,
+                    email=f'{username}@example.com',
+                    password=password,
+                    user_type=user_type,
+                    company_name=f'Company {i}' if user_type == 'employer' else None,
+                    location=rng.choice(CITIES),
+                    date_joined=self.now - timedelta(days=rng.random() * HISTORY_DAYS * 2),
+                )
+
+        written = bulk_insert(User, rows(), self.chunk_size)
+        self.log(f'👥 Generated {written} {user_type} users')
+        return ids_after(User, last_id, self.chunk_size)
+
+    def create_seeker_skills(self, seeker_ids):
+        rng = self.rng('seeker-skills')
+
+        def rows():
+            for seeker_id in seeker_ids:
+                for skill in popular(rng, self.skills, rng.randint(2, 10)):
+                    yield UserSkill(user_id=seeker_id, skill_id=skill.pk, proficiency_level=rng.randint(1, 5))
+
+        self.log(f'🧠 Generated {bulk_insert(UserSkill, rows(), self.chunk_size)} seeker skills')
+
+    def create_adverts(self, employer_ids, count):
+        rng = self.rng('adverts')
+        last_id = max_id(JobAdvert)
+        times = array('d')
+        employers = array('q')
+
+        def rows():
+            for _ in range(count):
+                level = weighted(rng, EXPERIENCE_LEVELS)
+                skills = popular(rng, self.skills, 3)
+                title = ' '.join(part for part in (LEVEL_TITLES[level], skills[0].name, rng.choice(ROLES)) if part)
+                created = self.now - timedelta(days=rng.random() ** 1.5 * HISTORY_DAYS)
+                times.append(created.timestamp())
+                salary = None
+                if rng.random() > 0.1:
+                    salary = Decimal(int(BASE_SALARY[level] * rng.lognormvariate(0, 0.25)) // 1000 * 1000)
+                location = rng.choice(CITIES)
+                employers.append(employer_ids[int(len(employer_ids) * rng.random() ** 2)])
+                yield JobAdvert(
+                    employer_id=employers[-1],
+                    title=title,
+                    description=f'{title} working with {", ".join(skill.name for skill in skills)} on production systems.',
+                    requirements=f'Experience with {" and ".join(skill.name for skill in skills[:2])}.',
+                    location=location,
+                    job_type=weighted(rng, JOB_TYPES),
+                    experience_level=level,
+                    salary_min=salary,
+                    salary_max=salary and salary * Decimal('1.3'),
+                    is_remote=location == 'Remote' or rng.random() < 0.3,
+                    application_deadline=(created + timedelta(days=rng.randint(14, 90))).date(),
+                    is_active=rng.random() < 0.85,
+                    views_count=int(rng.paretovariate(1.2) * 10),
+                    created_at=created,
+                    updated_at=created,
+                )
+
+        with explicit_timestamps(JobAdvert):
+            written = bulk_insert(JobAdvert, rows(), self.chunk_size)
+        self.log(f'💼 Generated {written} job adverts')
+        return ids_after(JobAdvert, last_id, self.chunk_size), times, employers
+
+    def create_advert_tags(self, advert_ids):
+        rng = self.rng('advert-tags')
+
+        def skill_rows():
+            for advert_id in advert_ids:
+                for skill in popular(rng, self.skills, rng.randint(3, 8)):
+                    yield JobAdvertSkill(job_advert_id=advert_id, skill_id=skill.pk, importance_level=rng.randint(1, 5))
+
+        def category_rows():
+            for advert_id in advert_ids:
+                for category in popular(rng, self.categories, rng.randint(1, 2)):
+                    yield JobAdvertCategory(job_advert_id=advert_id, category_id=category.pk)
+
+        self.log(f'🛠️ Generated {bulk_insert(JobAdvertSkill, skill_rows(), self.chunk_size)} advert skills')
+        self.log(f'📁 Generated {bulk_insert(JobAdvertCategory, category_rows(), self.chunk_size)} advert categories')
+
+    def create_applications(self, seeker_ids, advert_ids, advert_times, advert_employers, count):
+        rng = self.rng('applications')
+        per_seeker, extra = divmod(count, len(seeker_ids))
+
+        def rows():
+            for index, seeker_id in enumerate(seeker_ids):
+                wanted = min(per_seeker + (index < extra), len(advert_ids))
+                chosen = set()
+                while len(chosen) < wanted:
+                    # Recent adverts attract more applicants
+                    chosen.add(len(advert_ids) - 1 - int(len(advert_ids) * rng.random() ** 2))
+                for position in sorted(chosen):
+                    created = advert_times[position]
+                    applied = created + rng.random() * max(self.now.timestamp() - created, 1)
+                    applied_at = datetime.fromtimestamp(applied, tz=dt_timezone.utc)
+                    yield JobApplication(
+                        job_seeker_id=seeker_id,
+                        job_advert_id=advert_ids[position],
+                        employer_id=advert_employers[position],
+                        cover_letter='I would like to apply for this role.',
+                        resume=f'application_resumes/{USERNAME_PREFIX}/{seeker_id}.pdf',
+                        status=weighted(rng, STATUSES),
+                        applied_at=applied_at,
+                        updated_at=applied_at,
+                    )
+
+        with explicit_timestamps(JobApplication):
+            written = bulk_insert(JobApplication, rows(), self.chunk_size)
+        self.log(f'📄 Generated {written} job applications')
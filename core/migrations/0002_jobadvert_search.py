@@ -0,0 +1,93 @@
+from django.db import migrations
+
+
+POSTGRES_FORWARD = [
+    'ALTER TABLE core_jobadvert ADD COLUMN search_vector tsvector',
+    '''
+    CREATE OR REPLACE FUNCTION core_jobadvert_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.requirements, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(NEW.location, '')), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    ''',
+    '''
+    CREATE TRIGGER core_jobadvert_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, requirements, description, location ON core_jobadvert
+    FOR EACH ROW EXECUTE FUNCTION core_jobadvert_search_vector_update()
+    ''',
+    # Fire the trigger once for existing rows
+    'UPDATE core_jobadvert SET title = title',
+    'CREATE INDEX core_jobadvert_search_vector_gin ON core_jobadvert USING gin (search_vector)',
+]
+
+POSTGRES_BACKWARD = [
+    'DROP TRIGGER IF EXISTS core_jobadvert_search_vector_trigger ON core_jobadvert',
+    'DROP FUNCTION IF EXISTS core_jobadvert_search_vector_update()',
+    'DROP INDEX IF EXISTS core_jobadvert_search_vector_gin',
+    'ALTER TABLE core_jobadvert DROP COLUMN IF EXISTS search_vector',
+]
+
+SQLITE_FORWARD = [
+    '''
+    CREATE VIRTUAL TABLE core_jobadvert_fts USING fts5(
+        title, requirements, description, location,
+        content='core_jobadvert', content_rowid='id', tokenize='porter unicode61'
+    )
+    ''',
+    '''
+    CREATE TRIGGER core_jobadvert_fts_insert AFTER INSERT ON core_jobadvert BEGIN
+        INSERT INTO core_jobadvert_fts(rowid, title, requirements, description, location)
+        VALUES (new.id, new.title, new.requirements, new.description, new.location);
+    END
+    ''',
+    '''
+    CREATE TRIGGER core_jobadvert_fts_delete AFTER DELETE ON core_jobadvert BEGIN
+        INSERT INTO core_jobadvert_fts(core_jobadvert_fts, rowid, title, requirements, description, location)
+        VALUES ('delete', old.id, old.title, old.requirements, old.description, old.location);
+    END
+    ''',
+    '''
+    CREATE TRIGGER core_jobadvert_fts_update
+    AFTER UPDATE OF title, requirements, description, location ON core_jobadvert BEGIN
+        INSERT INTO core_jobadvert_fts(core_jobadvert_fts, rowid, title, requirements, description, location)
+        VALUES ('delete', old.id, old.title, old.requirements, old.description, old.location);
+        INSERT INTO core_jobadvert_fts(rowid, title, requirements, description, location)
+        VALUES (new.id, new.title, new.requirements, new.description, new.location);
+    END
+    ''',
+    "INSERT INTO core_jobadvert_fts(core_jobadvert_fts) VALUES ('rebuild')",
+]
+
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS core_jobadvert_fts_insert',
+    'DROP TRIGGER IF EXISTS core_jobadvert_fts_delete',
+    'DROP TRIGGER IF EXISTS core_jobadvert_fts_update',
+    'DROP TABLE IF EXISTS core_jobadvert_fts',
+]
+
+
+def run_statements(statements):
+    def run(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        for sql in statements.get(vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_statements({'postgresql': POSTGRES_FORWARD, 'sqlite': SQLITE_FORWARD}),
+            run_statements({'postgresql': POSTGRES_BACKWARD, 'sqlite': SQLITE_BACKWARD}),
+        ),
+    ]
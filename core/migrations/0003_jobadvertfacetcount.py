@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:43
+
+from django.db import migrations, models
+
+
+def backfill_facet_counts(apps, schema_editor):
+    from core.facets import rebuild_facet_counts
+    rebuild_facet_counts(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_jobadvert_search'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='JobAdvertFacetCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('job_type', models.CharField(max_length=20)),
+                ('experience_level', models.CharField(max_length=20)),
+                ('is_remote', models.BooleanField()),
+                ('skill_id', models.PositiveIntegerField(default=0)),
+                ('category_id', models.PositiveIntegerField(default=0)),
+                ('count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Job Advert Facet Count',
+                'verbose_name_plural': 'Job Advert Facet Counts',
+                'unique_together': {('job_type', 'experience_level', 'is_remote', 'skill_id', 'category_id')},
+            },
+        ),
+        migrations.RunPython(backfill_facet_counts, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_jobadvertfacetcount'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='jobadvert',
+            name='core_jobadv_title_404da2_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='jobadvert',
+            name='core_jobadv_locatio_2da4c7_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='jobadvert',
+            name='core_jobadv_job_typ_68014b_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='jobadvert',
+            name='core_jobadv_experie_74b2e3_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='jobadvert',
+            name='core_jobadv_created_83ecfe_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='jobapplication',
+            name='core_jobapp_status_398880_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='jobapplication',
+            name='core_jobapp_applied_aea653_idx',
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-created_at', '-id'], name='jobadvert_active_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['job_type', '-created_at', '-id'], name='jobadvert_active_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['experience_level', '-created_at', '-id'], name='jobadvert_active_level_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['salary_min', 'id'], name='jobadvert_active_salmin_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['salary_max', 'id'], name='jobadvert_active_salmax_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobadvert',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['-views_count', '-id'], name='jobadvert_active_views_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job_seeker', '-applied_at', '-id'], name='jobapp_seeker_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job_seeker', 'status', '-applied_at', '-id'], name='jobapp_seeker_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job_advert', '-applied_at', '-id'], name='jobapp_advert_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job_advert', 'status', '-applied_at', '-id'], name='jobapp_advert_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['status', '-applied_at', '-id'], name='jobapp_status_applied_idx'),
+        ),
+    ]
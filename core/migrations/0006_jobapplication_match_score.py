@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_userskill'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='match_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['job_advert', '-match_score', '-id'], name='jobapp_advert_score_idx'),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.6 on 2026-10-18 02:07
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill_employers(apps, schema_editor):
+    JobAdvert = apps.get_model('core', 'JobAdvert')
+    JobApplication = apps.get_model('core', 'JobApplication')
+    JobApplication.objects.update(employer_id=Subquery(
+        JobAdvert.objects.filter(pk=OuterRef('job_advert_id')).values('employer_id')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_jobapplication_match_score'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='jobapplication',
+            name='employer',
+            field=models.ForeignKey(blank=True, db_index=False, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='received_applications', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_employers, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['employer', '-applied_at', '-id'], name='jobapp_employer_applied_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='jobapplication',
+            index=models.Index(fields=['employer', 'status', '-applied_at', '-id'], name='jobapp_employer_status_idx'),
+        ),
+    ]
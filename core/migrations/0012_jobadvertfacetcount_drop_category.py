@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 04:01
+
+from django.db import migrations
+
+
+def delete_category_cells(apps, schema_editor):
+    # Category facets are grouped through the closure table now
+    JobAdvertFacetCount = apps.get_model('core', 'JobAdvertFacetCount')
+    JobAdvertFacetCount.objects.exclude(category_id=0).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0011_categoryclosure'),
+    ]
+
+    operations = [
+        migrations.RunPython(delete_category_cells, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='jobadvertfacetcount',
+            unique_together={('job_type', 'experience_level', 'is_remote', 'skill_id')},
+        ),
+        migrations.RemoveField(
+            model_name='jobadvertfacetcount',
+            name='category_id',
+        ),
+    ]
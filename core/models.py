@@ -1,8 +1,10 @@
+import uuid
+
 from django.contrib.auth.models import AbstractUser
 from django.core.validators import (
     MaxValueValidator, MinValueValidator, RegexValidator
 )
-from django.db import models
+from django.db import models, transaction
 from django.utils.translation import gettext_lazy as _
 
 # type: ignore
@@ -20,6 +22,8 @@ class User(AbstractUser):
     phone_number = models.CharField(validators=[phone_number_validator], max_length=17, blank=True, null=True)
     bio = models.TextField(blank=True, null=True)
     profile_picture = models.ImageField(upload_to='profile_pictures/%Y/%m/%d/', blank=True, null=True)
+    # Resized copies of profile_picture by size and format, filled in by core.thumbnails
+    profile_picture_renditions = models.JSONField(default=dict, blank=True, editable=False)
     resume = models.FileField(upload_to='resumes/%Y/%m/%d/', blank=True, null=True)
     website = models.URLField(blank=True, null=True)
     location = models.CharField(max_length=255, blank=True, null=True)
@@ -31,6 +35,38 @@ class User(AbstractUser):
     def __str__(self):
         return f"{self.username} ({self.get_user_type_display()})"
 
+    def save(self, *args, **kwargs):
+        if self.profile_picture_changed() and self.profile_picture_renditions:
+            # They show the previous picture; core.tasks deletes the files once saved
+            self._stale_renditions, self.profile_picture_renditions = self.profile_picture_renditions, {}
+            if kwargs.get('update_fields') is not None:
+                kwargs['update_fields'] = {*kwargs['update_fields'], 'profile_picture_renditions'}
+        super().save(*args, **kwargs)
+
+    def profile_picture_changed(self):
+        """Whether profile_picture differs from the picture loaded from the database."""
+        if not hasattr(self, '_original_profile_picture'):
+            return False
+        return (self.profile_picture.name or None) != self._original_profile_picture
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored picture so a new one gets fresh renditions
+        if 'profile_picture' in field_names:
+            instance._original_profile_picture = instance.profile_picture.name or None
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, **kwargs):
+        deferred = self.get_deferred_fields()
+        if fields is not None and deferred.intersection(fields):
+            # Reading one deferred column loads them all, so a user from
+            # core.authentication costs one query however much is read
+            fields = deferred.union(fields)
+        super().refresh_from_db(using, fields, **kwargs)
+        if 'profile_picture' in deferred and 'profile_picture' not in self.get_deferred_fields():
+            self._original_profile_picture = self.profile_picture.name or None
+
 
 class JobAdvert(models.Model):
     JOB_TYPE_CHOICES = (
@@ -72,12 +108,21 @@ class JobAdvert(models.Model):
         verbose_name = _('Job Advert')
         verbose_name_plural = _('Job Adverts')
         ordering = ['-created_at']
+        # Listings only ever read active adverts, so index just those rows.
+        # Text search is served by the search_vector GIN index (migration 0002).
         indexes = [
-            models.Index(fields=['title']),
-            models.Index(fields=['location']),
-            models.Index(fields=['job_type']),
-            models.Index(fields=['experience_level']),
-            models.Index(fields=['created_at']),
+            models.Index(fields=['-created_at', '-id'], condition=models.Q(is_active=True),
+                         name='jobadvert_active_created_idx'),
+            models.Index(fields=['job_type', '-created_at', '-id'], condition=models.Q(is_active=True),
+                         name='jobadvert_active_type_idx'),
+            models.Index(fields=['experience_level', '-created_at', '-id'], condition=models.Q(is_active=True),
+                         name='jobadvert_active_level_idx'),
+            models.Index(fields=['salary_min', 'id'], condition=models.Q(is_active=True),
+                         name='jobadvert_active_salmin_idx'),
+            models.Index(fields=['salary_max', 'id'], condition=models.Q(is_active=True),
+                         name='jobadvert_active_salmax_idx'),
+            models.Index(fields=['-views_count', '-id'], condition=models.Q(is_active=True),
+                         name='jobadvert_active_views_idx'),
         ]
     
     def __str__(self):
@@ -94,11 +139,21 @@ class JobApplication(models.Model):
         ('withdrawn', 'Withdrawn'),
     )
     
+    # Statuses counted in JobAdvert.applications_count
+    ACTIVE_STATUSES = ('pending', 'reviewed', 'interview', 'accepted')
+    
     job_seeker = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, related_name='job_applications')
     job_advert = models.ForeignKey(JobAdvert, on_delete=models.CASCADE, related_name='applications')
+    # Copied from job_advert on save so the employer inbox can use its own index
+    employer = models.ForeignKey(
+        User, on_delete=models.SET_NULL, null=True, blank=True, editable=False,
+        related_name='received_applications', db_index=False
+    )
     cover_letter = models.TextField()
     resume = models.FileField(upload_to='application_resumes/%Y/%m/%d/')
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    # Share of the advert's skill requirements the applicant covers; see core.ranking
+    match_score = models.FloatField(default=0)
     applied_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
@@ -107,13 +162,37 @@ class JobApplication(models.Model):
         verbose_name_plural = _('Job Applications')
         ordering = ['-applied_at']
         unique_together = ['job_seeker', 'job_advert']
+        # One index per inbox access path: seeker, employer or advert, optionally by status, plus applicant ranking
         indexes = [
-            models.Index(fields=['status']),
-            models.Index(fields=['applied_at']),
+            models.Index(fields=['job_seeker', '-applied_at', '-id'], name='jobapp_seeker_applied_idx'),
+            models.Index(fields=['job_seeker', 'status', '-applied_at', '-id'], name='jobapp_seeker_status_idx'),
+            models.Index(fields=['job_advert', '-applied_at', '-id'], name='jobapp_advert_applied_idx'),
+            models.Index(fields=['job_advert', 'status', '-applied_at', '-id'], name='jobapp_advert_status_idx'),
+            models.Index(fields=['status', '-applied_at', '-id'], name='jobapp_status_applied_idx'),
+            models.Index(fields=['job_advert', '-match_score', '-id'], name='jobapp_advert_score_idx'),
+            models.Index(fields=['employer', '-applied_at', '-id'], name='jobapp_employer_applied_idx'),
+            models.Index(fields=['employer', 'status', '-applied_at', '-id'], name='jobapp_employer_status_idx'),
         ]
     
     def __str__(self):
         return f"{self.job_seeker.username} - {self.job_advert.title}"
+    
+    def save(self, *args, **kwargs):
+        if self.employer_id is None and self.job_advert_id is not None:
+            self.employer_id = JobAdvert.objects.filter(pk=self.job_advert_id).values_list(
+                'employer_id', flat=True
+            ).first()
+        # Signal handlers claim the status change and count it; keep them with the write
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+    
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so counters can apply transition deltas
+        if 'status' in field_names:
+            instance._original_status = instance.status
+        return instance
 
 
 class Skill(models.Model):
@@ -146,6 +225,24 @@ class JobAdvertSkill(models.Model):
         return f"{self.job_advert.title} - {self.skill.name}"
 
 
+class UserSkill(models.Model):
+    """A skill on a job seeker's profile, used to recommend adverts."""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='skills')
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE)
+    proficiency_level = models.PositiveSmallIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(5)],
+        default=3
+    )
+    
+    class Meta:
+        verbose_name = _('User Skill')
+        verbose_name_plural = _('User Skills')
+        unique_together = ['user', 'skill']
+    
+    def __str__(self):
+        return f"{self.user.username} - {self.skill.name}"
+
+
 class Category(models.Model):
     name = models.CharField(max_length=100, unique=True)
     description = models.TextField(blank=True, null=True)
@@ -160,6 +257,25 @@ class Category(models.Model):
         return self.name
 
 
+class CategoryClosure(models.Model):
+    """
+    One row per (ancestor, descendant) pair in the category tree, each
+    category being its own ancestor at depth 0. Maintained by signal
+    handlers in ``core.tasks``; see ``core.categories``.
+    """
+    ancestor = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='descendant_links')
+    descendant = models.ForeignKey(Category, on_delete=models.CASCADE, related_name='ancestor_links')
+    depth = models.PositiveSmallIntegerField()
+    
+    class Meta:
+        verbose_name = _('Category Closure')
+        verbose_name_plural = _('Category Closures')
+        unique_together = ['ancestor', 'descendant']
+    
+    def __str__(self):
+        return f"{self.ancestor_id} > {self.descendant_id} ({self.depth})"
+
+
 class JobAdvertCategory(models.Model):
     job_advert = models.ForeignKey(JobAdvert, on_delete=models.CASCADE, related_name='categories')
     category = models.ForeignKey(Category, on_delete=models.CASCADE)
@@ -171,3 +287,75 @@ class JobAdvertCategory(models.Model):
     
     def __str__(self):
         return f"{self.job_advert.title} - {self.category.name}"
+
+
+class JobAdvertFacetCount(models.Model):
+    """
+    Active advert counts per (job_type, experience_level, is_remote) cell,
+    optionally narrowed to one skill (0 means "any").
+    Maintained incrementally by signal handlers in ``core.tasks``.
+    """
+    job_type = models.CharField(max_length=20)
+    experience_level = models.CharField(max_length=20)
+    is_remote = models.BooleanField()
+    skill_id = models.PositiveIntegerField(default=0)
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        verbose_name = _('Job Advert Facet Count')
+        verbose_name_plural = _('Job Advert Facet Counts')
+        unique_together = ['job_type', 'experience_level', 'is_remote', 'skill_id']
+    
+    def __str__(self):
+        return f"{self.job_type}/{self.experience_level}/{self.is_remote} ({self.skill_id}): {self.count}"
+
+
+class StoredFile(models.Model):
+    """
+    One uploaded file, stored once under its SHA-256 digest and shared by
+    every row that references its ``name``. See ``core.files``.
+    """
+    sha256 = models.CharField(max_length=64, unique=True)
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    # Rows (applications, profiles) currently pointing at this file
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Stored File')
+        verbose_name_plural = _('Stored Files')
+    
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
+
+
+class ChunkedUpload(models.Model):
+    """
+    A file being uploaded in chunks to a staging file, handed to the apply or
+    profile endpoints by ``token`` once complete. See ``core.uploads``.
+    """
+    PURPOSE_CHOICES = (
+        ('resume', 'Resume'),
+        ('profile_picture', 'Profile Picture'),
+    )
+    
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='uploads')
+    purpose = models.CharField(max_length=20, choices=PURPOSE_CHOICES)
+    filename = models.CharField(max_length=255)
+    size = models.PositiveBigIntegerField()
+    # Bytes received so far; the next chunk must start here
+    offset = models.PositiveBigIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        verbose_name = _('Chunked Upload')
+        verbose_name_plural = _('Chunked Uploads')
+    
+    def __str__(self):
+        return f"{self.filename} ({self.offset}/{self.size})"
+    
+    @property
+    def is_complete(self):
+        return self.offset == self.size
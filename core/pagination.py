@@ -0,0 +1,253 @@
+"""
+Keyset (cursor) pagination.
+
+Pages are addressed by the ordering values of the last row seen rather than
+by an offset, so every page costs one indexed range scan and no ``COUNT(*)``.
+"""
+
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections import OrderedDict
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError  # type: ignore
+from django.db.models import F, Q  # type: ignore
+from rest_framework.exceptions import NotFound  # type: ignore
+from rest_framework.pagination import BasePagination  # type: ignore
+from rest_framework.response import Response  # type: ignore
+from rest_framework.settings import api_settings  # type: ignore
+from rest_framework.utils.urls import remove_query_param, replace_query_param  # type: ignore
+
+
+class KeysetCursorPagination(BasePagination):
+    """
+    Opaque-cursor pagination keyed on the queryset ordering plus ``id``.
+
+    Works with whatever ordering ``OrderingFilter`` applied, including nullable
+    columns (``NULL`` sorts as the largest value, so one B-tree index serves
+    both directions) and annotations such as search ``relevance``.
+    """
+    cursor_query_param = 'cursor'
+    cursor_query_description = 'The pagination cursor value.'
+    page_size = api_settings.PAGE_SIZE
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        queryset = self.get_page_queryset(queryset, request, view)
+        cursor = self.cursor
+
+        rows = list(queryset)
+        has_more = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        if cursor and cursor['r']:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_page_queryset(self, queryset, request, view=None):
+        """
+        Return the sliced queryset for the requested page, with one extra row
+        to tell whether another page follows.
+        """
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset, view)
+        self.fields = self.get_fields(queryset)
+
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor['r'])
+        queryset = queryset.order_by(*self.order_by(reverse))
+        if self.cursor:
+            queryset = queryset.filter(self.seek(self.cursor['v'], reverse))
+        return queryset[:self.page_size + 1]
+
+    def get_page_size(self, request):
+        if self.page_size_query_param:
+            try:
+                size = int(request.query_params[self.page_size_query_param])
+                if size > 0:
+                    return min(size, self.max_page_size)
+            except (KeyError, ValueError):
+                pass
+        return self.page_size
+
+    def get_ordering(self, queryset, view):
+        """
+        Return ``[(field, descending), ...]`` ending in an ``id`` tiebreaker.
+        """
+        ordering = [
+            term for term in (queryset.query.order_by or queryset.model._meta.ordering or [])
+            if isinstance(term, str)
+        ]
+        if not ordering:
+            ordering = list(getattr(view, 'ordering', None) or ['-id'])
+
+        fields = []
+        for term in ordering:
+            name = term.lstrip('-')
+            if name in ('pk', 'id'):
+                break
+            fields.append((name, term.startswith('-')))
+        fields.append(('id', fields[-1][1] if fields else True))
+        return fields
+
+    def get_fields(self, queryset):
+        fields = {}
+        for name, _ in self.ordering:
+            if name in queryset.query.annotations:
+                fields[name] = queryset.query.annotations[name].output_field
+            else:
+                try:
+                    fields[name] = queryset.model._meta.get_field(name)
+                except FieldDoesNotExist:
+                    pass
+        return fields
+
+    def nullable(self, name):
+        field = self.fields.get(name)
+        return bool(getattr(field, 'null', False))
+
+    def order_by(self, reverse):
+        terms = []
+        for name, descending in self.ordering:
+            # NULL sorts as the largest value, matching PostgreSQL's B-tree order
+            nulls = self.nullable(name)
+            if descending != reverse:
+                terms.append(F(name).desc(nulls_first=nulls or None))
+            else:
+                terms.append(F(name).asc(nulls_last=nulls or None))
+        return terms
+
+    def seek(self, values, reverse):
+        """
+        Build the ``WHERE`` clause selecting rows strictly after ``values``.
+        """
+        branches = []
+        equal = Q()
+        for (name, descending), value in zip(self.ordering, values):
+            upwards = descending == reverse
+            if value is None:
+                if not upwards:
+                    branches.append(equal & Q(**{f'{name}__isnull': False}))
+                equal &= Q(**{f'{name}__isnull': True})
+            else:
+                step = Q(**{f'{name}{"__gt" if upwards else "__lt"}': value})
+                if upwards and self.nullable(name):
+                    step |= Q(**{f'{name}__isnull': True})
+                branches.append(equal & step)
+                equal &= Q(**{name: value})
+
+        condition = branches[0]
+        for branch in branches[1:]:
+            condition |= branch
+
+        # Repeat the leading bound as a plain range so an index scan can start there
+        name, descending = self.ordering[0]
+        if values[0] is not None:
+            upwards = descending == reverse
+            bound = Q(**{f'{name}{"__gte" if upwards else "__lte"}': values[0]})
+            if upwards and self.nullable(name):
+                bound |= Q(**{f'{name}__isnull': True})
+            condition &= bound
+        return condition
+
+    def signature(self):
+        return ','.join(('-' if descending else '') + name for name, descending in self.ordering)
+
+    def row_values(self, row):
+        return [getattr(row, name) for name, _ in self.ordering]
+
+    def encode_cursor(self, row, reverse):
+        values = []
+        for value in self.row_values(row):
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        payload = json.dumps({'o': self.signature(), 'v': values, 'r': int(reverse)}, default=str)
+        token = urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            cursor = json.loads(urlsafe_b64decode(token.encode('ascii')).decode('utf-8'))
+            if cursor['o'] != self.signature() or len(cursor['v']) != len(self.ordering):
+                raise ValueError
+            cursor['v'] = [
+                self.to_python(name, value) for (name, _), value in zip(self.ordering, cursor['v'])
+            ]
+        except (TypeError, ValueError, KeyError, UnicodeError, DjangoValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def to_python(self, name, value):
+        if value is None:
+            return None
+        field = self.fields.get(name)
+        return field.to_python(value) if field is not None else value
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('previous', self.get_previous_link()),
+            ('results', data),
+        ]))
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                    'example': 'http://api.example.org/accounts/?{cursor_query_param}=cD00ODY%3D"'.format(
+                        cursor_query_param=self.cursor_query_param)
+                },
+                'previous': {
+                    'type': 'string',
+                    'nullable': True,
+                    'format': 'uri',
+                    'example': 'http://api.example.org/accounts/?{cursor_query_param}=cj0xJnA9NDg3'.format(
+                        cursor_query_param=self.cursor_query_param)
+                },
+                'results': schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.cursor_query_param,
+                'required': False,
+                'in': 'query',
+                'description': self.cursor_query_description,
+                'schema': {'type': 'string'},
+            },
+            {
+                'name': self.page_size_query_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Number of results to return per page.',
+                'schema': {'type': 'integer'},
+            },
+        ]
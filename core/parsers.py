@@ -0,0 +1,36 @@
+"""
+Request parsers matching the fast renderers in ``core.renderers``.
+"""
+
+import codecs
+
+import msgpack  # type: ignore
+import orjson  # type: ignore
+from django.conf import settings  # type: ignore
+from rest_framework.exceptions import ParseError  # type: ignore
+from rest_framework.parsers import BaseParser, JSONParser  # type: ignore
+
+
+class ORJSONParser(JSONParser):
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get('encoding', settings.DEFAULT_CHARSET)
+        body = stream.read()
+        try:
+            if codecs.lookup(encoding).name != 'utf-8':
+                body = body.decode(encoding)
+            # orjson rejects NaN and Infinity, like JSONParser's strict mode
+            return orjson.loads(body)
+        except (ValueError, LookupError) as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
+
+
+class MessagePackParser(BaseParser):
+    media_type = 'application/msgpack'
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except (ValueError, TypeError) as exc:
+            raise ParseError('MessagePack parse error - %s' % (str(exc) or type(exc).__name__))
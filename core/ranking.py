@@ -0,0 +1,210 @@
+"""
+Applicant ranking against an advert's skill requirements.
+
+An application's ``match_score`` is the share of the advert's
+``importance_level`` weight the applicant covers. A skill on the applicant's
+profile counts ``proficiency_level / 5`` of its weight; a skill only mentioned
+in the cover letter or bio counts ``MENTIONED_LEVEL / 5``.
+
+Scores are computed by a Celery task when an application is submitted and
+again when the advert's skills change, so ranking an advert's applicants is
+a plain ``ORDER BY match_score`` over the ``jobapp_advert_score_idx`` index.
+"""
+
+import logging
+import re
+from functools import lru_cache
+
+from django.core.cache import cache  # type: ignore
+from django.db import transaction  # type: ignore
+
+from .cache import SKILLS_NAMESPACE, get_generation
+
+logger = logging.getLogger(__name__)
+
+MAX_LEVEL = 5
+MENTIONED_LEVEL = 2
+RESCORE_BATCH_SIZE = 500
+# Window in which repeated skill edits on one advert share a single rescore
+RESCORE_DEBOUNCE = 30
+
+
+@lru_cache(maxsize=4)
+def _skill_pattern(version):
+    from .models import Skill
+
+    names = dict(Skill.objects.values_list('name', 'id'))
+    if not names:
+        return None, {}
+    # Longest first so "Machine Learning" wins over "Learning"; short names like
+    # "Go" or "R" only match with their exact capitalization
+    alternatives = []
+    for name in sorted(names, key=len, reverse=True):
+        escaped = re.escape(name)
+        alternatives.append(escaped if len(name) <= 2 else f'(?i:{escaped})')
+    pattern = re.compile(r'(?<![\w+#.])(' + '|'.join(alternatives) + r')(?![\w+#])')
+    return pattern, {name.lower(): skill_id for name, skill_id in names.items()}
+
+
+def skill_matcher():
+    """Return a ``(pattern, ids by lower-case name)`` pair for the current skills."""
+    try:
+        # Bumped on every skill save or delete, renames included
+        version = get_generation(SKILLS_NAMESPACE)
+    except Exception as e:
+        logger.warning('Could not read the skills version: %s', e)
+        return _skill_pattern.__wrapped__(None)
+    return _skill_pattern(version)
+
+
+def extract_skill_ids(matcher, *texts):
+    """Return the ids of skills whose names appear in ``texts``."""
+    pattern, ids = matcher
+    if pattern is None:
+        return set()
+    text = '\n'.join(t for t in texts if t)
+    return {ids[match.lower()] for match in pattern.findall(text)}
+
+
+def applicant_levels(matcher, profile, bio, cover_letter):
+    """Return ``{skill_id: level}`` from a profile plus skills named in free text."""
+    levels = {skill_id: MENTIONED_LEVEL for skill_id in extract_skill_ids(matcher, cover_letter, bio)}
+    levels.update(profile)
+    return levels
+
+
+def profiles(user_ids):
+    """Return ``{user_id: {skill_id: proficiency_level}}``."""
+    from .models import UserSkill
+
+    result = {user_id: {} for user_id in user_ids}
+    for user_id, skill_id, level in UserSkill.objects.filter(user_id__in=user_ids).values_list(
+        'user_id', 'skill_id', 'proficiency_level'
+    ):
+        result[user_id][skill_id] = level
+    return result
+
+
+def match_score(requirements, levels):
+    """
+    Score ``levels`` against ``requirements`` (both ``{skill_id: weight}``)
+    as the covered share of the required weight, between 0 and 1.
+    """
+    total = sum(requirements.values())
+    if not total:
+        return 0.0
+    covered = sum(weight * min(levels.get(skill_id, 0), MAX_LEVEL) / MAX_LEVEL
+                  for skill_id, weight in requirements.items())
+    return round(covered / total, 4)
+
+
+def requirements(advert_ids):
+    """Return ``{advert_id: {skill_id: importance_level}}``."""
+    from .models import JobAdvertSkill
+
+    result = {advert_id: {} for advert_id in advert_ids}
+    for advert_id, skill_id, level in JobAdvertSkill.objects.filter(job_advert_id__in=advert_ids).values_list(
+        'job_advert_id', 'skill_id', 'importance_level'
+    ):
+        result[advert_id][skill_id] = level
+    return result
+
+
+APPLICATION_FIELDS = ('id', 'job_advert_id', 'job_seeker_id', 'job_seeker__bio', 'cover_letter', 'match_score')
+
+
+def score_applications(applications):
+    """
+    Score ``applications`` (dicts of ``APPLICATION_FIELDS``) and store the
+    scores that changed. Return ``{application_id: score}``.
+    """
+    from .models import JobApplication
+
+    matcher = skill_matcher()
+    adverts = requirements({application['job_advert_id'] for application in applications})
+    seekers = profiles({application['job_seeker_id'] for application in applications} - {None})
+    scores, changed = {}, []
+    for application in applications:
+        profile = seekers.get(application['job_seeker_id'], {})
+        levels = applicant_levels(matcher, profile, application['job_seeker__bio'], application['cover_letter'])
+        score = scores[application['id']] = match_score(adverts[application['job_advert_id']], levels)
+        if score != application['match_score']:
+            changed.append(JobApplication(pk=application['id'], match_score=score))
+    # bulk_update leaves updated_at and the status signal handlers alone
+    JobApplication.objects.bulk_update(changed, ['match_score'])
+    return scores
+
+
+def score_all(queryset, batch_size=RESCORE_BATCH_SIZE):
+    """Score every application in ``queryset`` in id order; return how many."""
+    applications = queryset.order_by('id').values(*APPLICATION_FIELDS)
+    scored, last_id = 0, 0
+    while True:
+        batch = list(applications.filter(id__gt=last_id)[:batch_size])
+        if not batch:
+            return scored
+        score_applications(batch)
+        scored += len(batch)
+        last_id = batch[-1]['id']
+
+
+def score_application(application_id):
+    """Compute and store one application's match score."""
+    from .models import JobApplication
+
+    application = JobApplication.objects.filter(pk=application_id).values(*APPLICATION_FIELDS).first()
+    if application is None:
+        return None
+    return score_applications([application])[application_id]
+
+
+def _rescore_key(advert_id):
+    return f'ranking:rescore:{advert_id}'
+
+
+def score_advert_applications(advert_id, batch_size=RESCORE_BATCH_SIZE):
+    """
+    Recompute the match score of every application to ``advert_id`` and
+    return how many were scored.
+    """
+    from .models import JobApplication
+
+    try:
+        # Skill edits from here on need another pass
+        cache.delete(_rescore_key(advert_id))
+    except Exception:
+        pass
+    return score_all(JobApplication.objects.filter(job_advert_id=advert_id), batch_size)
+
+
+def schedule_application_score(application_id):
+    """Score an application in the background once the transaction commits."""
+    from .tasks import score_application_task
+
+    transaction.on_commit(lambda: _enqueue(score_application_task, score_application, application_id))
+
+
+def schedule_advert_rescore(advert_id):
+    """Rescore an advert's applicants once, however many skills change at a time."""
+    # Debounce at commit, so a rolled back change doesn't hold off the next one
+    transaction.on_commit(lambda: _debounced_rescore(advert_id))
+
+
+def _debounced_rescore(advert_id):
+    from .tasks import score_advert_applications_task
+
+    try:
+        if not cache.add(_rescore_key(advert_id), 1, timeout=RESCORE_DEBOUNCE):
+            return
+    except Exception as e:
+        logger.warning('Could not debounce applicant rescoring: %s', e)
+    _enqueue(score_advert_applications_task, score_advert_applications, advert_id)
+
+
+def _enqueue(task, fallback, object_id):
+    try:
+        task.delay(object_id)
+    except Exception as e:
+        # Without a broker, score inline rather than leave stale scores behind
+        logger.warning('Could not queue %s: %s', task.name, e)
+        fallback(object_id)
@@ -0,0 +1,240 @@
+"""
+Skill-based job recommendations.
+
+Active adverts form a sparse advert x skill matrix holding each advert's
+``importance_level`` weights, L2-normalized per advert. The matrix is stored
+column-wise (one array of row numbers and weights per skill), so scoring a
+seeker only gathers the columns of their own skills, sums them into per-advert
+dot products with ``bincount`` and picks the top k with ``argpartition``.
+
+Each process keeps its own copy. Writes append the changed advert ids to a
+change log in the cache; before scoring, a process re-reads just those
+adverts and patches its matrix. Replaced rows are masked out, and the matrix
+is rebuilt from the database once too many of them pile up.
+
+A writer numbers its entries before storing them, so a reader can find a
+number published but its entry not there yet. It applies the entries before
+the gap and waits for the rest; only a gap older than ``CHANGE_WRITE_GRACE``
+(an expired entry, or a writer that died) makes it rebuild.
+"""
+
+import logging
+import threading
+import time
+from array import array
+from math import sqrt
+
+import numpy as np  # type: ignore
+from django.core.cache import cache  # type: ignore
+from django.db import transaction  # type: ignore
+
+from .cache import bump_generation, get_generation
+
+logger = logging.getLogger(__name__)
+
+RECOMMENDATIONS_NAMESPACE = 'recommendations'
+
+# How long queued changes stay readable; slower processes rebuild instead
+CHANGE_TIMEOUT = 60 * 60
+# Seconds a numbered change may take to appear before it counts as lost
+CHANGE_WRITE_GRACE = 5
+# Beyond this many queued changes a rebuild is cheaper than patching
+MAX_PENDING_CHANGES = 5000
+# Rebuild once this share of rows has been replaced
+COMPACT_RATIO = 0.25
+
+_EMPTY_COLUMN = (np.zeros(0, dtype=np.int32), np.zeros(0, dtype=np.float32))
+
+
+def _sequence_key():
+    return f'{RECOMMENDATIONS_NAMESPACE}:sequence'
+
+
+def _change_key(sequence):
+    return f'{RECOMMENDATIONS_NAMESPACE}:change:{sequence}'
+
+
+def mark_adverts_changed(advert_ids):
+    """Queue ``advert_ids`` for re-scoring in every process once committed."""
+    advert_ids = list(advert_ids)
+    if advert_ids:
+        transaction.on_commit(lambda: _publish_changes(advert_ids))
+
+
+def _publish_changes(advert_ids):
+    try:
+        cache.add(_sequence_key(), 0, timeout=None)
+        last = cache.incr(_sequence_key(), len(advert_ids))
+        first = last - len(advert_ids) + 1
+        cache.set_many(
+            {_change_key(first + i): advert_id for i, advert_id in enumerate(advert_ids)},
+            timeout=CHANGE_TIMEOUT,
+        )
+    except Exception as e:
+        logger.warning('Could not queue recommendation changes: %s', e)
+        rebuild_skill_matrix()
+
+
+def rebuild_skill_matrix():
+    """Make every process rebuild its matrix, e.g. after a bulk load."""
+    bump_generation(RECOMMENDATIONS_NAMESPACE)
+
+
+def load_vectors(advert_ids=None):
+    """
+    Return ``(advert_ids, rows, skill_ids, weights)`` arrays for active
+    adverts (or just ``advert_ids``), with weights normalized per advert.
+    """
+    from .models import JobAdvertSkill
+
+    entries = JobAdvertSkill.objects.filter(job_advert__is_active=True)
+    if advert_ids is not None:
+        entries = entries.filter(job_advert_id__in=advert_ids)
+    adverts, skills, levels = array('q'), array('q'), array('f')
+    for advert_id, skill_id, level in entries.order_by().values_list(
+        'job_advert_id', 'skill_id', 'importance_level'
+    ).iterator(chunk_size=10000):
+        adverts.append(advert_id)
+        skills.append(skill_id)
+        levels.append(level)
+
+    adverts = np.frombuffer(adverts, dtype=np.int64)
+    ids, rows = np.unique(adverts, return_inverse=True)
+    weights = np.frombuffer(levels, dtype=np.float32).copy()
+    norms = np.sqrt(np.bincount(rows, weights=weights ** 2, minlength=len(ids)))
+    weights /= norms[rows].astype(np.float32)
+    return ids, rows.astype(np.int32), np.frombuffer(skills, dtype=np.int64), weights
+
+
+class SkillMatrix:
+    """Column-wise sparse advert x skill matrix for one process."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.generation = None
+        self.sequence = 0
+        self.advert_ids = np.zeros(0, dtype=np.int64)
+        self.live = np.zeros(0, dtype=bool)
+        self.rows = {}
+        self.columns = {}
+        self.replaced = 0
+        # (change number, when it was first found missing)
+        self.gap = None
+
+    def load(self):
+        self.gap = None
+        self.advert_ids = np.zeros(0, dtype=np.int64)
+        self.live = np.zeros(0, dtype=bool)
+        self.rows = {}
+        self.columns = {}
+        self.replaced = 0
+        self.append(*load_vectors())
+
+    def append(self, advert_ids, rows, skill_ids, weights):
+        offset = len(self.advert_ids)
+        self.advert_ids = np.concatenate([self.advert_ids, advert_ids])
+        self.live = np.concatenate([self.live, np.ones(len(advert_ids), dtype=bool)])
+        self.rows.update((int(advert_id), offset + i) for i, advert_id in enumerate(advert_ids))
+
+        order = np.argsort(skill_ids, kind='stable')
+        skill_ids, rows, weights = skill_ids[order], rows[order] + offset, weights[order]
+        skills, starts = np.unique(skill_ids, return_index=True)
+        for skill_id, start, end in zip(skills, starts, list(starts[1:]) + [len(skill_ids)]):
+            column_rows, column_weights = self.columns.get(int(skill_id), _EMPTY_COLUMN)
+            self.columns[int(skill_id)] = (
+                np.concatenate([column_rows, rows[start:end]]),
+                np.concatenate([column_weights, weights[start:end]]),
+            )
+
+    def update(self, advert_ids):
+        """Re-read ``advert_ids`` from the database, replacing their rows."""
+        for advert_id in advert_ids:
+            row = self.rows.pop(advert_id, None)
+            if row is not None:
+                self.live[row] = False
+                self.replaced += 1
+        self.append(*load_vectors(advert_ids))
+        if self.replaced > 1000 and self.replaced > len(self.advert_ids) * COMPACT_RATIO:
+            self.load()
+
+    def sync(self):
+        """Bring the matrix up to date with the change log."""
+        try:
+            generation = get_generation(RECOMMENDATIONS_NAMESPACE)
+            sequence = cache.get(_sequence_key(), 0)
+        except Exception as e:
+            logger.warning('Recommendation change log unavailable: %s', e)
+            if self.generation is None:
+                self.load()
+                self.generation = 0
+            return
+
+        pending = sequence - self.sequence
+        if generation != self.generation or pending < 0 or pending > MAX_PENDING_CHANGES:
+            self.load()
+        elif pending:
+            keys = [_change_key(number) for number in range(self.sequence + 1, sequence + 1)]
+            changes = cache.get_many(keys)
+            written = 0
+            while written < len(keys) and keys[written] in changes:
+                written += 1
+            if written == len(keys):
+                self.update(set(changes.values()))
+                self.gap = None
+            elif self.awaiting(self.sequence + written + 1):
+                # Apply what's there and pick up from the entry still being written
+                if written:
+                    self.update({changes[key] for key in keys[:written]})
+                sequence = self.sequence + written
+            else:
+                # Part of the log expired; start over
+                self.load()
+        self.generation, self.sequence = generation, sequence
+
+    def awaiting(self, number):
+        """Whether change ``number`` has been missing for less than ``CHANGE_WRITE_GRACE`` seconds."""
+        now = time.monotonic()
+        if self.gap is None or self.gap[0] != number:
+            self.gap = (number, now)
+        return now - self.gap[1] < CHANGE_WRITE_GRACE
+
+    def recommend(self, profile, limit, exclude=()):
+        """
+        Return up to ``limit`` ``(advert_id, score)`` pairs for a seeker with
+        ``profile`` (``{skill_id: proficiency_level}``), best match first.
+        Scores are cosine similarities between 0 and 1.
+        """
+        with self.lock:
+            self.sync()
+            columns = [(self.columns[skill_id], level) for skill_id, level in profile.items()
+                       if skill_id in self.columns]
+            if not columns or not limit:
+                return []
+            rows = np.concatenate([column[0] for column, _ in columns])
+            weights = np.concatenate([column[1] * level for column, level in columns])
+            scores = np.bincount(rows, weights=weights, minlength=len(self.advert_ids))
+            scores /= sqrt(sum(level * level for level in profile.values()))
+            scores[~self.live] = 0
+            for advert_id in exclude:
+                row = self.rows.get(advert_id)
+                if row is not None:
+                    scores[row] = 0
+
+            candidates = np.flatnonzero(scores > 0)
+            if len(candidates) > limit:
+                candidates = candidates[np.argpartition(-scores[candidates], limit - 1)[:limit]]
+            # Best score first, newest advert first among equals
+            candidates = candidates[np.lexsort((-self.advert_ids[candidates], -scores[candidates]))]
+            return [(int(self.advert_ids[row]), round(float(scores[row]), 4)) for row in candidates]
+
+
+skill_matrix = SkillMatrix()
+
+
+def recommend_adverts(user, limit=20):
+    """Return ``(advert_id, score)`` pairs for ``user``, skipping adverts they applied to."""
+    profile = dict(user.skills.values_list('skill_id', 'proficiency_level'))
+    if not profile:
+        return []
+    applied = user.job_applications.values_list('job_advert_id', flat=True)
+    return skill_matrix.recommend(profile, limit, exclude=set(applied))
@@ -0,0 +1,70 @@
+"""
+Fast response renderers.
+
+``ORJSONRenderer`` replaces DRF's ``JSONRenderer``: orjson encodes
+datetimes, UUIDs and dict/list/str subclasses natively in C and hands
+anything else (Decimal, lazy translations, querysets) to DRF's own encoder,
+so the output matches the stock renderer. ``MessagePackRenderer`` serves the
+same data as MessagePack to clients sending ``Accept: application/msgpack``.
+"""
+
+import msgpack  # type: ignore
+import orjson  # type: ignore
+from rest_framework.renderers import BaseRenderer, JSONRenderer  # type: ignore
+from rest_framework.utils.encoders import JSONEncoder  # type: ignore
+
+_fallback = JSONEncoder().default
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_UTC_Z
+
+
+class ORJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        options = ORJSON_OPTIONS
+        # orjson only indents by two spaces; any requested indent gets that
+        if self.get_indent(accepted_media_type or '', renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_fallback, option=options)
+
+
+class MessagePackRenderer(BaseRenderer):
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return msgpack.packb(data, default=_fallback, use_bin_type=True)
+
+
+class StreamRenderer(BaseRenderer):
+    """
+    Content negotiation only, for views that stream their own body (see
+    ``core.exports``).
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
+
+
+class CSVStreamRenderer(StreamRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONStreamRenderer(StreamRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class FileRenderer(StreamRenderer):
+    """Accepts any media type, for views answering with a stored file (see ``core.downloads``)."""
+    media_type = '*/*'
+    format = 'file'
+    charset = None
@@ -0,0 +1,164 @@
+"""
+Revocation of JWTs by ``jti``.
+
+Revoked ids live in Redis as ``jwt:revoked:<jti>`` keys that expire with the
+token, plus a ``jwt:revoked:index`` sorted set scored by expiry. Every
+process keeps a Bloom filter of the index, reloaded every
+``JWT_REVOCATION_REFRESH_INTERVAL`` seconds, so checking an access token on a
+request is a few in-memory bit tests; only ids the filter might contain
+(revoked tokens and the odd false positive) are confirmed in Redis.
+
+A token revoked in one process reaches the other processes' filters at their
+next reload, so an access token can outlive its revocation elsewhere by up to
+that interval. Refresh tokens, checked far less often, always go to Redis.
+Refresh token rotation revokes the token it replaces.
+"""
+
+import hashlib
+import logging
+import math
+import threading
+import time
+
+from django.conf import settings  # type: ignore
+from django.utils.translation import gettext_lazy as _  # type: ignore
+from rest_framework_simplejwt.exceptions import TokenError  # type: ignore
+from rest_framework_simplejwt.settings import api_settings  # type: ignore
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken  # type: ignore
+
+from .counters import get_redis
+
+logger = logging.getLogger(__name__)
+
+REVOKED_KEY_PREFIX = 'jwt:revoked'
+REVOKED_INDEX_KEY = 'jwt:revoked:index'
+BLOOM_ERROR_RATE = 0.01
+
+
+class BloomFilter:
+    """Set membership with no false negatives and ``error_rate`` false positives at ``capacity`` items."""
+
+    def __init__(self, capacity, error_rate=BLOOM_ERROR_RATE):
+        self.size = max(64, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, item):
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        # Double hashing: k positions from two 64-bit halves
+        first, second = int.from_bytes(digest[:8], 'little'), int.from_bytes(digest[8:], 'little') | 1
+        return [(first + i * second) % self.size for i in range(self.hashes)]
+
+    def add(self, item):
+        for position in self._positions(item):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+
+class LocalRevocations:
+    """This process's Bloom filter of revoked ids, reloaded from Redis when stale."""
+
+    def __init__(self):
+        self.filter = None
+        self.loaded_at = 0.0
+        self.lock = threading.Lock()
+
+    def stale(self):
+        return self.filter is None or time.monotonic() - self.loaded_at > settings.JWT_REVOCATION_REFRESH_INTERVAL
+
+    def current(self):
+        # One thread reloads; the others keep using the previous filter
+        if self.stale() and self.lock.acquire(blocking=self.filter is None):
+            try:
+                if self.stale():
+                    self.reload()
+            finally:
+                self.lock.release()
+        return self.filter
+
+    def reload(self):
+        try:
+            client = get_redis()
+            now = time.time()
+            client.zremrangebyscore(REVOKED_INDEX_KEY, '-inf', now)
+            jtis = client.zrangebyscore(REVOKED_INDEX_KEY, now, '+inf')
+        except Exception as e:
+            logger.warning('Could not load revoked tokens: %s', e)
+            if self.filter is None:
+                self.filter = BloomFilter(settings.JWT_REVOCATION_BLOOM_CAPACITY)
+            # Retry at the next interval rather than on every request
+            self.loaded_at = time.monotonic()
+            return
+        bloom = BloomFilter(max(settings.JWT_REVOCATION_BLOOM_CAPACITY, 2 * len(jtis)))
+        for jti in jtis:
+            bloom.add(jti.decode() if isinstance(jti, bytes) else jti)
+        self.filter, self.loaded_at = bloom, time.monotonic()
+
+    def add(self, jti):
+        if self.filter is not None:
+            self.filter.add(jti)
+
+
+local_revocations = LocalRevocations()
+
+
+def _key(jti):
+    return f'{REVOKED_KEY_PREFIX}:{jti}'
+
+
+def revoke(jti, exp):
+    """Revoke the token ``jti`` until its expiry time ``exp`` (a timestamp)."""
+    ttl = math.ceil(exp - time.time())
+    if ttl <= 0:
+        return
+    pipe = get_redis().pipeline()
+    pipe.set(_key(jti), 1, ex=ttl)
+    pipe.zadd(REVOKED_INDEX_KEY, {jti: exp})
+    pipe.execute()
+    local_revocations.add(jti)
+
+
+def is_revoked(jti, authoritative=False):
+    """
+    Whether ``jti`` is revoked. Unless ``authoritative``, ids missing from
+    the local Bloom filter are taken as valid without asking Redis.
+    """
+    if not authoritative and jti not in local_revocations.current():
+        return False
+    try:
+        return bool(get_redis().exists(_key(jti)))
+    except Exception as e:
+        logger.warning('Could not check token revocation: %s', e)
+        return False
+
+
+class RevocableTokenMixin:
+    # Ask Redis on every check rather than trusting the local filter
+    authoritative = False
+
+    def verify(self):
+        super().verify()
+        if is_revoked(self.payload[api_settings.JTI_CLAIM], self.authoritative):
+            raise TokenError(_("Token is revoked"))
+
+    def revoke(self):
+        revoke(self.payload[api_settings.JTI_CLAIM], self.payload['exp'])
+
+    def blacklist(self):
+        # simplejwt calls this on the refresh token that rotation replaces
+        try:
+            self.revoke()
+        except Exception as e:
+            logger.warning('Could not revoke rotated token: %s', e)
+
+
+class RevocableAccessToken(RevocableTokenMixin, AccessToken):
+    pass
+
+
+class RevocableRefreshToken(RevocableTokenMixin, RefreshToken):
+    authoritative = True
+    access_token_class = RevocableAccessToken
@@ -0,0 +1,151 @@
+"""
+Database-native full-text search for job adverts.
+
+PostgreSQL keeps a weighted ``tsvector`` column on ``core_jobadvert`` (title A,
+requirements B, description C, location D) maintained by a trigger and served
+by a GIN index. SQLite keeps an external-content FTS5 table,
+``core_jobadvert_fts``, maintained by triggers. Both are created in migration
+0002; the column is deliberately not a model field so list queries never load it.
+"""
+
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorField  # type: ignore
+from django.db import connections  # type: ignore
+from django.db.models import FloatField, Q  # type: ignore
+from django.db.models.expressions import RawSQL  # type: ignore
+from rest_framework import filters  # type: ignore
+from rest_framework.settings import api_settings  # type: ignore
+
+FTS_TABLE = 'core_jobadvert_fts'
+
+# SQLite bm25() column weights, in FTS5 column order
+# (title, requirements, description, location)
+FTS_WEIGHTS = (10.0, 4.0, 2.0, 1.0)
+
+TOKEN_RE = re.compile(r'"([^"]*)"|(\S+)')
+WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+
+def parse_search_terms(raw):
+    """
+    Split a search string into ``(words, is_prefix)`` groups.
+
+    ``"senior python"`` is a phrase, ``djan*`` a prefix match and every other
+    bare word a plain term. All groups must match.
+    """
+    groups = []
+    for phrase, word in TOKEN_RE.findall(raw or ''):
+        if phrase:
+            words = WORD_RE.findall(phrase)
+            if words:
+                groups.append((words, False))
+        else:
+            words = WORD_RE.findall(word)
+            if words:
+                groups.append((words, word.endswith('*') and len(words) == 1))
+    return groups
+
+
+def to_tsquery(groups):
+    """Render parsed groups as a raw PostgreSQL ``tsquery`` string."""
+    parts = []
+    for words, is_prefix in groups:
+        if is_prefix:
+            parts.append(f'{words[0]}:*')
+        elif len(words) == 1:
+            parts.append(words[0])
+        else:
+            parts.append('(' + ' <-> '.join(words) + ')')
+    return ' & '.join(parts)
+
+
+def to_fts5_query(groups):
+    """Render parsed groups as an SQLite FTS5 ``MATCH`` expression."""
+    parts = []
+    for words, is_prefix in groups:
+        phrase = '"' + ' '.join(words) + '"'
+        parts.append(phrase + '*' if is_prefix else phrase)
+    return ' AND '.join(parts)
+
+
+def search_adverts(queryset, raw):
+    """
+    Restrict ``queryset`` to adverts matching ``raw`` and annotate ``relevance``
+    (higher is better).
+    """
+    groups = parse_search_terms(raw)
+    if not groups:
+        return queryset
+
+    vendor = connections[queryset.db].vendor
+    if vendor == 'postgresql':
+        query = SearchQuery(to_tsquery(groups), config='english', search_type='raw')
+        vector = RawSQL('"core_jobadvert"."search_vector"', [], output_field=SearchVectorField())
+        return queryset.alias(search_vector=vector).filter(search_vector=query).annotate(
+            relevance=SearchRank(vector, query)
+        )
+
+    if vendor == 'sqlite':
+        match = to_fts5_query(groups)
+        weights = ', '.join(str(weight) for weight in FTS_WEIGHTS)
+        # bm25() is negative, more negative meaning more relevant
+        rank = RawSQL(
+            f'SELECT -bm25({FTS_TABLE}, {weights}) FROM {FTS_TABLE} '
+            f'WHERE {FTS_TABLE} MATCH %s AND rowid = "core_jobadvert"."id"',
+            [match], output_field=FloatField()
+        )
+        matches = RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [match])
+        return queryset.filter(id__in=matches).annotate(relevance=rank)
+
+    # Other backends fall back to substring matching without ranking
+    for words, _ in groups:
+        term = ' '.join(words)
+        condition = Q(title__icontains=term) | Q(requirements__icontains=term)
+        condition |= Q(description__icontains=term) | Q(location__icontains=term)
+        queryset = queryset.filter(condition)
+    return queryset
+
+
+class JobAdvertSearchFilter(filters.BaseFilterBackend):
+    """
+    Full-text replacement for ``SearchFilter`` on job adverts.
+    """
+    search_param = api_settings.SEARCH_PARAM
+
+    def filter_queryset(self, request, queryset, view):
+        raw = request.query_params.get(self.search_param, '')
+        return search_adverts(queryset, raw.replace('\x00', ''))
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                'name': self.search_param,
+                'required': False,
+                'in': 'query',
+                'description': 'Full-text search. Use "quotes" for phrases and a trailing * for prefixes.',
+                'schema': {'type': 'string'},
+            },
+        ]
+
+
+class SearchOrderingFilter(filters.OrderingFilter):
+    """
+    ``OrderingFilter`` that understands ``ordering=relevance``.
+
+    Relevance sorts best matches first and is ignored when the request has no
+    search term.
+    """
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        ranked = 'relevance' in queryset.query.annotations
+        result = []
+        for field in ordering:
+            if field.lstrip('-') != 'relevance':
+                result.append(field)
+            elif ranked:
+                result.append('relevance' if field.startswith('-') else '-relevance')
+        return result or getattr(view, 'ordering', None)
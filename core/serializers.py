@@ -1,7 +1,27 @@
+from urllib.parse import urlencode
+
+from drf_spectacular.utils import extend_schema_field  # type: ignore
 from rest_framework import serializers  # type: ignore
+from rest_framework.reverse import reverse  # type: ignore
+from rest_framework_simplejwt.exceptions import TokenError  # type: ignore
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer  # type: ignore
+from rest_framework_simplejwt.settings import api_settings  # type: ignore
+from django.conf import settings  # type: ignore
 from django.contrib.auth import authenticate  # type: ignore
+from django.core.validators import FileExtensionValidator  # type: ignore
+from django.db import transaction  # type: ignore
 from django.utils.translation import gettext_lazy as _  # type: ignore
-from .models import User, JobAdvert, JobApplication, Skill, Category, JobAdvertSkill, JobAdvertCategory  # type: ignore
+from .models import (  # type: ignore
+    User, JobAdvert, JobApplication, Skill, Category, JobAdvertSkill, JobAdvertCategory, UserSkill, ChunkedUpload
+)
+from .cache import bump_generation  # type: ignore
+from .facets import add_advert_tags  # type: ignore
+from .fieldsets import SparseFieldsMixin  # type: ignore
+from .files import release, share, store  # type: ignore
+from .ranking import schedule_advert_rescore  # type: ignore
+from .recommendations import mark_adverts_changed  # type: ignore
+from .revocation import RevocableRefreshToken  # type: ignore
+from .uploads import allowed_extensions, create_staging_file, extension, save_upload, store_upload  # type: ignore
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -49,27 +69,199 @@ class UserLoginSerializer(serializers.Serializer):
         return data
 
 
-class UserSerializer(serializers.ModelSerializer):
+class RevocableTokenRefreshSerializer(TokenRefreshSerializer):
+    """Rotates refresh tokens, revoking the one handed in (see ``core.revocation``)."""
+    token_class = RevocableRefreshToken
+
+
+class LogoutSerializer(serializers.Serializer):
+    refresh = serializers.CharField(write_only=True)
+
+    def validate_refresh(self, value):
+        try:
+            token = RevocableRefreshToken(value)
+        except TokenError as e:
+            raise serializers.ValidationError(str(e))
+        if str(token.get(api_settings.USER_ID_CLAIM)) != str(self.context['request'].user.pk):
+            raise serializers.ValidationError(_("Token belongs to another user."))
+        return token
+
+
+def validate_upload_size(file):
+    if file.size > settings.MAX_UPLOAD_SIZE:
+        raise serializers.ValidationError(
+            _("Files can be at most %(size)d bytes.") % {'size': settings.MAX_UPLOAD_SIZE}
+        )
+
+
+class DownloadURLMixin:
+    """
+    Represent a stored file by the URL of the permission-checked download
+    view ``url_name`` (see ``core.downloads``) rather than its media URL.
+    """
+
+    def __init__(self, url_name, **kwargs):
+        self.url_name = url_name
+        super().__init__(**kwargs)
+
+    def to_representation(self, value):
+        if not value:
+            return None
+        return reverse(self.url_name, kwargs={'pk': value.instance.pk}, request=self.context.get('request'))
+
+
+class DownloadFileField(DownloadURLMixin, serializers.FileField):
+    pass
+
+
+class DownloadImageField(DownloadURLMixin, serializers.ImageField):
+    pass
+
+
+def resume_field(url_name, **kwargs):
+    return DownloadFileField(url_name, validators=[
+        FileExtensionValidator(allowed_extensions=settings.ALLOWED_FILE_EXTENSIONS, message="Invalid file type"),
+        validate_upload_size,
+    ], **kwargs)
+
+
+class UploadTokenField(serializers.UUIDField):
+    """
+    Token of the user's completed chunked upload for ``purpose``; validates
+    to the ``ChunkedUpload`` itself.
+    """
+
+    def __init__(self, purpose, **kwargs):
+        self.purpose = purpose
+        kwargs.setdefault('required', False)
+        super().__init__(write_only=True, **kwargs)
+
+    def to_internal_value(self, data):
+        token = super().to_internal_value(data)
+        upload = ChunkedUpload.objects.filter(
+            token=token, user=self.context['request'].user, purpose=self.purpose
+        ).first()
+        if upload is None:
+            raise serializers.ValidationError(_("Unknown upload."))
+        if not upload.is_complete:
+            raise serializers.ValidationError(_("The upload is not complete."))
+        return upload
+
+
+@extend_schema_field({
+    'type': 'object',
+    'additionalProperties': {'type': 'object', 'additionalProperties': {'type': 'string', 'format': 'uri'}},
+})
+class RenditionURLsField(serializers.ReadOnlyField):
+    """
+    ``{size: {format: url}}`` for the renditions in ``profile_picture_renditions``,
+    served by the ``user-profile-picture`` download.
+    """
+
+    def get_attribute(self, instance):
+        # URLs are per user, not per stored name
+        return instance.pk, super().get_attribute(instance)
+
+    def to_representation(self, value):
+        pk, renditions = value
+        url = reverse('user-profile-picture', kwargs={'pk': pk}, request=self.context.get('request'))
+        return {
+            size: {extension: f'{url}?{urlencode({"size": size, "image_format": extension})}' for extension in formats}
+            for size, formats in renditions.items()
+        }
+
+
+class StoredResumeMixin:
+    """
+    Keep ``resume`` files, uploaded directly or through ``resume_upload``,
+    in content-addressed storage (see ``core.files``), releasing the file
+    they replace.
+    """
+
+    def validate(self, data):
+        if data.get('resume') and data.get('resume_upload'):
+            raise serializers.ValidationError(_("Send resume or resume_upload, not both."))
+        return super().validate(data)
+
+    def update(self, instance, validated_data):
+        staged = validated_data.pop('resume_upload', None)
+        if 'resume' not in validated_data and staged is None:
+            return super().update(instance, validated_data)
+        upload = validated_data.pop('resume', None)
+        replaced = instance.resume.name
+        with transaction.atomic():
+            if staged is not None:
+                instance.resume = store_upload(staged)
+            else:
+                instance.resume = store(upload) if upload else None
+            instance = super().update(instance, validated_data)
+            release(replaced)
+        return instance
+
+
+class UserSerializer(StoredResumeMixin, SparseFieldsMixin, serializers.ModelSerializer):
+    resume = resume_field('user-resume', required=False, allow_null=True)
+    profile_picture = DownloadImageField('user-profile-picture', required=False, allow_null=True)
+    resume_upload = UploadTokenField('resume')
+    profile_picture_upload = UploadTokenField('profile_picture')
+    profile_picture_renditions = RenditionURLsField()
+
     class Meta:
         model = User
         fields = ('id', 'username', 'email', 'user_type', 'company_name', 
-                 'phone_number', 'bio', 'website', 'location', 'date_joined')
+                 'phone_number', 'bio', 'website', 'location', 'profile_picture',
+                 'profile_picture_renditions', 'resume',
+                 'resume_upload', 'profile_picture_upload', 'date_joined')
         read_only_fields = ('id', 'date_joined')
 
+    def validate(self, data):
+        if data.get('profile_picture') and data.get('profile_picture_upload'):
+            raise serializers.ValidationError(_("Send profile_picture or profile_picture_upload, not both."))
+        return super().validate(data)
+
+    def update(self, instance, validated_data):
+        staged = validated_data.pop('profile_picture_upload', None)
+        if staged is not None:
+            save_upload(staged, instance.profile_picture)
+        return super().update(instance, validated_data)
 
-class SkillSerializer(serializers.ModelSerializer):
+
+class SkillSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Skill
         fields = '__all__'
 
 
-class CategorySerializer(serializers.ModelSerializer):
+class UserSkillSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    skill_id = serializers.PrimaryKeyRelatedField(queryset=Skill.objects.all(), source='skill')
+    name = serializers.CharField(source='skill.name', read_only=True)
+
+    class Meta:
+        model = UserSkill
+        fields = ('skill_id', 'name', 'proficiency_level')
+
+
+class CategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = '__all__'
 
 
-class JobAdvertSkillSerializer(serializers.ModelSerializer):
+class CategoryTreeSerializer(serializers.ModelSerializer):
+    """A category with its subcategories nested under ``children``."""
+    advert_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Category
+        fields = ('id', 'name', 'description', 'parent', 'advert_count', 'children')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        fields['children'] = CategoryTreeSerializer(source='tree_children', many=True, read_only=True)
+        return fields
+
+
+class JobAdvertSkillSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     skill = SkillSerializer(read_only=True)
     skill_id = serializers.PrimaryKeyRelatedField(
         queryset=Skill.objects.all(), source='skill', write_only=True
@@ -80,7 +272,7 @@ class JobAdvertSkillSerializer(serializers.ModelSerializer):
         fields = ('id', 'skill', 'skill_id', 'importance_level')
 
 
-class JobAdvertCategorySerializer(serializers.ModelSerializer):
+class JobAdvertCategorySerializer(SparseFieldsMixin, serializers.ModelSerializer):
     category = CategorySerializer(read_only=True)
     category_id = serializers.PrimaryKeyRelatedField(
         queryset=Category.objects.all(), source='category', write_only=True
@@ -91,7 +283,7 @@ class JobAdvertCategorySerializer(serializers.ModelSerializer):
         fields = ('id', 'category', 'category_id')
 
 
-class JobAdvertSerializer(serializers.ModelSerializer):
+class JobAdvertSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     employer = UserSerializer(read_only=True)
     skills = JobAdvertSkillSerializer(many=True, read_only=True)
     categories = JobAdvertCategorySerializer(many=True, read_only=True)
@@ -109,6 +301,55 @@ class JobAdvertSerializer(serializers.ModelSerializer):
                            'views_count', 'applications_count')
 
 
+class EmployerSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('id', 'username', 'company_name')
+
+
+class JobAdvertSkillSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    name = serializers.CharField(source='skill.name', read_only=True)
+
+    class Meta:
+        model = JobAdvertSkill
+        fields = ('skill_id', 'name', 'importance_level')
+
+
+class JobAdvertCategorySummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    name = serializers.CharField(source='category.name', read_only=True)
+
+    class Meta:
+        model = JobAdvertCategory
+        fields = ('category_id', 'name')
+
+
+class JobAdvertListSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Lean representation used by the advert list endpoint. Leaves out the
+    description and requirements text; fetch the detail endpoint for those.
+    """
+    employer = EmployerSummarySerializer(read_only=True)
+    skills = JobAdvertSkillSummarySerializer(many=True, read_only=True)
+    categories = JobAdvertCategorySummarySerializer(many=True, read_only=True)
+
+    class Meta:
+        model = JobAdvert
+        fields = ('id', 'employer', 'title', 'location', 'job_type',
+                 'experience_level', 'salary_min', 'salary_max',
+                 'salary_currency', 'is_remote', 'application_deadline',
+                 'views_count', 'applications_count', 'skills', 'categories',
+                 'created_at')
+        read_only_fields = fields
+
+
+class RecommendedJobAdvertSerializer(JobAdvertListSerializer):
+    match_score = serializers.FloatField(read_only=True)
+
+    class Meta(JobAdvertListSerializer.Meta):
+        fields = JobAdvertListSerializer.Meta.fields + ('match_score',)
+        read_only_fields = fields
+
+
 class JobAdvertCreateSerializer(serializers.ModelSerializer):
     skill_ids = serializers.ListField(
         child=serializers.IntegerField(), write_only=True, required=False
@@ -145,6 +386,11 @@ class JobAdvertCreateSerializer(serializers.ModelSerializer):
             for category_id in category_ids
         ])
         
+        # bulk_create sends no signals, so update facets and cached listings here
+        add_advert_tags(job_advert, skill_ids)
+        mark_adverts_changed([job_advert.pk])
+        bump_generation()
+        
         return job_advert
     
     def update(self, instance, validated_data):
@@ -172,33 +418,57 @@ class JobAdvertCreateSerializer(serializers.ModelSerializer):
                 for category_id in category_ids
             ])
         
+        if skill_ids is not None or category_ids is not None:
+            add_advert_tags(instance, skill_ids or [])
+            mark_adverts_changed([instance.pk])
+            bump_generation()
+        if skill_ids is not None:
+            schedule_advert_rescore(instance.pk)
+        
         return instance
 
 
-class JobApplicationSerializer(serializers.ModelSerializer):
+class JobApplicationSerializer(StoredResumeMixin, SparseFieldsMixin, serializers.ModelSerializer):
     job_seeker = UserSerializer(read_only=True)
     job_advert = JobAdvertSerializer(read_only=True)
+    resume = resume_field('jobapplication-resume', required=False)
+    resume_upload = UploadTokenField('resume')
     
     class Meta:
         model = JobApplication
-        fields = ('id', 'job_seeker', 'job_advert', 'cover_letter', 'resume', 
+        fields = ('id', 'job_seeker', 'job_advert', 'cover_letter', 'resume', 'resume_upload',
                  'status', 'applied_at', 'updated_at')
         read_only_fields = ('id', 'job_seeker', 'job_advert', 'applied_at', 
                            'updated_at')
 
 
-from django.core.validators import FileExtensionValidator  # type: ignore
-from django.core.exceptions import ValidationError  # type: ignore
-from django.conf import settings  # type: ignore
+class ApplicantSummarySerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    class Meta:
+        model = User
+        fields = ('id', 'username', 'first_name', 'last_name', 'location')
+
+
+class RankedApplicationSerializer(SparseFieldsMixin, serializers.ModelSerializer):
+    """
+    Lean application used to triage an advert's applicants by match score.
+    """
+    job_seeker = ApplicantSummarySerializer(read_only=True)
+    resume = DownloadFileField('jobapplication-resume', read_only=True)
+
+    class Meta:
+        model = JobApplication
+        fields = ('id', 'job_seeker', 'status', 'match_score', 'resume', 'applied_at')
+        read_only_fields = fields
+
 
 class JobApplicationCreateSerializer(serializers.ModelSerializer):
-    resume = serializers.FileField(validators=[
-        FileExtensionValidator(allowed_extensions=settings.ALLOWED_FILE_EXTENSIONS, message="Invalid file type"),
-    ])
+    resume = resume_field('jobapplication-resume', required=False)
+    resume_upload = UploadTokenField('resume')
+    use_profile_resume = serializers.BooleanField(write_only=True, required=False, default=False)
     
     class Meta:
         model = JobApplication
-        fields = ('cover_letter', 'resume')
+        fields = ('cover_letter', 'resume', 'resume_upload', 'use_profile_resume')
     
     def validate(self, data):
         job_seeker = self.context['request'].user
@@ -206,6 +476,13 @@ class JobApplicationCreateSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError(
                 _("Only job seekers can apply for jobs.")
             )
+        sources = [name for name in ('resume', 'resume_upload', 'use_profile_resume') if data.get(name)]
+        if not sources:
+            raise serializers.ValidationError({'resume': _("Upload a resume, send resume_upload or set use_profile_resume.")})
+        if len(sources) > 1:
+            raise serializers.ValidationError(_("Use only one of resume, resume_upload and use_profile_resume."))
+        if data.get('use_profile_resume') and not job_seeker.resume:
+            raise serializers.ValidationError({'use_profile_resume': _("Your profile has no resume.")})
         return data
 
     def create(self, validated_data):
@@ -220,11 +497,52 @@ class JobApplicationCreateSerializer(serializers.ModelSerializer):
                 _("You have already applied for this job.")
             )
         
-        return JobApplication.objects.create(
-            job_seeker=job_seeker,
-            job_advert_id= job_advert_id,
-            **validated_data
-        )
+        upload = validated_data.pop('resume', None)
+        staged = validated_data.pop('resume_upload', None)
+        use_profile_resume = validated_data.pop('use_profile_resume')
+        with transaction.atomic():
+            # Identical files are stored once, however many adverts they go to
+            if use_profile_resume:
+                resume = share(job_seeker.resume.name)
+            elif staged is not None:
+                resume = store_upload(staged)
+            else:
+                resume = store(upload)
+            return JobApplication.objects.create(
+                job_seeker=job_seeker,
+                job_advert_id= job_advert_id,
+                resume=resume,
+                **validated_data
+            )
+
+class ChunkedUploadSerializer(serializers.ModelSerializer):
+    size = serializers.IntegerField(min_value=1)
+
+    class Meta:
+        model = ChunkedUpload
+        fields = ('token', 'purpose', 'filename', 'size', 'offset', 'created_at')
+        read_only_fields = ('token', 'offset', 'created_at')
+
+    def validate_filename(self, value):
+        value = value.replace('\\', '/').rsplit('/', 1)[-1]
+        if not value:
+            raise serializers.ValidationError(_("A file name is required."))
+        return value
+
+    def validate(self, data):
+        if extension(data['filename']) not in allowed_extensions(data['purpose']):
+            raise serializers.ValidationError({'filename': _("Invalid file type")})
+        if data['size'] > settings.MAX_UPLOAD_SIZE:
+            raise serializers.ValidationError({'size': _("Files can be at most %(size)d bytes.") % {
+                'size': settings.MAX_UPLOAD_SIZE,
+            }})
+        return data
+
+    def create(self, validated_data):
+        upload = ChunkedUpload.objects.create(user=self.context['request'].user, **validated_data)
+        create_staging_file(upload)
+        return upload
+
 
 class EmptySerializer(serializers.Serializer):
     pass
@@ -3,10 +3,26 @@ from django.core.mail import send_mail  # type: ignore
 from django.conf import settings  # type: ignore
 from django.template.loader import render_to_string  # type: ignore
 from django.utils.html import strip_tags  # type: ignore
-from .models import JobApplication, JobAdvert  # type: ignore
+from .models import User, JobApplication, JobAdvert, JobAdvertSkill, JobAdvertCategory, Skill, Category  # type: ignore
+from .authentication import CACHED_USER_FIELDS, forget_user  # type: ignore
+from .cache import CATEGORIES_NAMESPACE, SKILLS_NAMESPACE, bump_generation  # type: ignore
+from .categories import add_category, creates_cycle, move_category  # type: ignore
+from .counters import (  # type: ignore
+    adjust_applications_count, application_count_delta, claim_status_change, flush_advert_views,
+    reconcile_application_counts
+)
+from .facets import advert_dims, count_tags, load_advert_dims, move_advert, uncount_advert  # type: ignore
+from .files import release  # type: ignore
+from .ranking import (  # type: ignore
+    schedule_advert_rescore, schedule_application_score, score_advert_applications, score_application
+)
+from .recommendations import mark_adverts_changed  # type: ignore
+from .thumbnails import delete_picture, render_profile_picture, schedule_renditions  # type: ignore
+from .uploads import purge_expired_uploads  # type: ignore
 
 
-from django.db.models.signals import post_save  # type: ignore
+from django.db.models import QuerySet  # type: ignore
+from django.db.models.signals import pre_save, post_save, post_delete  # type: ignore
 from django.dispatch import receiver  # type: ignore
 from django.utils import timezone
 
@@ -56,27 +72,137 @@ def send_application_notification_email(application_id):
     to = application.job_advert.employer.email
     send_mail(subject, plain_message, from_email, [to], html_message=html_message)
 
+@shared_task
+def flush_advert_view_counts():
+    """
+    Periodic task folding buffered advert views into views_count
+    """
+    return flush_advert_views()
+
+@shared_task
+def reconcile_application_counts_task():
+    """
+    Periodic task repairing any drift in JobAdvert.applications_count
+    """
+    return reconcile_application_counts()
+
+@shared_task
+def purge_expired_uploads_task():
+    """
+    Periodic task deleting chunked uploads that were never finished or used
+    """
+    return purge_expired_uploads()
+
+@shared_task
+def score_application_task(application_id):
+    """
+    Task storing a new application's match score against its advert
+    """
+    return score_application(application_id)
+
+@shared_task
+def score_advert_applications_task(advert_id):
+    """
+    Task rescoring every application to an advert after its skills change
+    """
+    return score_advert_applications(advert_id)
+
+@shared_task
+def render_profile_picture_task(user_id, name):
+    """
+    Task rendering the resized renditions of a new profile picture
+    """
+    return render_profile_picture(user_id, name)
+
+@receiver(pre_save, sender=JobApplication)
+def claim_application_status(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Signal handler to move a saved application's stored status with a
+    compare-and-set, remembering the status it really replaced
+    """
+    if raw or instance._state.adding or (update_fields is not None and 'status' not in update_fields):
+        return
+    if instance.status == getattr(instance, '_original_status', None):
+        # Unchanged; nothing to claim or count
+        return
+    instance._claimed_status = claim_status_change(
+        instance.pk, getattr(instance, '_original_status', None), instance.status
+    )
+
 @receiver(post_save, sender=JobApplication)
-def update_job_advert_counts(sender, instance, **kwargs):
-    """
-    Signal handler to update job advert counts automatically
-    after a new application is submitted or status changes
-    """
-    if isinstance(instance, JobApplication):
-        job_advert = instance.job_advert
-        
-        # Recalculate the total applications count for this job advert
-        job_advert.applications_count = job_advert.applications.filter(
-            status__in=['pending', 'reviewed', 'interview', 'accepted']
-        ).count()
-        job_advert.save()
-        
-        # Optionally, update other fields based on the application status change
-        # For example, if the application is accepted, update the company's metrics
-        
-        if hasattr(instance, 'status') and instance.status == 'accepted':
-            # Update the employer's metrics or notification
-            pass
+def update_job_advert_counts(sender, instance, created, raw=False, **kwargs):
+    """
+    Signal handler to keep the job advert's applications_count in step
+    when an application is submitted or its status changes
+    """
+    if raw:
+        return
+    if created:
+        old_status = None
+    elif hasattr(instance, '_claimed_status'):
+        old_status = instance._claimed_status
+        del instance._claimed_status
+    else:
+        # The status wasn't saved
+        return
+    adjust_applications_count(instance.job_advert_id, application_count_delta(old_status, instance.status))
+    instance._original_status = instance.status
+
+@receiver(post_save, sender=JobApplication)
+def rank_new_application(sender, instance, created, raw=False, **kwargs):
+    """
+    Signal handler to score a new application for applicant ranking
+    """
+    if created and not raw:
+        schedule_application_score(instance.pk)
+
+@receiver(post_delete, sender=JobApplication)
+def discount_deleted_application(sender, instance, **kwargs):
+    """
+    Signal handler to uncount an application when it is deleted
+    """
+    status = getattr(instance, '_original_status', None)
+    adjust_applications_count(instance.job_advert_id, application_count_delta(status, None))
+
+@receiver(post_delete, sender=JobApplication)
+@receiver(post_delete, sender=User)
+def release_deleted_resume(sender, instance, **kwargs):
+    """
+    Signal handler to drop a deleted row's reference to its stored resume
+    """
+    release(instance.resume.name)
+
+@receiver(post_save, sender=User)
+def render_new_profile_picture(sender, instance, created, raw=False, **kwargs):
+    """
+    Signal handler to render a new profile picture's renditions in the
+    background and delete the picture it replaced, renditions included
+    """
+    if raw or not (created or instance.profile_picture_changed()):
+        return
+    replaced = None if created else instance._original_profile_picture
+    delete_picture(replaced, instance.__dict__.pop('_stale_renditions', None))
+    if instance.profile_picture:
+        schedule_renditions(instance.pk, instance.profile_picture.name)
+    instance._original_profile_picture = instance.profile_picture.name or None
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, update_fields=None, **kwargs):
+    """
+    Signal handler to drop a changed or deleted user from the
+    authentication cache
+    """
+    if update_fields is not None and CACHED_USER_FIELDS.isdisjoint(update_fields):
+        return
+    forget_user(instance.pk)
+
+@receiver(post_delete, sender=User)
+def delete_profile_picture(sender, instance, **kwargs):
+    """
+    Signal handler to delete a deleted user's picture and its renditions
+    """
+    delete_picture(instance.profile_picture.name, instance.profile_picture_renditions)
 
 @receiver(post_save, sender=JobAdvert)
 def set_default_application_deadline(sender, instance, created, **kwargs):
@@ -88,3 +214,164 @@ def set_default_application_deadline(sender, instance, created, **kwargs):
         from datetime import timedelta  # type: ignore
         instance.application_deadline = timezone.now().date() + timedelta(days=30)
         instance.save()
+
+
+@receiver([post_save, post_delete], sender=JobAdvert)
+@receiver([post_save, post_delete], sender=JobAdvertSkill)
+@receiver([post_save, post_delete], sender=JobAdvertCategory)
+def invalidate_advert_listings(sender, **kwargs):
+    """
+    Signal handler to drop cached advert listings whenever an advert
+    or its skills/categories change
+    """
+    bump_generation()
+
+
+@receiver(pre_save, sender=Category)
+def remember_category_parent(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Signal handler to remember a category's parent before it is saved,
+    refusing to move a category under itself
+    """
+    if raw or instance.pk is None or (update_fields is not None and 'parent' not in update_fields):
+        return
+    instance._old_parent_id = Category.objects.filter(pk=instance.pk).values_list('parent_id', flat=True).first()
+    if instance.parent_id and instance.parent_id != instance._old_parent_id and creates_cycle(
+        instance.pk, instance.parent_id
+    ):
+        raise ValueError(f'Cannot move category {instance.pk} under itself or one of its descendants')
+
+
+@receiver(post_save, sender=Category)
+def update_category_closure(sender, instance, created, raw=False, update_fields=None, **kwargs):
+    """
+    Signal handler to link a new category into the closure table, or
+    relink its subtree when its parent changes
+    """
+    if raw:
+        return
+    if created:
+        add_category(instance)
+    elif update_fields is not None and 'parent' not in update_fields:
+        return
+    elif instance.parent_id != getattr(instance, '_old_parent_id', instance.parent_id):
+        move_category(instance)
+
+
+@receiver([post_save, post_delete], sender=Skill)
+@receiver([post_save, post_delete], sender=Category)
+def invalidate_taxonomy(sender, **kwargs):
+    """
+    Signal handler to change the skill or category list ETag (and with it
+    the applicant ranking skill matcher), and drop cached advert listings,
+    which embed skill and category names
+    """
+    bump_generation(SKILLS_NAMESPACE if sender is Skill else CATEGORIES_NAMESPACE)
+    bump_generation()
+
+
+@receiver([post_save, post_delete], sender=JobAdvert)
+@receiver([post_save, post_delete], sender=JobAdvertSkill)
+def rescore_advert_skills(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to queue an advert for re-scoring in the recommendation
+    matrix when it or its skills change
+    """
+    if not raw:
+        mark_adverts_changed([instance.pk if sender is JobAdvert else instance.job_advert_id])
+
+
+@receiver([post_save, post_delete], sender=JobAdvertSkill)
+def rerank_advert_applicants(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to rescore an advert's applicants when its skill
+    requirements change
+    """
+    if not raw:
+        schedule_advert_rescore(instance.job_advert_id)
+
+
+@receiver(pre_save, sender=JobAdvert)
+def remember_advert_facets(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to remember which facet cell an advert was counted in
+    before it is saved
+    """
+    if raw or instance.pk is None:
+        return
+    instance._facet_dims = load_advert_dims(instance.pk)
+
+
+@receiver(post_save, sender=JobAdvert)
+def update_advert_facets(sender, instance, created, raw=False, **kwargs):
+    """
+    Signal handler to move an advert between facet cells when its
+    job type, experience level, remote flag or active flag changes
+    """
+    if raw:
+        return
+    old_dims = None if created else getattr(instance, '_facet_dims', None)
+    move_advert(instance, old_dims, advert_dims(instance))
+
+
+@receiver(post_delete, sender=JobAdvert)
+def remove_advert_facets(sender, instance, **kwargs):
+    """
+    Signal handler to uncount a deleted advert; its cascaded skills
+    uncount themselves
+    """
+    uncount_advert(instance)
+
+
+@receiver(pre_save, sender=JobAdvertSkill)
+def remember_advert_skill(sender, instance, raw=False, **kwargs):
+    """
+    Signal handler to remember which advert and skill an existing advert
+    skill was counted under before it is saved
+    """
+    if raw or instance._state.adding:
+        return
+    instance._counted_tag = sender.objects.filter(pk=instance.pk).values_list('job_advert_id', 'skill_id').first()
+
+
+@receiver(post_save, sender=JobAdvertSkill)
+def count_advert_skill(sender, instance, created, raw=False, **kwargs):
+    """
+    Signal handler to count a new advert skill against its advert's facets,
+    or move an edited one to the cells of its new skill
+    """
+    if raw:
+        return
+    tag = (instance.job_advert_id, instance.skill_id)
+    if created:
+        count_tags(advert_dims(instance.job_advert), [tag[1]], sign=1)
+        return
+    old_tag = getattr(instance, '_counted_tag', None)
+    if old_tag and old_tag != tag:
+        count_tags(load_advert_dims(old_tag[0]), [old_tag[1]], sign=-1)
+        count_tags(advert_dims(instance.job_advert), [tag[1]], sign=1)
+    instance._counted_tag = tag
+
+
+@receiver(post_delete, sender=JobAdvertSkill)
+def uncount_advert_skill(sender, instance, origin=None, **kwargs):
+    """
+    Signal handler to uncount a deleted advert skill
+    """
+    count_tags(_deleted_tag_dims(instance.job_advert_id, origin), [instance.skill_id], sign=-1)
+
+
+def _deleted_tag_dims(advert_id, origin):
+    """
+    Cube dimensions of the advert a deleted skill belonged to. When the
+    advert deletion cascaded to its skills they come from ``origin``, once
+    per advert rather than once per skill.
+    """
+    if isinstance(origin, JobAdvert) and origin.pk == advert_id:
+        return advert_dims(origin)
+    if isinstance(origin, QuerySet) and origin.model is JobAdvert:
+        known = origin.__dict__.setdefault('_facet_dims', {})
+        if advert_id not in known:
+            known[advert_id] = load_advert_dims(advert_id)
+        return known[advert_id]
+    return load_advert_dims(advert_id)
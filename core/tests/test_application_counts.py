@@ -0,0 +1,93 @@
+from django.db import connection  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from django.test.utils import CaptureQueriesContext  # type: ignore
+
+from core.counters import claim_status_change, reconcile_application_counts
+from core.models import JobAdvert, JobApplication, User
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ApplicationCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+        cls.seekers = [
+            User.objects.create_user(username=f'seeker{i}', password='x' * 10, user_type='job_seeker')
+            for i in range(3)
+        ]
+        cls.advert = JobAdvert.objects.create(
+            employer=employer, title='Developer', description='-', requirements='-', location='Remote'
+        )
+
+    def apply(self, seeker, status='pending'):
+        return JobApplication.objects.create(
+            job_seeker=seeker, job_advert=self.advert, cover_letter='-', resume='application_resumes/cv.pdf',
+            status=status,
+        )
+
+    def count(self):
+        return JobAdvert.objects.values_list('applications_count', flat=True).get(pk=self.advert.pk)
+
+    def test_applications_count_follows_active_statuses(self):
+        first, second = self.apply(self.seekers[0]), self.apply(self.seekers[1])
+        self.apply(self.seekers[2], status='withdrawn')
+        self.assertEqual(self.count(), 2)
+        first.status = 'reviewed'
+        first.save()
+        self.assertEqual(self.count(), 2)
+        first.status = 'rejected'
+        first.save()
+        self.assertEqual(self.count(), 1)
+        second.delete()
+        self.assertEqual(self.count(), 0)
+        first.status = 'accepted'
+        first.save(update_fields=['status'])
+        self.assertEqual(self.count(), 1)
+
+    def test_concurrent_saves_count_the_transition_they_made(self):
+        application = self.apply(self.seekers[0])
+        self.apply(self.seekers[1])
+        # Two requests load the same pending application
+        first = JobApplication.objects.get(pk=application.pk)
+        second = JobApplication.objects.get(pk=application.pk)
+        first.status = 'rejected'
+        first.save()
+        second.status = 'withdrawn'
+        second.save()
+        # The second save went from rejected to withdrawn, which changes nothing
+        self.assertEqual(self.count(), 1)
+        third = JobApplication.objects.get(pk=application.pk)
+        stale = JobApplication.objects.get(pk=application.pk)
+        third.status = 'interview'
+        third.save()
+        stale.status = 'accepted'
+        stale.save()
+        self.assertEqual(self.count(), 2)
+        self.assertEqual(reconcile_application_counts(), 0)
+
+    def test_saves_leaving_status_alone_do_not_claim_it(self):
+        application = JobApplication.objects.get(pk=self.apply(self.seekers[0]).pk)
+        application.cover_letter = 'Updated'
+        with CaptureQueriesContext(connection) as queries:
+            application.save()
+        updates = [query['sql'] for query in queries if query['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        application.status = 'rejected'
+        application.save(update_fields=['cover_letter'])
+        self.assertEqual(self.count(), 1)
+
+    def test_claim_status_change(self):
+        application = self.apply(self.seekers[0])
+        self.assertEqual(claim_status_change(application.pk, 'pending', 'reviewed'), 'pending')
+        # A stale expectation retries from the stored status
+        self.assertEqual(claim_status_change(application.pk, 'pending', 'rejected'), 'reviewed')
+        self.assertEqual(claim_status_change(application.pk + 100, None, 'rejected'), None)
+
+    def test_reconcile_repairs_unsignalled_writes(self):
+        self.apply(self.seekers[0])
+        self.apply(self.seekers[1])
+        JobApplication.objects.update(status='withdrawn')
+        self.assertEqual(self.count(), 2)
+        self.assertEqual(reconcile_application_counts(), 1)
+        self.assertEqual(self.count(), 0)
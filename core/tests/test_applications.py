@@ -0,0 +1,92 @@
+from django.core.cache import cache  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+
+from core.models import JobAdvert, JobApplication, User
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class ApplicationInboxTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.other_employer = (
+            User.objects.create_user(username=name, password='x' * 10, user_type='employer')
+            for name in ('employer', 'other_employer')
+        )
+        cls.seeker, cls.other_seeker = (
+            User.objects.create_user(username=name, password='x' * 10, user_type='job_seeker')
+            for name in ('seeker', 'other_seeker')
+        )
+        cls.backend, cls.frontend = (
+            JobAdvert.objects.create(
+                employer=cls.employer, title=title, description='-', requirements='-', location='Remote'
+            )
+            for title in ('Backend', 'Frontend')
+        )
+        cls.elsewhere = JobAdvert.objects.create(
+            employer=cls.other_employer, title='Elsewhere', description='-', requirements='-', location='Remote'
+        )
+        cls.applications = {
+            (seeker.username, advert.title): JobApplication.objects.create(
+                job_seeker=seeker, job_advert=advert, cover_letter='-', resume='application_resumes/cv.pdf'
+            )
+            for seeker in (cls.seeker, cls.other_seeker)
+            for advert in (cls.backend, cls.frontend, cls.elsewhere)
+        }
+        cls.applications['seeker', 'Frontend'].status = 'reviewed'
+        cls.applications['seeker', 'Frontend'].save()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def inbox(self, user, **params):
+        self.client.force_authenticate(user)
+        response = self.client.get('/api/applications/', params)
+        self.assertEqual(response.status_code, 200)
+        return {row['id'] for row in response.json()['results']}
+
+    def ids(self, *keys):
+        return {self.applications[key].pk for key in keys}
+
+    def test_seekers_see_only_their_own_applications(self):
+        self.assertEqual(
+            self.inbox(self.seeker), self.ids(('seeker', 'Backend'), ('seeker', 'Frontend'), ('seeker', 'Elsewhere'))
+        )
+        self.assertEqual(self.inbox(self.seeker, status='reviewed'), self.ids(('seeker', 'Frontend')))
+
+    def test_employers_see_only_applications_to_their_adverts(self):
+        self.assertEqual(self.inbox(self.employer), self.ids(
+            ('seeker', 'Backend'), ('seeker', 'Frontend'), ('other_seeker', 'Backend'), ('other_seeker', 'Frontend')
+        ))
+        self.assertEqual(
+            self.inbox(self.other_employer), self.ids(('seeker', 'Elsewhere'), ('other_seeker', 'Elsewhere'))
+        )
+        self.assertEqual(
+            self.inbox(self.employer, job_advert_id=self.backend.pk),
+            self.ids(('seeker', 'Backend'), ('other_seeker', 'Backend')),
+        )
+        # Filtering on someone else's advert doesn't widen the inbox
+        self.assertEqual(self.inbox(self.employer, job_advert_id=self.elsewhere.pk), set())
+
+    def test_applications_record_the_advert_employer(self):
+        for (_, title), application in self.applications.items():
+            application.refresh_from_db()
+            self.assertEqual(application.employer_id, application.job_advert.employer_id, title)
+
+    def test_details_are_limited_to_the_inbox(self):
+        application = self.applications['seeker', 'Elsewhere']
+        for user, status in ((self.seeker, 200), (self.other_employer, 200), (self.other_seeker, 404),
+                             (self.employer, 404)):
+            self.client.force_authenticate(user)
+            with self.subTest(user=user.username):
+                self.assertEqual(self.client.get(f'/api/applications/{application.pk}/').status_code, status)
+
+    def test_inbox_pages_take_a_fixed_number_of_queries(self):
+        self.client.force_authenticate(self.employer)
+        # Applications with their seekers and adverts, then skills and categories
+        with self.assertNumQueries(3):
+            self.client.get('/api/applications/')
@@ -0,0 +1,88 @@
+from django.core.cache import cache  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+from rest_framework_simplejwt.exceptions import AuthenticationFailed  # type: ignore
+from rest_framework_simplejwt.tokens import AccessToken  # type: ignore
+
+from core.authentication import CACHED_USER_FIELDS, CachedJWTAuthentication, local_users
+from core.models import User
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class CachedUserTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user(
+            username='seeker', password='x' * 10, user_type='job_seeker', location='Lagos'
+        )
+
+    def setUp(self):
+        cache.clear()
+        local_users.entries.clear()
+        self.token = AccessToken.for_user(self.user)
+
+    def authenticate(self):
+        return CachedJWTAuthentication().get_user(self.token)
+
+    def forget_locally(self):
+        # As another process would see it: only the Redis copy
+        local_users.entries.clear()
+
+    def test_users_are_resolved_from_the_cache(self):
+        with self.assertNumQueries(1):
+            self.authenticate()
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.forget_locally()
+        with self.assertNumQueries(0):
+            user = self.authenticate()
+        self.assertEqual((user.pk, user.username, user.user_type), (self.user.pk, 'seeker', 'job_seeker'))
+        self.assertEqual(user.get_deferred_fields() & CACHED_USER_FIELDS, set())
+
+    def test_other_columns_load_together(self):
+        user = self.authenticate()
+        with self.assertNumQueries(1):
+            self.assertEqual(user.location, 'Lagos')
+            self.assertEqual(user.email, '')
+        self.assertEqual(user.get_deferred_fields(), set())
+
+    def test_saving_a_user_drops_the_cached_copy(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            user = User.objects.get(pk=self.user.pk)
+            user.user_type = 'employer'
+            user.save()
+        self.assertEqual(self.authenticate().user_type, 'employer')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            user.is_active = False
+            user.save(update_fields=['is_active'])
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_saves_of_uncached_fields_keep_the_cached_copy(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.get(pk=self.user.pk).save(update_fields=['location'])
+        self.forget_locally()
+        with self.assertNumQueries(0):
+            self.authenticate()
+
+    def test_deleted_users_are_rejected(self):
+        self.authenticate()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.user.pk).delete()
+        with self.assertRaises(AuthenticationFailed):
+            self.authenticate()
+
+    def test_profile_changes_are_visible_to_the_next_request(self):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        self.assertEqual(client.get('/api/auth/profile/').json()['location'], 'Lagos')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = client.patch('/api/auth/profile/', {'location': 'Nairobi', 'username': 'renamed'})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(client.get('/api/auth/profile/').json()['username'], 'renamed')
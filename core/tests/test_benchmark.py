@@ -0,0 +1,114 @@
+import json
+import os
+import tempfile
+from io import StringIO
+from unittest.mock import patch
+
+import fakeredis  # type: ignore
+from django.core.management import call_command  # type: ignore
+from django.core.management.base import CommandError  # type: ignore
+from django.test import SimpleTestCase, TestCase, override_settings  # type: ignore
+
+from core import throttling
+from core.management.commands.benchmark_endpoints import compare_results, percentile
+from core.models import JobAdvert, JobApplication, User
+
+
+def results(**cases):
+    return {'results': {
+        name: {'status': 200, 'queries': 3, 'bytes': 1000, 'p50_ms': 10.0, 'p95_ms': 20.0, 'p99_ms': 30.0, **case}
+        for name, case in cases.items()
+    }}
+
+
+class CompareResultsTests(SimpleTestCase):
+
+    def test_percentile(self):
+        samples = list(range(1, 101))
+        self.assertEqual(percentile(samples, 50), 50)
+        self.assertEqual(percentile(samples, 99), 99)
+        self.assertEqual(percentile(samples, 99.5), 100)
+        self.assertEqual(percentile([7], 95), 7)
+
+    def test_regressions(self):
+        regressions, improvements = compare_results(
+            results(list={}, detail={}, apply={}),
+            results(list={'queries': 4}, detail={'p95_ms': 30.0, 'bytes': 1300}, apply={'status': 429}),
+            threshold=20,
+        )
+        self.assertEqual(regressions, [
+            'list: queries 3 → 4', 'detail: bytes 1000 → 1300', 'detail: p95_ms 20.00 → 30.00', 'apply: status 200 → 429',
+        ])
+        self.assertEqual(improvements, [])
+
+    def test_small_changes_are_noise(self):
+        regressions, improvements = compare_results(
+            results(list={'p50_ms': 0.5}), results(list={'p50_ms': 1.2, 'p95_ms': 23.0, 'queries': 2}), threshold=20,
+        )
+        self.assertEqual(regressions, [])
+        self.assertEqual(improvements, ['list: queries 3 → 2'])
+
+    def test_new_endpoints_are_not_compared(self):
+        self.assertEqual(compare_results(results(), results(list={'queries': 50}), threshold=20), ([], []))
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class BenchmarkCommandTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+        seeker = User.objects.create_user(username='seeker', password='x' * 10, user_type='job_seeker')
+        adverts = [
+            JobAdvert.objects.create(
+                employer=employer, title=f'Python developer {i}', description='-', requirements='-',
+                location='Remote', salary_min=90000,
+            )
+            for i in range(25)
+        ]
+        JobApplication.objects.create(
+            job_seeker=seeker, job_advert=adverts[0], cover_letter='-', resume='application_resumes/cv.pdf'
+        )
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.output = os.path.join(directory.name, 'results.json')
+
+    def benchmark(self, *args):
+        call_command('benchmark_endpoints', '--output', self.output, *args, stdout=StringIO())
+        with open(self.output) as f:
+            return json.load(f)['results']
+
+    def test_every_endpoint_succeeds(self):
+        found = self.benchmark('--iterations', '1', '--warmup', '0', '--max-filters', '1')
+        self.assertIn('advert list [unfiltered]', found)
+        self.assertEqual({name: result['status'] for name, result in found.items() if result['status'] >= 300}, {})
+        # A run compared with itself has no regressions
+        call_command('benchmark_endpoints', '--compare', self.output, self.output, stdout=StringIO())
+
+    def test_apply_runs_the_default_iterations(self):
+        # With throttle buckets that, unlike the database, are never rolled back
+        redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        throttling._script.cache_clear()
+        self.addCleanup(throttling._script.cache_clear)
+        with patch.object(throttling, 'get_redis', lambda: redis):
+            for _ in range(2):
+                found = self.benchmark('--only', 'apply')
+                self.assertEqual(found['apply']['status'], 201)
+        # Every request was rolled back
+        self.assertEqual(JobApplication.objects.count(), 1)
+
+    def test_regressions_fail_the_run(self):
+        self.benchmark('--only', 'skills', '--iterations', '1')
+        with open(self.output) as f:
+            baseline = json.load(f)
+        # Slow enough that timing noise in the rerun can't add regressions
+        baseline['results']['skills'].update(queries=0, p50_ms=1e6, p95_ms=1e6, p99_ms=1e6)
+        baseline_path = self.output.replace('results', 'baseline')
+        with open(baseline_path, 'w') as f:
+            json.dump(baseline, f)
+        with self.assertRaisesMessage(CommandError, '1 regression(s)'):
+            call_command('benchmark_endpoints', '--compare', baseline_path, self.output, stdout=StringIO())
+        with self.assertRaisesMessage(CommandError, '1 regression(s)'):
+            self.benchmark('--only', 'skills', '--iterations', '1', '--baseline', baseline_path)
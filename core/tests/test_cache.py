@@ -0,0 +1,94 @@
+from django.core.cache import cache  # type: ignore
+from django.http import QueryDict  # type: ignore
+from django.test import SimpleTestCase, TestCase, override_settings  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+
+from core.cache import get_generation, normalize_query
+from core.models import JobAdvert, JobAdvertSkill, Skill, User
+
+
+class NormalizeQueryTests(SimpleTestCase):
+
+    def test_params_are_sorted_and_tag_lists_deduplicated(self):
+        self.assertEqual(
+            normalize_query(QueryDict('skills=10&search=python&skills=2&skills=10&ordering=-created_at')),
+            'ordering=-created_at&search=python&skills=2&skills=10',
+        )
+
+    def test_other_lists_keep_their_order(self):
+        self.assertEqual(normalize_query(QueryDict('job_type=b&job_type=a')), 'job_type=b&job_type=a')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class AnonymousListCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+        cls.skill = Skill.objects.create(name='Python')
+
+    def setUp(self):
+        cache.clear()
+        self.advert = JobAdvert.objects.create(
+            employer=self.employer, title='Developer', description='-', requirements='-', location='Remote'
+        )
+
+    def get(self, client=None, **params):
+        response = (client or self.client).get('/api/adverts/', params)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_repeated_listings_are_served_from_the_cache(self):
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+        with self.assertNumQueries(0):
+            response = self.get()
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.json()['results'][0]['title'], 'Developer')
+
+    def test_equivalent_queries_share_an_entry(self):
+        self.get(skills=[2, 1])
+        self.assertEqual(self.get(skills=[1, 2, 1])['X-Cache'], 'HIT')
+        self.assertEqual(self.get(skills=[1])['X-Cache'], 'MISS')
+
+    def test_advert_writes_invalidate(self):
+        self.get()
+        generation = get_generation()
+        self.advert.title = 'Senior Developer'
+        self.advert.save()
+        self.assertGreater(get_generation(), generation)
+        response = self.get()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.json()['results'][0]['title'], 'Senior Developer')
+
+    def test_skill_writes_invalidate(self):
+        self.get()
+        link = JobAdvertSkill.objects.create(job_advert=self.advert, skill=self.skill)
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+        self.get()
+        link.delete()
+        self.assertEqual(self.get()['X-Cache'], 'MISS')
+
+    def test_deleted_adverts_drop_out(self):
+        self.get()
+        self.advert.delete()
+        self.assertEqual(self.get().json()['results'], [])
+
+    def test_signed_in_requests_bypass_the_cache(self):
+        client = APIClient()
+        client.force_authenticate(self.employer)
+        self.get()
+        self.assertNotIn('X-Cache', self.get(client))
+
+    def test_stats_are_for_admins(self):
+        self.get()
+        self.get()
+        admin = User.objects.create_superuser(username='admin', password='x' * 10, email='admin@example.com')
+        client = APIClient()
+        client.force_authenticate(self.employer)
+        self.assertEqual(client.get('/api/adverts/cache-stats/').status_code, 403)
+        client.force_authenticate(admin)
+        stats = client.get('/api/adverts/cache-stats/').json()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+        self.assertGreaterEqual(stats['invalidations'], 1)
@@ -0,0 +1,143 @@
+from django.test import TestCase, override_settings  # type: ignore
+
+from core.categories import creates_cycle, rebuild_category_closure
+from core.models import Category, CategoryClosure, JobAdvert, JobAdvertCategory, User
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class CategoryClosureTests(TestCase):
+    """
+    engineering > software > backend, and design on its own.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.engineering = Category.objects.create(name='engineering')
+        cls.software = Category.objects.create(name='software', parent=cls.engineering)
+        cls.backend = Category.objects.create(name='backend', parent=cls.software)
+        cls.design = Category.objects.create(name='design')
+
+    def closure(self):
+        return set(CategoryClosure.objects.values_list('ancestor__name', 'descendant__name', 'depth'))
+
+    def test_new_categories_link_to_every_ancestor(self):
+        self.assertEqual(self.closure(), {
+            ('engineering', 'engineering', 0), ('software', 'software', 0),
+            ('backend', 'backend', 0), ('design', 'design', 0),
+            ('engineering', 'software', 1), ('software', 'backend', 1), ('engineering', 'backend', 2),
+        })
+
+    def test_moving_relinks_the_subtree(self):
+        self.software.parent = self.design
+        self.software.save()
+        self.assertEqual(self.closure(), {
+            ('engineering', 'engineering', 0), ('software', 'software', 0),
+            ('backend', 'backend', 0), ('design', 'design', 0),
+            ('design', 'software', 1), ('software', 'backend', 1), ('design', 'backend', 2),
+        })
+
+    def test_moving_to_the_top_level(self):
+        self.software.parent = None
+        self.software.save()
+        self.assertFalse(CategoryClosure.objects.filter(ancestor=self.engineering, depth__gt=0).exists())
+        self.assertTrue(CategoryClosure.objects.filter(ancestor=self.software, descendant=self.backend).exists())
+
+    def test_creates_cycle(self):
+        self.assertTrue(creates_cycle(self.engineering.pk, self.backend.pk))
+        self.assertTrue(creates_cycle(self.software.pk, self.software.pk))
+        self.assertFalse(creates_cycle(self.backend.pk, self.engineering.pk))
+        self.assertFalse(creates_cycle(self.software.pk, self.design.pk))
+
+    def test_moving_under_a_descendant_is_refused(self):
+        before = self.closure()
+        self.engineering.parent = self.backend
+        with self.assertRaises(ValueError):
+            self.engineering.save()
+        self.assertIsNone(Category.objects.get(pk=self.engineering.pk).parent_id)
+        self.assertEqual(self.closure(), before)
+
+    def test_saves_leaving_out_parent_do_not_relink(self):
+        before = self.closure()
+        self.software.parent = self.design
+        self.software.description = 'Programming'
+        self.software.save(update_fields=['description'])
+        self.assertEqual(self.closure(), before)
+
+    def test_rebuild_matches_the_maintained_table(self):
+        self.backend.parent = self.design
+        self.backend.save()
+        maintained = self.closure()
+        self.assertEqual(rebuild_category_closure(), len(maintained))
+        self.assertEqual(self.closure(), maintained)
+
+    def test_rebuild_repairs_unsignalled_updates(self):
+        Category.objects.filter(pk=self.software.pk).update(parent=self.design)
+        rebuild_category_closure()
+        self.assertIn(('design', 'backend', 2), self.closure())
+        self.assertNotIn(('engineering', 'backend', 2), self.closure())
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class CategoryQueryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        engineering = Category.objects.create(name='engineering')
+        software = Category.objects.create(name='software', parent=engineering)
+        backend = Category.objects.create(name='backend', parent=software)
+        design = Category.objects.create(name='design')
+        employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+
+        def advert(title, *categories, is_active=True):
+            advert = JobAdvert.objects.create(
+                employer=employer, title=title, description='-', requirements='-', location='Remote',
+                is_active=is_active,
+            )
+            for category in categories:
+                JobAdvertCategory.objects.create(job_advert=advert, category=category)
+            return advert
+
+        cls.api = advert('API developer', software, backend)
+        cls.database = advert('Database engineer', backend)
+        cls.designer = advert('Designer', design)
+        advert('Closed', backend, is_active=False)
+        cls.categories = {category.name: category.pk for category in (engineering, software, backend, design)}
+
+    def test_filter_includes_subcategories(self):
+        response = self.client.get('/api/adverts/', {'categories': self.categories['engineering']})
+        self.assertEqual(response.status_code, 200)
+        ids = {advert['id'] for advert in response.json()['results']}
+        self.assertEqual(ids, {self.api.pk, self.database.pk})
+
+    def test_tree_counts_adverts_under_descendants_once(self):
+        response = self.client.get('/api/categories/tree/')
+        self.assertEqual(response.status_code, 200)
+
+        counts, nodes = {}, response.json()
+        while nodes:
+            node = nodes.pop()
+            counts[node['name']] = node['advert_count']
+            nodes.extend(node['children'])
+        self.assertEqual(counts, {'engineering': 2, 'software': 2, 'backend': 2, 'design': 1})
+
+    def test_facets_count_adverts_under_descendants_once(self):
+        expected = {
+            str(self.categories[name]): count
+            for name, count in (('engineering', 2), ('software', 2), ('backend', 2), ('design', 1))
+        }
+        # Answered alongside the facet cube, then by grouping the filtered adverts
+        roots = [self.categories['engineering'], self.categories['design']]
+        for params in ({}, {'categories': roots}):
+            with self.subTest(params=params):
+                response = self.client.get('/api/adverts/', {'facets': 'categories', **params})
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json()['facets']['categories'], expected)
+
+        # Each count matches what filtering on that category returns
+        for name, pk in self.categories.items():
+            response = self.client.get('/api/adverts/', {'categories': pk})
+            self.assertEqual(len(response.json()['results']), expected[str(pk)])
@@ -0,0 +1,85 @@
+from django.core.cache import cache  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from django.utils.http import http_date  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+
+from core.models import Category, JobAdvert, Skill, User
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class ConditionalGetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+        cls.advert = JobAdvert.objects.create(
+            employer=cls.employer, title='Backend', description='-', requirements='-', location='Remote'
+        )
+        Skill.objects.create(name='Python')
+        Category.objects.create(name='Engineering')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def revalidate(self, url, **headers):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('ETag', response)
+        return response, self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'], **headers)
+
+    def test_unchanged_lists_answer_304_without_a_body(self):
+        for url in ('/api/adverts/', '/api/adverts/?ordering=title', '/api/skills/', '/api/categories/'):
+            with self.subTest(url=url):
+                first, second = self.revalidate(url)
+                self.assertEqual(second.status_code, 304)
+                self.assertEqual(second.content, b'')
+                self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_list_etags_depend_on_the_query(self):
+        self.assertNotEqual(
+            self.client.get('/api/adverts/')['ETag'], self.client.get('/api/adverts/?ordering=title')['ETag']
+        )
+
+    def test_edits_change_the_etag(self):
+        skills, _ = self.revalidate('/api/skills/')
+        adverts, _ = self.revalidate('/api/adverts/')
+        Skill.objects.create(name='SQL')
+        self.assertEqual(self.client.get('/api/skills/', HTTP_IF_NONE_MATCH=skills['ETag']).status_code, 200)
+        # Listings embed skill names, so they change too
+        self.assertEqual(self.client.get('/api/adverts/', HTTP_IF_NONE_MATCH=adverts['ETag']).status_code, 200)
+
+        categories, _ = self.revalidate('/api/categories/')
+        Category.objects.create(name='Design')
+        self.assertEqual(
+            self.client.get('/api/categories/', HTTP_IF_NONE_MATCH=categories['ETag']).status_code, 200
+        )
+
+    def test_advert_detail_revalidates_by_etag_and_last_modified(self):
+        url = f'/api/adverts/{self.advert.pk}/'
+        first, second = self.revalidate(url)
+        self.assertTrue(first['ETag'].startswith('W/'))
+        self.assertEqual(first['Last-Modified'], http_date(int(self.advert.updated_at.timestamp())))
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=first['Last-Modified']).status_code, 304)
+
+        self.advert.title = 'Senior Backend'
+        self.advert.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['title'], 'Senior Backend')
+
+    def test_a_revalidated_advert_view_still_counts(self):
+        url = f'/api/adverts/{self.advert.pk}/'
+        _, second = self.revalidate(url)
+        self.assertEqual(second.status_code, 304)
+        # Without Redis each view is written straight through
+        self.advert.refresh_from_db()
+        self.assertEqual(self.advert.views_count, 2)
+
+    def test_missing_adverts_get_no_validators(self):
+        response = self.client.get('/api/adverts/0/')
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn('ETag', response)
@@ -0,0 +1,163 @@
+import tempfile
+
+from django.core.cache import cache  # type: ignore
+from django.core.files.base import ContentFile  # type: ignore
+from django.core.files.storage import default_storage  # type: ignore
+from django.test import SimpleTestCase, TestCase, override_settings  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+
+from core.downloads import parse_range
+from core.models import JobAdvert, JobApplication, User
+
+SIZE = 1000
+CONTENT = b'0123456789abcdef'
+
+
+class ParseRangeTests(SimpleTestCase):
+
+    def test_closed_range(self):
+        self.assertEqual(parse_range('bytes=0-99', SIZE), (0, 99))
+        self.assertEqual(parse_range('bytes=500-500', SIZE), (500, 500))
+
+    def test_end_past_the_file_is_clamped(self):
+        self.assertEqual(parse_range('bytes=900-5000', SIZE), (900, 999))
+
+    def test_open_ended_range(self):
+        self.assertEqual(parse_range('bytes=900-', SIZE), (900, 999))
+        self.assertEqual(parse_range('bytes=0-', SIZE), (0, 999))
+
+    def test_suffix_range(self):
+        self.assertEqual(parse_range('bytes=-100', SIZE), (900, 999))
+        # Longer than the file: the whole file
+        self.assertEqual(parse_range('bytes=-5000', SIZE), (0, 999))
+
+    def test_unsatisfiable_ranges(self):
+        self.assertIs(parse_range('bytes=1000-', SIZE), False)
+        self.assertIs(parse_range('bytes=1000-1200', SIZE), False)
+        self.assertIs(parse_range('bytes=500-400', SIZE), False)
+        self.assertIs(parse_range('bytes=-0', SIZE), False)
+
+    def test_whole_file_answers(self):
+        for header in (None, '', 'bytes=-', 'bytes=0-1,5-6', 'items=0-10', 'bytes=a-b'):
+            with self.subTest(header=header):
+                self.assertIsNone(parse_range(header, SIZE))
+
+    def test_empty_file(self):
+        self.assertIsNone(parse_range('bytes=0-10', 0))
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False,
+    MEDIA_SENDFILE='',
+)
+class DownloadViewTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.other_employer = (
+            User.objects.create_user(username=name, password='x' * 10, user_type='employer')
+            for name in ('employer', 'other_employer')
+        )
+        cls.seeker, cls.other_seeker = (
+            User.objects.create_user(
+                username=name, password='x' * 10, user_type='job_seeker',
+                resume=f'resumes/{name}.pdf', profile_picture=f'profile_pictures/{name}.png',
+            )
+            for name in ('seeker', 'other_seeker')
+        )
+        advert = JobAdvert.objects.create(
+            employer=cls.employer, title='Backend', description='-', requirements='-', location='Remote'
+        )
+        cls.application = JobApplication.objects.create(
+            job_seeker=cls.seeker, job_advert=advert, cover_letter='-', resume='application_resumes/cv.pdf'
+        )
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(MEDIA_ROOT=media.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        for name in ('application_resumes/cv.pdf', 'resumes/seeker.pdf', 'profile_pictures/seeker.png'):
+            default_storage.save(name, ContentFile(CONTENT))
+        cache.clear()
+        self.client = APIClient()
+
+    def get(self, user, url, **headers):
+        self.client.force_authenticate(user)
+        return self.client.get(url, **headers)
+
+    def test_files_are_only_served_to_the_owner_and_the_employers_concerned(self):
+        urls = (
+            f'/api/applications/{self.application.pk}/resume/',
+            f'/api/users/{self.seeker.pk}/resume/',
+            f'/api/users/{self.seeker.pk}/profile-picture/',
+        )
+        for url in urls:
+            for user, status in ((self.seeker, 200), (self.employer, 200), (self.other_seeker, 404),
+                                 (self.other_employer, 404), (None, 401)):
+                with self.subTest(url=url, user=user and user.username):
+                    response = self.get(user, url)
+                    self.assertEqual(response.status_code, status)
+                    if status == 200:
+                        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+                    else:
+                        self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_download_headers(self):
+        response = self.get(self.employer, f'/api/applications/{self.application.pk}/resume/')
+        self.assertEqual(response['Content-Type'], 'application/pdf')
+        self.assertEqual(
+            response['Content-Disposition'], f'inline; filename="application-{self.application.pk}-resume.pdf"'
+        )
+        self.assertEqual(response['Cache-Control'], 'private')
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertEqual(response['Content-Length'], str(len(CONTENT)))
+
+    def test_missing_files_are_not_found(self):
+        # Recorded on the row but gone from storage
+        response = self.get(self.other_seeker, f'/api/users/{self.other_seeker.pk}/resume/')
+        self.assertEqual(response.status_code, 404)
+        User.objects.filter(pk=self.seeker.pk).update(resume='')
+        self.assertEqual(self.get(self.seeker, f'/api/users/{self.seeker.pk}/resume/').status_code, 404)
+
+    def test_byte_ranges(self):
+        url = f'/api/users/{self.seeker.pk}/resume/'
+        response = self.get(self.seeker, url, HTTP_RANGE='bytes=2-5')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[2:6])
+        self.assertEqual(response['Content-Range'], f'bytes 2-5/{len(CONTENT)}')
+        self.assertEqual(response['Content-Length'], '4')
+
+        response = self.get(self.seeker, url, HTTP_RANGE='bytes=-3')
+        self.assertEqual(b''.join(response.streaming_content), CONTENT[-3:])
+
+        response = self.get(self.seeker, url, HTTP_RANGE=f'bytes={len(CONTENT)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(CONTENT)}')
+
+    def test_a_stale_if_range_gets_the_whole_file(self):
+        url = f'/api/users/{self.seeker.pk}/resume/'
+        last_modified = self.get(self.seeker, url)['Last-Modified']
+        response = self.get(self.seeker, url, HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE=last_modified)
+        self.assertEqual(response.status_code, 206)
+        response = self.get(self.seeker, url, HTTP_RANGE='bytes=2-5', HTTP_IF_RANGE='Thu, 01 Jan 1970 00:00:00 GMT')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), CONTENT)
+
+    def test_delivery_can_be_handed_to_the_web_server(self):
+        url = f'/api/users/{self.seeker.pk}/profile-picture/'
+        with self.settings(MEDIA_SENDFILE='nginx', MEDIA_ACCEL_PREFIX='/protected-media/'):
+            response = self.get(self.employer, url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Accel-Redirect'], '/protected-media/profile_pictures/seeker.png')
+        self.assertEqual(response['Content-Type'], 'image/png')
+        self.assertEqual(response.content, b'')
+
+        with self.settings(MEDIA_SENDFILE='xsendfile'):
+            response = self.get(self.employer, url)
+        self.assertEqual(response['X-Sendfile'], default_storage.path('profile_pictures/seeker.png'))
+        self.assertNotIn('X-Accel-Redirect', response)
+        # Offloaded or not, permissions are checked first
+        with self.settings(MEDIA_SENDFILE='nginx'):
+            self.assertEqual(self.get(self.other_employer, url).status_code, 404)
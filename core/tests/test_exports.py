@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+
+from django.core.cache import cache  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+
+from core.exports import HEADER
+from core.models import JobAdvert, JobApplication, User
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class ApplicationExportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.other_employer = (
+            User.objects.create_user(username=name, password='x' * 10, user_type='employer')
+            for name in ('employer', 'other_employer')
+        )
+        cls.seeker = User.objects.create_user(
+            username='seeker', password='x' * 10, user_type='job_seeker', first_name='=HYPERLINK("x")',
+            email='seeker@example.com',
+        )
+        cls.backend, cls.elsewhere = (
+            JobAdvert.objects.create(employer=employer, title=title, description='-', requirements='-', location='Remote')
+            for employer, title in ((cls.employer, 'Backend'), (cls.other_employer, 'Elsewhere'))
+        )
+        cls.application, cls.other_application = (
+            JobApplication.objects.create(
+                job_seeker=cls.seeker, job_advert=advert, cover_letter='Hello, world\nBye',
+                resume='application_resumes/cv.pdf'
+            )
+            for advert in (cls.backend, cls.elsewhere)
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+
+    def export(self, **extra):
+        response = self.client.get('/api/applications/export/', **extra)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def test_csv_export_lists_the_employers_applications(self):
+        response, body = self.export()
+        self.assertTrue(response['Content-Type'].startswith('text/csv'))
+        self.assertRegex(response['Content-Disposition'], r'^attachment; filename="applications-\d{8}\.csv"$')
+        header, *rows = list(csv.reader(io.StringIO(body)))
+        self.assertEqual(tuple(header), HEADER)
+        self.assertEqual(len(rows), 1)
+        row = dict(zip(header, rows[0]))
+        self.assertEqual(row['application_id'], str(self.application.pk))
+        self.assertEqual(row['job_advert_title'], 'Backend')
+        self.assertEqual(row['email'], 'seeker@example.com')
+        self.assertEqual(row['cover_letter'], 'Hello, world\nBye')
+        self.assertEqual(row['resume'], f'http://testserver/api/applications/{self.application.pk}/resume/')
+        # Formula-looking cells are defused
+        self.assertEqual(row['first_name'], '\'=HYPERLINK("x")')
+
+    def test_ndjson_export(self):
+        for extra in ({'HTTP_ACCEPT': 'application/x-ndjson'}, {'QUERY_STRING': 'format=ndjson'}):
+            with self.subTest(extra=extra):
+                response, body = self.export(**extra)
+                self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+                [row] = [json.loads(line) for line in body.splitlines()]
+                self.assertEqual(list(row), list(HEADER))
+                self.assertEqual(row['application_id'], self.application.pk)
+                self.assertEqual(row['first_name'], '=HYPERLINK("x")')
+
+    def test_filters_narrow_the_export(self):
+        _, body = self.export(QUERY_STRING='status=rejected')
+        self.assertEqual(body.splitlines(), [','.join(HEADER)])
+
+    def test_only_employers_can_export(self):
+        self.client.force_authenticate(self.seeker)
+        response = self.client.get('/api/applications/export/')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.client.force_authenticate(None)
+        self.assertEqual(self.client.get('/api/applications/export/').status_code, 401)
@@ -0,0 +1,116 @@
+import re
+
+from django.db import connection  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from django.test.utils import CaptureQueriesContext  # type: ignore
+
+from core.facets import rebuild_facet_counts
+from core.models import Category, JobAdvert, JobAdvertCategory, JobAdvertFacetCount, JobAdvertSkill, Skill, User
+
+ADVERT_SELECT_RE = re.compile(r'^SELECT .* FROM "core_jobadvert"\s')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class FacetCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+        cls.python, cls.sql, cls.figma = (Skill.objects.create(name=name) for name in ('Python', 'SQL', 'Figma'))
+        cls.engineering, cls.design = (Category.objects.create(name=name) for name in ('Engineering', 'Design'))
+
+    def advert(self, skills=(), categories=(), **fields):
+        advert = JobAdvert.objects.create(
+            employer=self.employer, title='Advert', description='-', requirements='-', location='Remote', **fields
+        )
+        for skill in skills:
+            JobAdvertSkill.objects.create(job_advert=advert, skill=skill)
+        for category in categories:
+            JobAdvertCategory.objects.create(job_advert=advert, category=category)
+        return advert
+
+    def cube(self):
+        return {
+            cell[:-1]: cell[-1] for cell in JobAdvertFacetCount.objects.exclude(count=0).values_list(
+                'job_type', 'experience_level', 'is_remote', 'skill_id', 'count'
+            )
+        }
+
+    def assertCubeMatchesRebuild(self):
+        maintained = self.cube()
+        rebuild_facet_counts()
+        self.assertEqual(maintained, self.cube())
+
+    def facets(self, **params):
+        response = self.client.get('/api/adverts/', {'facets': 'job_type,is_remote,skills,categories', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['facets']
+
+    def test_counts_follow_creates_updates_and_deletes(self):
+        backend = self.advert([self.python, self.sql], [self.engineering])
+        self.advert([self.python], [self.engineering], job_type='contract', is_remote=True)
+        self.advert([self.figma], [self.design], is_active=False)
+        self.assertEqual(self.facets(), {
+            'job_type': {'full_time': 1, 'contract': 1},
+            'is_remote': {'false': 1, 'true': 1},
+            'skills': {str(self.python.pk): 2, str(self.sql.pk): 1},
+            'categories': {str(self.engineering.pk): 2},
+        })
+        self.assertCubeMatchesRebuild()
+
+        backend.job_type = 'contract'
+        backend.save()
+        self.assertEqual(self.facets(job_type='contract')['skills'], {str(self.python.pk): 2, str(self.sql.pk): 1})
+        self.assertCubeMatchesRebuild()
+
+        backend.is_active = False
+        backend.save()
+        self.assertEqual(self.facets()['skills'], {str(self.python.pk): 1})
+        self.assertCubeMatchesRebuild()
+
+        JobAdvert.objects.get(job_type='contract', is_active=True).delete()
+        self.assertEqual(self.cube(), {})
+
+    def test_cube_and_fallback_agree(self):
+        self.advert([self.python, self.sql], [self.engineering])
+        self.advert([self.python], [self.design], experience_level='senior')
+        # Search can't be answered from the cube, so this groups the filtered adverts instead
+        self.assertEqual(self.facets(), self.facets(search='advert'))
+
+    def test_editing_a_tag_moves_its_count(self):
+        advert = self.advert([self.python], [self.engineering])
+        tag = advert.skills.get()
+        tag.skill = self.figma
+        tag.save()
+        category = advert.categories.get()
+        category.category = self.design
+        category.save()
+        facets = self.facets()
+        self.assertEqual(facets['skills'], {str(self.figma.pk): 1})
+        self.assertEqual(facets['categories'], {str(self.design.pk): 1})
+        self.assertCubeMatchesRebuild()
+
+    def test_deleting_an_advert_reads_it_once(self):
+        for skills in ([self.python], [self.python, self.sql, self.figma]):
+            advert = self.advert(skills, [self.engineering, self.design])
+            with CaptureQueriesContext(connection) as queries:
+                advert.delete()
+            advert_selects = [query['sql'] for query in queries if ADVERT_SELECT_RE.search(query['sql'])]
+            self.assertEqual(advert_selects, [])
+            self.assertEqual(self.cube(), {})
+
+    def test_queryset_deletes_read_each_advert_once(self):
+        for _ in range(2):
+            self.advert([self.python, self.sql, self.figma], [self.engineering])
+        with CaptureQueriesContext(connection) as queries:
+            JobAdvert.objects.all().delete()
+        advert_selects = [query['sql'] for query in queries if ADVERT_SELECT_RE.search(query['sql'])]
+        # The collector's own fetch, then one per advert for its tags
+        self.assertLessEqual(len(advert_selects), 3)
+        self.assertEqual(self.cube(), {})
+
+    def test_unknown_facets_are_rejected(self):
+        response = self.client.get('/api/adverts/', {'facets': 'salary'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,78 @@
+from django.core.cache import cache  # type: ignore
+from django.db import connection  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from django.test.utils import CaptureQueriesContext  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+
+from core.models import JobAdvert, JobAdvertSkill, JobApplication, Skill, User
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class SparseFieldsetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(
+            username='employer', password='x' * 10, user_type='employer', company_name='Acme'
+        )
+        cls.seeker = User.objects.create_user(username='seeker', password='x' * 10, user_type='job_seeker')
+        cls.advert = JobAdvert.objects.create(
+            employer=cls.employer, title='Backend', description='-', requirements='-', location='Remote'
+        )
+        JobAdvertSkill.objects.create(job_advert=cls.advert, skill=Skill.objects.create(name='Python'))
+        cls.application = JobApplication.objects.create(
+            job_seeker=cls.seeker, job_advert=cls.advert, cover_letter='-', resume='application_resumes/cv.pdf'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.employer)
+
+    def inbox(self, **params):
+        response = self.client.get('/api/applications/', params)
+        self.assertEqual(response.status_code, 200, response.content)
+        [row] = response.json()['results']
+        return row
+
+    def test_without_parameters_the_full_representation_is_kept(self):
+        row = self.inbox()
+        self.assertEqual(row['job_seeker']['username'], 'seeker')
+        self.assertEqual(row['job_advert']['employer']['company_name'], 'Acme')
+        self.assertEqual(row['job_advert']['skills'][0]['skill']['name'], 'Python')
+
+    def test_fields_prune_the_response_and_reach_into_nested_objects(self):
+        row = self.inbox(fields='id,status,job_advert.title')
+        self.assertEqual(row, {'id': self.application.pk, 'status': 'pending', 'job_advert': {'title': 'Backend'}})
+
+    def test_unexpanded_nested_objects_collapse_to_ids(self):
+        row = self.inbox(expand='job_advert')
+        self.assertEqual(row['job_seeker'], self.seeker.pk)
+        self.assertEqual(row['job_advert']['employer'], self.employer.pk)
+        self.assertEqual(row['job_advert']['skills'], [self.advert.skills.get().pk])
+
+        row = self.inbox(expand='job_advert,job_advert.employer', fields='job_advert')
+        self.assertEqual(list(row), ['job_advert'])
+        self.assertEqual(row['job_advert']['employer']['company_name'], 'Acme')
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get('/api/applications/', {'fields': 'id,job_advert.salary'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('job_advert.salary', response.json()['fields'])
+
+    def test_the_query_reads_only_the_selected_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.inbox(fields='id,status')
+        [query] = queries.captured_queries
+        self.assertIn('"core_jobapplication"."status"', query['sql'])
+        self.assertNotIn('cover_letter', query['sql'])
+        self.assertNotIn('core_jobadvert', query['sql'])
+
+    def test_advert_detail_accepts_fieldsets(self):
+        response = self.client.get(f'/api/adverts/{self.advert.pk}/', {'fields': 'id,title,employer.username'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(), {'id': self.advert.pk, 'title': 'Backend', 'employer': {'username': 'employer'}}
+        )
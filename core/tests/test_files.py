@@ -0,0 +1,128 @@
+import tempfile
+
+from django.core.cache import cache  # type: ignore
+from django.core.files.base import ContentFile  # type: ignore
+from django.core.files.storage import default_storage  # type: ignore
+from django.core.files.uploadedfile import SimpleUploadedFile  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+
+from core.files import content_name, file_digest, release, share, store
+from core.models import JobAdvert, JobApplication, StoredFile, User
+
+
+class StoredFileTestCase(TestCase):
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(MEDIA_ROOT=media.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+    def refs(self, name):
+        return StoredFile.objects.filter(name=name).values_list('ref_count', flat=True).first()
+
+
+class ContentAddressedStorageTests(StoredFileTestCase):
+
+    def test_identical_content_is_stored_once(self):
+        first = store(SimpleUploadedFile('cv.PDF', b'resume'))
+        second = store(SimpleUploadedFile('other.pdf', b'resume'))
+        digest = file_digest(ContentFile(b'resume'))
+        self.assertEqual(first, second)
+        self.assertEqual(first, content_name(digest, 'resumes/sha256', 'cv.pdf'))
+        self.assertEqual(self.refs(first), 2)
+        self.assertNotEqual(store(SimpleUploadedFile('cv.pdf', b'another resume')), first)
+
+    def test_the_file_goes_with_its_last_reference(self):
+        name = store(SimpleUploadedFile('cv.pdf', b'resume'))
+        share(name)
+        with self.captureOnCommitCallbacks(execute=True):
+            release(name)
+        self.assertEqual(self.refs(name), 1)
+        self.assertTrue(default_storage.exists(name))
+        with self.captureOnCommitCallbacks(execute=True):
+            release(name)
+        self.assertIsNone(self.refs(name))
+        self.assertFalse(default_storage.exists(name))
+
+    def test_a_file_stored_again_before_commit_is_kept(self):
+        name = store(SimpleUploadedFile('cv.pdf', b'resume'))
+        with self.captureOnCommitCallbacks(execute=True):
+            release(name)
+            self.assertEqual(store(SimpleUploadedFile('cv.pdf', b'resume')), name)
+        self.assertTrue(default_storage.exists(name))
+
+    def test_legacy_files_are_registered_when_shared(self):
+        name = default_storage.save('resumes/cv.pdf', ContentFile(b'legacy'))
+        self.assertEqual(share(name), name)
+        # The row that already held it counts too
+        self.assertEqual(self.refs(name), 2)
+        self.assertEqual(store(SimpleUploadedFile('cv.pdf', b'legacy')), name)
+        self.assertEqual(self.refs(name), 3)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class ResumeUploadTests(StoredFileTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+        cls.seeker = User.objects.create_user(username='seeker', password='x' * 10, user_type='job_seeker')
+        cls.adverts = [
+            JobAdvert.objects.create(
+                employer=cls.employer, title=title, description='-', requirements='-', location='Remote'
+            )
+            for title in ('Backend', 'Frontend')
+        ]
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def apply(self, advert, **data):
+        response = self.client.post(f'/api/adverts/{advert.pk}/apply/', {'cover_letter': '-', **data})
+        self.assertEqual(response.status_code, 201, response.content)
+        return JobApplication.objects.get(pk=response.json()['id'])
+
+    def test_repeat_applications_share_one_file(self):
+        first = self.apply(self.adverts[0], resume=SimpleUploadedFile('cv.pdf', b'resume'))
+        second = self.apply(self.adverts[1], resume=SimpleUploadedFile('cv.pdf', b'resume'))
+        self.assertEqual(first.resume.name, second.resume.name)
+        self.assertEqual(self.refs(first.resume.name), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertEqual(self.refs(second.resume.name), 1)
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(default_storage.exists(second.resume.name))
+
+    def test_seekers_can_apply_with_their_profile_resume(self):
+        response = self.client.patch(
+            '/api/auth/profile/', {'resume': SimpleUploadedFile('cv.pdf', b'profile')}, format='multipart'
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.seeker.refresh_from_db()
+        application = self.apply(self.adverts[0], use_profile_resume=True)
+        self.assertEqual(application.resume.name, self.seeker.resume.name)
+        self.assertEqual(self.refs(application.resume.name), 2)
+
+        # Replacing the profile resume releases the old one; the application keeps it
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.patch(
+                '/api/auth/profile/', {'resume': SimpleUploadedFile('cv.pdf', b'new profile')}, format='multipart'
+            )
+        self.assertEqual(self.refs(application.resume.name), 1)
+        self.assertTrue(default_storage.exists(application.resume.name))
+
+    def test_a_resume_is_required(self):
+        for data in ({}, {'use_profile_resume': True}):
+            with self.subTest(data=data):
+                response = self.client.post(f'/api/adverts/{self.adverts[0].pk}/apply/', {'cover_letter': '-', **data})
+                self.assertEqual(response.status_code, 400)
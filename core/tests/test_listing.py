@@ -0,0 +1,52 @@
+from django.db import connection  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from django.test.utils import CaptureQueriesContext  # type: ignore
+
+from core.models import Category, JobAdvert, JobAdvertCategory, JobAdvertSkill, Skill, User
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class AdvertListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(
+            username='employer', password='x' * 10, user_type='employer', company_name='Acme'
+        )
+        cls.skills = [Skill.objects.create(name=name) for name in ('Python', 'SQL')]
+        cls.category = Category.objects.create(name='Engineering')
+
+    def add_adverts(self, count):
+        for i in range(count):
+            advert = JobAdvert.objects.create(
+                employer=self.employer, title=f'Advert {i}', description='Long text', requirements='More text',
+                location='Remote',
+            )
+            for skill in self.skills:
+                JobAdvertSkill.objects.create(job_advert=advert, skill=skill)
+            JobAdvertCategory.objects.create(job_advert=advert, category=self.category)
+
+    def list_queries(self, **params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/adverts/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results'], len(queries)
+
+    def test_summary_leaves_out_the_long_text(self):
+        self.add_adverts(1)
+        (advert,), _queries = self.list_queries()
+        self.assertNotIn('description', advert)
+        self.assertNotIn('requirements', advert)
+        self.assertEqual(advert['employer'], {'id': self.employer.pk, 'username': 'employer', 'company_name': 'Acme'})
+        self.assertEqual([skill['name'] for skill in advert['skills']], ['Python', 'SQL'])
+        self.assertEqual(advert['categories'], [{'category_id': self.category.pk, 'name': 'Engineering'}])
+
+    def test_queries_do_not_grow_with_the_page(self):
+        self.add_adverts(2)
+        _results, few = self.list_queries(page_size=10)
+        self.add_adverts(8)
+        results, many = self.list_queries(page_size=10)
+        self.assertEqual(len(results), 10)
+        self.assertEqual(many, few)
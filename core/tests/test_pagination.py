@@ -0,0 +1,81 @@
+from decimal import Decimal
+from urllib.parse import parse_qs, urlparse
+
+from django.test import TestCase  # type: ignore
+from rest_framework.exceptions import NotFound  # type: ignore
+from rest_framework.request import Request  # type: ignore
+from rest_framework.test import APIRequestFactory  # type: ignore
+
+from core.models import JobAdvert, User
+from core.pagination import KeysetCursorPagination
+
+SALARIES = (None, 50000, 50000, None, 60000, 50000, None, 70000, 60000, 50000, None, 80000, 50000)
+
+
+class KeysetCursorPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+        JobAdvert.objects.bulk_create([
+            JobAdvert(
+                employer=employer, title=f'Advert {i}', description='-', requirements='-', location='Remote',
+                salary_min=None if salary is None else Decimal(salary),
+            )
+            for i, salary in enumerate(SALARIES)
+        ])
+        cls.adverts = list(JobAdvert.objects.values_list('id', 'salary_min'))
+
+    def expected(self, descending):
+        # NULL sorts as the largest value; id breaks ties in the same direction
+        def key(row):
+            advert_id, salary = row
+            return (salary is None, salary or 0, advert_id)
+        return [advert_id for advert_id, _ in sorted(self.adverts, key=key, reverse=descending)]
+
+    def paginate(self, ordering, url):
+        query = parse_qs(urlparse(url).query)
+        request = Request(APIRequestFactory().get('/adverts/', {name: values[0] for name, values in query.items()}))
+        paginator = KeysetCursorPagination()
+        page = paginator.paginate_queryset(JobAdvert.objects.order_by(ordering), request)
+        return [advert.id for advert in page], paginator.get_next_link(), paginator.get_previous_link()
+
+    def walk(self, ordering):
+        """Return the pages going forwards, and going back from the last one."""
+        forwards, links = [], []
+        url = '/adverts/?page_size=3'
+        while url:
+            ids, url, previous = self.paginate(ordering, url)
+            forwards.append(ids)
+            links.append(previous)
+        backwards = []
+        url = links[-1]
+        while url:
+            ids, _next, url = self.paginate(ordering, url)
+            backwards.insert(0, ids)
+        return forwards, backwards
+
+    def test_ties_and_nulls_ascending(self):
+        forwards, backwards = self.walk('salary_min')
+        self.assertEqual(sum(forwards, []), self.expected(descending=False))
+        self.assertEqual(backwards, forwards[:-1])
+        self.assertTrue(all(len(page) == 3 for page in forwards[:-1]))
+
+    def test_ties_and_nulls_descending(self):
+        forwards, backwards = self.walk('-salary_min')
+        self.assertEqual(sum(forwards, []), self.expected(descending=True))
+        self.assertEqual(backwards, forwards[:-1])
+
+    def test_first_page_has_no_previous_link(self):
+        _ids, next_link, previous_link = self.paginate('salary_min', '/adverts/?page_size=3')
+        self.assertIsNotNone(next_link)
+        self.assertIsNone(previous_link)
+
+    def test_cursor_for_another_ordering_is_rejected(self):
+        _ids, next_link, _previous = self.paginate('salary_min', '/adverts/?page_size=3')
+        with self.assertRaises(NotFound):
+            self.paginate('-salary_min', next_link)
+
+    def test_garbage_cursor_is_rejected(self):
+        with self.assertRaises(NotFound):
+            self.paginate('salary_min', '/adverts/?cursor=not-a-cursor')
@@ -0,0 +1,33 @@
+from io import StringIO
+
+from django.core.management import call_command  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+
+from core.models import JobAdvert, JobApplication, User
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ExplainQueriesTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+        seeker = User.objects.create_user(username='seeker', password='x' * 10, user_type='job_seeker')
+        adverts = [
+            JobAdvert.objects.create(
+                employer=employer, title=f'Python developer {i}', description='-', requirements='-',
+                location='Remote', salary_min=50000 + i * 1000,
+            )
+            for i in range(5)
+        ]
+        JobApplication.objects.create(
+            job_seeker=seeker, job_advert=adverts[0], cover_letter='-', resume='application_resumes/cv.pdf'
+        )
+
+    def test_listing_queries_use_indexes(self):
+        out = StringIO()
+        call_command('explain_queries', '--strict', stdout=out)
+        output = out.getvalue()
+        self.assertIn('All query plans use indexes', output)
+        self.assertIn('advert list ordered by salary desc', output)
+        self.assertIn('seeker applications by status', output)
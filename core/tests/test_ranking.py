@@ -0,0 +1,117 @@
+from unittest.mock import patch
+
+from django.core.cache import cache  # type: ignore
+from django.db import transaction  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+
+from core import tasks
+from core.models import JobAdvert, JobAdvertSkill, JobApplication, Skill, User, UserSkill
+from core.ranking import _rescore_key, extract_skill_ids, match_score, skill_matcher
+
+
+class MatchScoreTests(TestCase):
+
+    def test_score_is_the_covered_share_of_the_required_weight(self):
+        self.assertEqual(match_score({1: 4, 2: 1}, {1: 5}), 0.8)
+        self.assertEqual(match_score({1: 4, 2: 1}, {1: 5, 2: 5}), 1.0)
+        self.assertEqual(match_score({1: 5}, {1: 2}), 0.4)
+        self.assertEqual(match_score({1: 5}, {2: 5}), 0.0)
+
+    def test_an_advert_without_requirements_scores_zero(self):
+        self.assertEqual(match_score({}, {1: 5}), 0.0)
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class ApplicantRankingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+        cls.other_employer = User.objects.create_user(username='other', password='x' * 10, user_type='employer')
+        cls.strong, cls.weak = (
+            User.objects.create_user(username=name, password='x' * 10, user_type='job_seeker')
+            for name in ('strong', 'weak')
+        )
+        cls.python, cls.sql = (Skill.objects.create(name=name) for name in ('Python', 'SQL'))
+        cls.advert = JobAdvert.objects.create(
+            employer=cls.employer, title='Backend', description='-', requirements='-', location='Remote'
+        )
+        for skill in (cls.python, cls.sql):
+            JobAdvertSkill.objects.create(job_advert=cls.advert, skill=skill, importance_level=5)
+        UserSkill.objects.create(user=cls.strong, skill=cls.python, proficiency_level=5)
+
+    def setUp(self):
+        cache.clear()
+        # Run the Celery tasks inline instead of reaching for a broker
+        for task in (tasks.score_application_task, tasks.score_advert_applications_task):
+            patcher = patch.object(task, 'delay', side_effect=task)
+            self.addCleanup(patcher.stop)
+            setattr(self, task.__name__, patcher.start())
+
+    def apply(self, seeker, cover_letter='-'):
+        with self.captureOnCommitCallbacks(execute=True):
+            application = JobApplication.objects.create(
+                job_seeker=seeker, job_advert=self.advert, cover_letter=cover_letter,
+                resume='application_resumes/cv.pdf'
+            )
+        application.refresh_from_db()
+        return application
+
+    def test_new_applications_are_scored_from_profile_and_cover_letter(self):
+        self.assertEqual(self.apply(self.strong).match_score, 0.5)
+        # SQL is only mentioned, so it counts MENTIONED_LEVEL of its weight
+        self.assertEqual(self.apply(self.weak, 'I write SQL every day').match_score, 0.2)
+
+    def test_skill_changes_rescore_the_advert_applicants(self):
+        application = self.apply(self.strong)
+        with self.captureOnCommitCallbacks(execute=True):
+            JobAdvertSkill.objects.filter(job_advert=self.advert, skill=self.sql).delete()
+        application.refresh_from_db()
+        self.assertEqual(application.match_score, 1.0)
+
+    def test_rescoring_is_debounced_while_queued(self):
+        self.score_advert_applications_task.side_effect = None
+        with self.captureOnCommitCallbacks(execute=True):
+            for link in JobAdvertSkill.objects.filter(job_advert=self.advert):
+                link.importance_level = 3
+                link.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            JobAdvertSkill.objects.filter(job_advert=self.advert, skill=self.sql).delete()
+        self.score_advert_applications_task.assert_called_once_with(self.advert.pk)
+
+    def test_a_rolled_back_skill_change_does_not_hold_off_the_next_one(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    JobAdvertSkill.objects.filter(job_advert=self.advert, skill=self.sql).delete()
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+        self.assertIsNone(cache.get(_rescore_key(self.advert.pk)))
+        with self.captureOnCommitCallbacks(execute=True):
+            JobAdvertSkill.objects.filter(job_advert=self.advert, skill=self.sql).delete()
+        self.score_advert_applications_task.assert_called_once_with(self.advert.pk)
+
+    def test_renamed_skills_are_matched_by_their_new_name(self):
+        self.assertEqual(extract_skill_ids(skill_matcher(), 'PostgreSQL and SQL'), {self.sql.pk})
+        self.sql.name = 'PostgreSQL'
+        self.sql.save()
+        self.assertEqual(extract_skill_ids(skill_matcher(), 'Just SQL'), set())
+        self.assertEqual(extract_skill_ids(skill_matcher(), 'PostgreSQL'), {self.sql.pk})
+
+    def test_employers_see_their_applicants_best_match_first(self):
+        weak = self.apply(self.weak)
+        strong = self.apply(self.strong)
+        client = APIClient()
+        client.force_authenticate(self.employer)
+        response = client.get(f'/api/adverts/{self.advert.pk}/applications/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row['id'], row['match_score']) for row in response.json()['results']],
+            [(strong.pk, 0.5), (weak.pk, 0.0)],
+        )
+        client.force_authenticate(self.other_employer)
+        self.assertEqual(client.get(f'/api/adverts/{self.advert.pk}/applications/').status_code, 404)
@@ -0,0 +1,128 @@
+from unittest.mock import patch
+
+from django.core.cache import cache  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+
+from core import recommendations
+from core.models import JobAdvert, JobAdvertSkill, JobApplication, Skill, User, UserSkill
+from core.recommendations import CHANGE_WRITE_GRACE, SkillMatrix, _change_key, _sequence_key
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class RecommendationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+        cls.seeker = User.objects.create_user(username='seeker', password='x' * 10, user_type='job_seeker')
+        cls.python, cls.sql, cls.figma = (Skill.objects.create(name=name) for name in ('Python', 'SQL', 'Figma'))
+        cls.backend = cls.advert({cls.python: 5})
+        cls.data = cls.advert({cls.python: 3, cls.sql: 3})
+        cls.design = cls.advert({cls.figma: 5})
+        cls.closed = cls.advert({cls.python: 5}, is_active=False)
+        UserSkill.objects.create(user=cls.seeker, skill=cls.python, proficiency_level=5)
+
+    @classmethod
+    def advert(cls, skills, **fields):
+        advert = JobAdvert.objects.create(
+            employer=cls.employer, title='Advert', description='-', requirements='-', location='Remote', **fields
+        )
+        for skill, level in skills.items():
+            JobAdvertSkill.objects.create(job_advert=advert, skill=skill, importance_level=level)
+        return advert
+
+    def setUp(self):
+        cache.clear()
+        self.matrix = SkillMatrix()
+        patcher = patch.object(recommendations, 'skill_matrix', self.matrix)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.client = APIClient()
+        self.client.force_authenticate(self.seeker)
+
+    def recommended(self, **params):
+        response = self.client.get('/api/adverts/recommended/', params)
+        self.assertEqual(response.status_code, 200)
+        return [(advert['id'], advert['match_score']) for advert in response.json()['results']]
+
+    def test_adverts_are_ranked_by_cosine_similarity(self):
+        self.assertEqual(self.recommended(), [(self.backend.pk, 1.0), (self.data.pk, 0.7071)])
+        self.assertEqual(self.recommended(limit=1), [(self.backend.pk, 1.0)])
+
+    def test_applied_adverts_are_left_out(self):
+        JobApplication.objects.create(
+            job_seeker=self.seeker, job_advert=self.backend, cover_letter='-', resume='application_resumes/cv.pdf'
+        )
+        self.assertEqual(self.recommended(), [(self.data.pk, 0.7071)])
+
+    def test_changes_reach_a_loaded_matrix(self):
+        self.recommended()
+        with self.captureOnCommitCallbacks(execute=True):
+            JobAdvertSkill.objects.create(job_advert=self.design, skill=self.python, importance_level=5)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.data.is_active = False
+            self.data.save()
+        self.assertEqual(self.recommended(), [(self.backend.pk, 1.0), (self.design.pk, 0.7071)])
+        # Patched in place rather than rebuilt
+        self.assertEqual(self.matrix.replaced, 2)
+
+    def test_only_job_seekers_get_recommendations(self):
+        self.client.force_authenticate(self.employer)
+        self.assertEqual(self.client.get('/api/adverts/recommended/').status_code, 403)
+
+    def test_invalid_limit(self):
+        for limit in ('0', 'ten'):
+            self.assertEqual(self.client.get('/api/adverts/recommended/', {'limit': limit}).status_code, 400)
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class ChangeLogTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.matrix = SkillMatrix()
+        self.matrix.sync()
+        self.loads = patch.object(self.matrix, 'load', wraps=self.matrix.load).start()
+        self.addCleanup(patch.stopall)
+
+    def publish(self, *advert_ids, missing=()):
+        """Number ``advert_ids`` as the change log does, leaving out the ``missing`` positions."""
+        cache.add(_sequence_key(), 0, timeout=None)
+        last = cache.incr(_sequence_key(), len(advert_ids))
+        first = last - len(advert_ids) + 1
+        for i, advert_id in enumerate(advert_ids):
+            if i not in missing:
+                cache.set(_change_key(first + i), advert_id)
+
+    def test_applies_published_changes(self):
+        self.publish(1, 2)
+        with patch.object(self.matrix, 'update') as update:
+            self.matrix.sync()
+        update.assert_called_once_with({1, 2})
+        self.assertEqual(self.matrix.sequence, 2)
+        self.loads.assert_not_called()
+
+    def test_waits_for_an_entry_still_being_written(self):
+        self.publish(1, 2, 3, missing=(1,))
+        with patch.object(self.matrix, 'update') as update:
+            self.matrix.sync()
+            update.assert_called_once_with({1})
+            self.assertEqual(self.matrix.sequence, 1)
+            cache.set(_change_key(2), 2)
+            self.matrix.sync()
+        update.assert_called_with({2, 3})
+        self.assertEqual(self.matrix.sequence, 3)
+        self.loads.assert_not_called()
+
+    def test_rebuilds_once_a_gap_outlives_the_grace_period(self):
+        self.publish(1, missing=(0,))
+        with patch.object(recommendations.time, 'monotonic', return_value=1000.0):
+            self.matrix.sync()
+        self.loads.assert_not_called()
+        with patch.object(recommendations.time, 'monotonic', return_value=1000.0 + CHANGE_WRITE_GRACE):
+            self.matrix.sync()
+        self.loads.assert_called_once()
+        self.assertEqual(self.matrix.sequence, 1)
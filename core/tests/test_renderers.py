@@ -0,0 +1,83 @@
+import datetime
+import json
+from decimal import Decimal
+
+import msgpack  # type: ignore
+from django.core.cache import cache  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from rest_framework.renderers import JSONRenderer  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+
+from core.models import JobAdvert, User
+from core.renderers import ORJSONRenderer
+
+
+class ORJSONRendererTests(TestCase):
+
+    def test_output_matches_the_stock_renderer(self):
+        data = {
+            'id': 1, 'title': 'Backend', 'salary': Decimal('1000.50'), 'tags': ['a', 'b'], 'missing': None,
+            'created_at': datetime.datetime(2024, 1, 2, 3, 4, 5, 123456, tzinfo=datetime.timezone.utc),
+            'deadline': datetime.date(2024, 2, 1),
+        }
+        self.assertEqual(json.loads(ORJSONRenderer().render(data)), json.loads(JSONRenderer().render(data)))
+
+    def test_none_renders_an_empty_body(self):
+        self.assertEqual(ORJSONRenderer().render(None), b'')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class MessagePackTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+        cls.advert = JobAdvert.objects.create(
+            employer=cls.employer, title='Backend', description='-', requirements='-', location='Remote',
+            salary_min=Decimal('1000.00'),
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+
+    def test_msgpack_responses_carry_the_json_data(self):
+        url = f'/api/adverts/{self.advert.pk}/'
+        as_json = self.client.get(url).json()
+        response = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/msgpack')
+        as_msgpack = msgpack.unpackb(response.content, raw=False)
+        # views_count moves with every request
+        as_json.pop('views_count'), as_msgpack.pop('views_count')
+        self.assertEqual(as_msgpack, as_json)
+        self.assertEqual(self.client.get(url, {'format': 'msgpack'})['Content-Type'], 'application/msgpack')
+
+    def test_msgpack_requests_are_parsed(self):
+        body = {'username': 'employer', 'password': 'x' * 10}
+        response = self.client.post(
+            '/api/auth/login/', msgpack.packb(body), content_type='application/msgpack',
+            HTTP_ACCEPT='application/msgpack',
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(msgpack.unpackb(response.content, raw=False)['user']['id'], self.employer.pk)
+
+    def test_malformed_bodies_are_rejected(self):
+        for content_type, body in (('application/json', b'{"username": NaN}'), ('application/msgpack', b'\xc1')):
+            with self.subTest(content_type=content_type):
+                response = self.client.post('/api/auth/login/', body, content_type=content_type)
+                self.assertEqual(response.status_code, 400)
+
+    def test_each_format_has_its_own_etag(self):
+        for url in ('/api/adverts/', f'/api/adverts/{self.advert.pk}/', '/api/skills/'):
+            with self.subTest(url=url):
+                as_json = self.client.get(url)
+                as_msgpack = self.client.get(url, HTTP_ACCEPT='application/msgpack')
+                self.assertNotEqual(as_json['ETag'], as_msgpack['ETag'])
+                self.assertIn('Accept', as_json['Vary'])
+                self.assertEqual(
+                    self.client.get(url, HTTP_ACCEPT='application/msgpack', HTTP_IF_NONE_MATCH=as_json['ETag'])
+                    .status_code, 200,
+                )
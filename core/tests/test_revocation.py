@@ -0,0 +1,91 @@
+from unittest.mock import patch
+
+import fakeredis  # type: ignore
+from django.test import SimpleTestCase, TestCase, override_settings  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+from rest_framework_simplejwt.exceptions import TokenError  # type: ignore
+
+from core import revocation
+from core.models import User
+from core.revocation import BloomFilter, LocalRevocations, RevocableAccessToken, RevocableRefreshToken
+
+
+class BloomFilterTests(SimpleTestCase):
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(1000)
+        items = [f'jti-{i}' for i in range(1000)]
+        for item in items:
+            bloom.add(item)
+        self.assertTrue(all(item in bloom for item in items))
+
+    def test_false_positive_rate_at_capacity(self):
+        bloom = BloomFilter(1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(f'jti-{i}')
+        false_positives = sum(f'other-{i}' in bloom for i in range(10000))
+        self.assertLess(false_positives / 10000, 0.03)
+
+    def test_empty_filter_contains_nothing(self):
+        self.assertNotIn('jti', BloomFilter(10))
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False,
+)
+class RevocableTokenTests(TestCase):
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis()
+        for target, value in (('get_redis', lambda: self.redis), ('local_revocations', LocalRevocations())):
+            patcher = patch.object(revocation, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.user = User.objects.create_user(username='seeker', password='x' * 10, user_type='job_seeker')
+        self.client = APIClient()
+
+    def authenticate(self, access):
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+
+    def test_revoked_access_token_is_refused(self):
+        access = RevocableAccessToken.for_user(self.user)
+        RevocableAccessToken(str(access))
+        access.revoke()
+        with self.assertRaises(TokenError):
+            RevocableAccessToken(str(access))
+
+    def test_revocation_reaches_other_processes_on_reload(self):
+        access = RevocableAccessToken.for_user(self.user)
+        # Another process, whose filter was loaded before the revocation
+        other = LocalRevocations()
+        other.current()
+        access.revoke()
+        jti = access['jti']
+        self.assertNotIn(jti, other.current())
+        other.reload()
+        self.assertIn(jti, other.current())
+
+    def test_rotated_refresh_token_is_refused(self):
+        refresh = RevocableRefreshToken.for_user(self.user)
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 200)
+        rotated = response.data['refresh']
+        self.assertNotEqual(rotated, str(refresh))
+
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 401)
+        # The replacement still works
+        response = self.client.post('/api/auth/token/refresh/', {'refresh': rotated})
+        self.assertEqual(response.status_code, 200)
+
+    def test_logout_revokes_both_tokens(self):
+        refresh = RevocableRefreshToken.for_user(self.user)
+        access = refresh.access_token
+        self.authenticate(access)
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, 200)
+
+        response = self.client.post('/api/auth/logout/', {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 205)
+        self.assertEqual(self.client.get('/api/auth/profile/').status_code, 401)
+        response = APIClient().post('/api/auth/token/refresh/', {'refresh': str(refresh)})
+        self.assertEqual(response.status_code, 401)
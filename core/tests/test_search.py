@@ -0,0 +1,70 @@
+from django.test import SimpleTestCase, TestCase, override_settings  # type: ignore
+
+from core.models import JobAdvert, User
+from core.search import parse_search_terms, to_fts5_query, to_tsquery
+
+
+class SearchTermTests(SimpleTestCase):
+
+    def test_parse_search_terms(self):
+        self.assertEqual(parse_search_terms('"Senior Python" djan* remote'), [
+            (['Senior', 'Python'], False), (['djan'], True), (['remote'], False),
+        ])
+        self.assertEqual(parse_search_terms('"" * c++'), [(['c'], False)])
+        self.assertEqual(parse_search_terms(None), [])
+
+    def test_queries(self):
+        groups = parse_search_terms('"senior python" djan* remote')
+        self.assertEqual(to_tsquery(groups), '(senior <-> python) & djan:* & remote')
+        self.assertEqual(to_fts5_query(groups), '"senior python" AND "djan"* AND "remote"')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class AdvertSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+
+        def advert(title, requirements='-', description='-', location='Remote', **kwargs):
+            return JobAdvert.objects.create(
+                employer=employer, title=title, requirements=requirements, description=description,
+                location=location, **kwargs
+            )
+
+        cls.title = advert('Python Developer')
+        cls.description = advert('Backend Engineer', description='We mostly write Python and some Go.')
+        cls.phrase = advert('Senior Python Engineer', requirements='Django')
+        cls.other = advert('Designer', description='Figma and Sketch')
+        cls.closed = advert('Python Contractor', is_active=False)
+
+    def search(self, **params):
+        response = self.client.get('/api/adverts/', params)
+        self.assertEqual(response.status_code, 200)
+        return [advert['id'] for advert in response.json()['results']]
+
+    def test_matches_every_term(self):
+        self.assertCountEqual(self.search(search='python'), [self.title.pk, self.description.pk, self.phrase.pk])
+        self.assertEqual(self.search(search='python django'), [self.phrase.pk])
+
+    def test_phrases_and_prefixes(self):
+        self.assertEqual(self.search(search='"senior python"'), [self.phrase.pk])
+        self.assertEqual(self.search(search='"python senior"'), [])
+        self.assertEqual(self.search(search='fig*'), [self.other.pk])
+        self.assertEqual(self.search(search='fig'), [])
+
+    def test_relevance_ranks_title_matches_first(self):
+        ids = self.search(search='python', ordering='relevance')
+        self.assertEqual(ids[-1], self.description.pk)
+
+    def test_edits_are_searchable(self):
+        self.other.title = 'Product Designer, Python tooling'
+        self.other.save()
+        self.assertIn(self.other.pk, self.search(search='tooling'))
+        self.other.delete()
+        self.assertEqual(self.search(search='designer'), [])
+
+    def test_relevance_without_a_search_keeps_the_default_ordering(self):
+        self.assertEqual(self.search(ordering='relevance')[0], self.other.pk)
@@ -0,0 +1,47 @@
+from io import StringIO
+
+from django.core.management import call_command  # type: ignore
+from django.core.management.base import CommandError  # type: ignore
+from django.test import SimpleTestCase, TestCase, override_settings  # type: ignore
+
+from core.counters import reconcile_application_counts
+from core.management.synthetic import USERNAME_PREFIX, copy_value
+from core.models import JobAdvert, JobApplication, User
+
+
+class CopyValueTests(SimpleTestCase):
+
+    def test_copy_value(self):
+        self.assertEqual(copy_value(None), '')
+        self.assertEqual(copy_value(''), '""')
+        self.assertEqual(copy_value('Say "hi", then\nleave'), '"Say ""hi"", then\nleave"')
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    # The sample users are created one by one; skip the slow default hasher
+    PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'],
+)
+class SeedDataTests(TestCase):
+
+    def seed(self, *args):
+        call_command('seed_data', *args, stdout=StringIO())
+
+    def test_scale_generates_proportional_data(self):
+        self.seed('--scale', '0.02', '--chunk-size', '7')
+        synthetic = f'{USERNAME_PREFIX}_'
+        self.assertEqual(User.objects.filter(username__startswith=synthetic).count(), 20)
+        self.assertEqual(User.objects.filter(username__startswith=f'{synthetic}employer_').count(), 2)
+        self.assertEqual(JobAdvert.objects.filter(employer__username__startswith=synthetic).count(), 100)
+        self.assertEqual(JobApplication.objects.filter(job_seeker__username__startswith=synthetic).count(), 200)
+        # Bulk inserts skip the signals, so the counters were rebuilt
+        self.assertEqual(reconcile_application_counts(), 0)
+
+        with self.assertRaises(CommandError):
+            self.seed('--scale', '0.02')
+
+    def test_invalid_options(self):
+        with self.assertRaises(CommandError):
+            self.seed('--scale', '-1')
+        with self.assertRaises(CommandError):
+            self.seed('--chunk-size', '0')
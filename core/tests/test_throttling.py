@@ -0,0 +1,131 @@
+from unittest.mock import patch
+
+import fakeredis  # type: ignore
+from django.conf import settings  # type: ignore
+from django.test import SimpleTestCase, override_settings  # type: ignore
+from rest_framework.permissions import AllowAny  # type: ignore
+from rest_framework.response import Response  # type: ignore
+from rest_framework.test import APIRequestFactory, force_authenticate  # type: ignore
+from rest_framework.views import APIView  # type: ignore
+
+from core import throttling
+from core.models import User
+from core.throttling import ApplyThrottle, LoginThrottle, parse_rate
+
+
+def rates(**scoped):
+    return {**settings.REST_FRAMEWORK, 'DEFAULT_THROTTLE_RATES': {
+        name.replace('_', '.'): rate for name, rate in scoped.items()
+    }}
+
+
+class ParseRateTests(SimpleTestCase):
+
+    def test_rates(self):
+        self.assertEqual(parse_rate('10/min'), (10, 10 / 60))
+        self.assertEqual(parse_rate('5/15m'), (5, 5 / 900))
+        self.assertEqual(parse_rate('100/hour'), (100, 100 / 3600))
+        self.assertEqual(parse_rate('3/s'), (3, 3))
+        self.assertEqual(parse_rate(' 1/day '), (1, 1 / 86400))
+
+    def test_invalid_rates(self):
+        for rate in ('10', 'x/min', '10/15', '10/week', '/min'):
+            with self.subTest(rate=rate), self.assertRaises(ValueError):
+                parse_rate(rate)
+
+
+class ThrottledView(APIView):
+    permission_classes = [AllowAny]
+    throttle_classes = [ApplyThrottle]
+
+    def get(self, request):
+        return Response()
+
+    def post(self, request):
+        return Response(status=201)
+
+
+class LoginView(ThrottledView):
+    throttle_classes = [LoginThrottle]
+
+
+class TokenBucketThrottleTests(SimpleTestCase):
+
+    def setUp(self):
+        # A server of its own: FakeRedis() instances share one by default
+        redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        patcher = patch.object(throttling, 'get_redis', lambda: redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # The registered script is bound to a client
+        throttling._script.cache_clear()
+        self.addCleanup(throttling._script.cache_clear)
+        self.factory = APIRequestFactory()
+
+    def request(self, method='post', ip='10.0.0.1', user_id=None, view=ThrottledView, headers=None, **data):
+        request = getattr(self.factory, method)('/throttled/', data, REMOTE_ADDR=ip, **(headers or {}))
+        if user_id is not None:
+            force_authenticate(request, user=User(pk=user_id, username=f'user{user_id}'))
+        return view.as_view()(request)
+
+    def statuses(self, count, **kwargs):
+        return [self.request(**kwargs).status_code for _ in range(count)]
+
+    @override_settings(REST_FRAMEWORK=rates(apply_ip='3/min'))
+    def test_allows_the_burst_then_rejects_with_retry_after(self):
+        self.assertEqual(self.statuses(3), [201, 201, 201])
+        response = self.request()
+        self.assertEqual(response.status_code, 429)
+        # One token refills every 20 seconds
+        self.assertIn(int(response['Retry-After']), range(1, 21))
+
+    @override_settings(REST_FRAMEWORK=rates(apply_ip='1/min'))
+    def test_identities_have_their_own_buckets(self):
+        self.assertEqual(self.statuses(2, ip='10.0.0.1'), [201, 429])
+        self.assertEqual(self.statuses(1, ip='10.0.0.2'), [201])
+
+    @override_settings(REST_FRAMEWORK=rates(apply_ip='2/min'))
+    def test_spoofed_forwarded_for_headers_share_the_client_ip_bucket(self):
+        statuses = [
+            self.request(headers={'HTTP_X_FORWARDED_FOR': f'192.0.2.{i}'}).status_code for i in range(3)
+        ]
+        self.assertEqual(statuses, [201, 201, 429])
+        self.assertEqual(self.request().status_code, 429)
+
+    @override_settings(REST_FRAMEWORK={**rates(apply_ip='1/min'), 'NUM_PROXIES': 1})
+    def test_forwarded_for_is_trusted_through_the_configured_proxies(self):
+        statuses = [
+            self.request(headers={'HTTP_X_FORWARDED_FOR': f'192.0.2.{i}'}).status_code for i in (1, 2, 1)
+        ]
+        self.assertEqual(statuses, [201, 201, 429])
+
+    @override_settings(REST_FRAMEWORK=rates(apply_ip='1/min'))
+    def test_safe_methods_are_not_throttled(self):
+        self.assertEqual(self.statuses(3, method='get'), [200, 200, 200])
+
+    @override_settings(REST_FRAMEWORK=rates(apply_ip='5/min', apply_user='3/min'))
+    def test_rejected_requests_do_not_drain_other_buckets(self):
+        self.assertEqual(self.statuses(5, user_id=1), [201, 201, 201, 429, 429])
+        # Only the three accepted requests came out of the shared IP bucket
+        self.assertEqual(self.statuses(3, user_id=2), [201, 201, 429])
+
+    @override_settings(REST_FRAMEWORK=rates(login_user='2/min'))
+    def test_login_attempts_are_counted_per_username_across_ips(self):
+        statuses = [
+            self.request(ip=f'10.0.0.{i}', view=LoginView, username='Alice').status_code for i in range(3)
+        ]
+        self.assertEqual(statuses, [201, 201, 429])
+        self.assertEqual(self.request(view=LoginView, username='bob').status_code, 201)
+        self.assertEqual(self.request(view=LoginView, username='ALICE').status_code, 429)
+
+    @override_settings(REST_FRAMEWORK=rates())
+    def test_scopes_without_a_rate_are_not_checked(self):
+        self.assertEqual(self.statuses(3), [201, 201, 201])
+
+    @override_settings(REST_FRAMEWORK=rates(apply_ip='1/min'))
+    def test_fails_open_without_redis(self):
+        def unavailable():
+            raise ConnectionError('Redis is down')
+
+        with patch.object(throttling, 'get_redis', unavailable), self.assertLogs('core.throttling', 'WARNING'):
+            self.assertEqual(self.statuses(3), [201, 201, 201])
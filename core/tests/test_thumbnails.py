@@ -0,0 +1,146 @@
+import tempfile
+from io import BytesIO, StringIO
+from unittest.mock import patch
+
+from django.core.cache import cache  # type: ignore
+from django.core.files.base import ContentFile  # type: ignore
+from django.core.files.storage import default_storage  # type: ignore
+from django.core.files.uploadedfile import SimpleUploadedFile  # type: ignore
+from django.core.management import call_command  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from PIL import Image  # type: ignore
+from rest_framework.test import APIClient  # type: ignore
+
+from core import tasks
+from core.models import JobAdvert, JobApplication, User
+from core.thumbnails import RENDITION_SIZES, render_profile_picture, render_renditions
+
+
+def picture(size=(800, 600), color='navy', format='PNG'):
+    buffer = BytesIO()
+    Image.new('RGB', size, color).save(buffer, format)
+    return buffer.getvalue()
+
+
+def open_image(content):
+    return Image.open(BytesIO(content))
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False,
+    MEDIA_SENDFILE='',
+)
+class ProfilePictureRenditionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.employer, cls.other_employer = (
+            User.objects.create_user(username=name, password='x' * 10, user_type='employer')
+            for name in ('employer', 'other_employer')
+        )
+        cls.seeker = User.objects.create_user(username='seeker', password='x' * 10, user_type='job_seeker')
+        advert = JobAdvert.objects.create(
+            employer=cls.employer, title='Backend', description='-', requirements='-', location='Remote'
+        )
+        JobApplication.objects.create(
+            job_seeker=cls.seeker, job_advert=advert, cover_letter='-', resume='application_resumes/cv.pdf'
+        )
+
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        settings = override_settings(MEDIA_ROOT=media.name)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        # Render inline instead of reaching for a broker
+        patcher = patch.object(
+            tasks.render_profile_picture_task, 'delay', side_effect=tasks.render_profile_picture_task
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        cache.clear()
+        self.client = APIClient()
+
+    def upload(self, content):
+        # As authentication would, load the user from the database
+        self.client.force_authenticate(User.objects.get(pk=self.seeker.pk))
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                '/api/auth/profile/', {'profile_picture': SimpleUploadedFile('me.png', content)}, format='multipart'
+            )
+        self.assertEqual(response.status_code, 200, response.content)
+        return User.objects.get(pk=self.seeker.pk)
+
+    def stored_names(self, user):
+        names = [name for formats in user.profile_picture_renditions.values() for name in formats.values()]
+        return [user.profile_picture.name] + names
+
+    def test_renditions_are_square_and_never_upscaled(self):
+        name = default_storage.save('profile_pictures/wide.png', ContentFile(picture((800, 600))))
+        renditions = render_renditions(name)
+        self.assertEqual(list(renditions), list(RENDITION_SIZES))
+        for label, size in RENDITION_SIZES.items():
+            for extension, format in (('webp', 'WEBP'), ('jpg', 'JPEG')):
+                with default_storage.open(renditions[label][extension]) as file:
+                    image = Image.open(file)
+                    self.assertEqual((image.format, image.size), (format, (size, size)))
+
+        name = default_storage.save('profile_pictures/tiny.png', ContentFile(picture((100, 40))))
+        with default_storage.open(render_renditions(name)['large']['jpg']) as file:
+            self.assertEqual(Image.open(file).size, (40, 40))
+
+    def test_uploads_are_rendered_and_served_by_size(self):
+        user = self.upload(picture())
+        self.assertEqual(set(user.profile_picture_renditions), set(RENDITION_SIZES))
+        self.client.force_authenticate(user)
+        response = self.client.get('/api/auth/profile/')
+        urls = response.json()['profile_picture_renditions']
+        self.assertEqual(
+            urls['small']['jpg'], f'http://testserver/api/users/{user.pk}/profile-picture/?size=small&image_format=jpg'
+        )
+
+        self.client.force_authenticate(self.employer)
+        response = self.client.get(urls['small']['jpg'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'image/jpeg')
+        self.assertEqual(open_image(b''.join(response.streaming_content)).size, (64, 64))
+        response = self.client.get(f'/api/users/{user.pk}/profile-picture/', {'size': 'medium'})
+        self.assertEqual(open_image(b''.join(response.streaming_content)).format, 'WEBP')
+
+        self.client.force_authenticate(self.other_employer)
+        self.assertEqual(self.client.get(urls['small']['jpg']).status_code, 404)
+
+    def test_bad_and_missing_sizes(self):
+        User.objects.filter(pk=self.seeker.pk).update(profile_picture='profile_pictures/me.png')
+        self.client.force_authenticate(self.seeker)
+        url = f'/api/users/{self.seeker.pk}/profile-picture/'
+        self.assertEqual(self.client.get(url, {'size': 'huge'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'size': 'small', 'image_format': 'gif'}).status_code, 400)
+        # Not rendered yet
+        self.assertEqual(self.client.get(url, {'size': 'small'}).status_code, 404)
+
+    def test_a_replaced_picture_is_deleted_with_its_renditions(self):
+        old = self.stored_names(self.upload(picture(color='navy')))
+        new = self.stored_names(self.upload(picture(color='teal')))
+        self.assertEqual(len(new), 1 + 2 * len(RENDITION_SIZES))
+        self.assertFalse(set(old) & set(new))
+        self.assertEqual([name for name in old if default_storage.exists(name)], [])
+        self.assertTrue(all(default_storage.exists(name) for name in new))
+
+    def test_a_deleted_user_takes_their_pictures_along(self):
+        names = self.stored_names(self.upload(picture()))
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.get(pk=self.seeker.pk).delete()
+        self.assertEqual([name for name in names if default_storage.exists(name)], [])
+
+    def test_a_picture_replaced_while_rendering_keeps_no_stale_renditions(self):
+        old = default_storage.save('profile_pictures/old.png', ContentFile(picture()))
+        User.objects.filter(pk=self.seeker.pk).update(profile_picture='profile_pictures/new.png')
+        self.assertFalse(render_profile_picture(self.seeker.pk, old))
+        self.assertEqual(User.objects.get(pk=self.seeker.pk).profile_picture_renditions, {})
+
+    def test_backfill_command(self):
+        name = default_storage.save('profile_pictures/old.png', ContentFile(picture()))
+        User.objects.filter(pk=self.seeker.pk).update(profile_picture=name)
+        call_command('render_profile_pictures', stdout=StringIO())
+        self.assertEqual(set(User.objects.get(pk=self.seeker.pk).profile_picture_renditions), set(RENDITION_SIZES))
@@ -0,0 +1,79 @@
+import shutil
+import tempfile
+from io import BytesIO
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings  # type: ignore
+from rest_framework.exceptions import ValidationError  # type: ignore
+
+from core.models import ChunkedUpload, User
+from core.uploads import create_staging_file, staging_path, write_chunk
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class WriteChunkTests(TestCase):
+
+    def setUp(self):
+        staging_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, staging_root, ignore_errors=True)
+        settings_override = override_settings(UPLOAD_STAGING_ROOT=staging_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.user = User.objects.create_user(username='seeker', password='x' * 10, user_type='job_seeker')
+        self.upload = ChunkedUpload.objects.create(user=self.user, purpose='resume', filename='cv.pdf', size=12)
+        create_staging_file(self.upload)
+
+    def write(self, offset, data, length=None):
+        return write_chunk(self.upload, offset, BytesIO(data), len(data) if length is None else length)
+
+    def staged(self):
+        with open(staging_path(self.upload), 'rb') as staged:
+            return staged.read()
+
+    def test_chunks_are_written_at_their_offsets(self):
+        self.assertEqual(self.write(0, b'%PDF-1'), 6)
+        self.assertEqual(self.write(6, b'.4 abc'), 12)
+        self.assertEqual(self.staged(), b'%PDF-1.4 abc')
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.offset, 12)
+
+    def test_stale_offset_is_refused(self):
+        self.write(0, b'%PDF-1')
+        # Another request already moved the upload on
+        ChunkedUpload.objects.filter(pk=self.upload.pk).update(offset=9)
+        self.assertIsNone(self.write(6, b'.4 abc'))
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.offset, 9)
+
+    def test_retried_chunk_after_acknowledgement_is_refused(self):
+        self.write(0, b'%PDF-1')
+        self.assertIsNone(self.write(0, b'%PDF-1'))
+
+    def test_signature_is_checked_on_the_first_chunk(self):
+        with self.assertRaises(ValidationError):
+            self.write(0, b'<html>oops</')
+        self.assertFalse(ChunkedUpload.objects.filter(pk=self.upload.pk).exists())
+
+    def test_signature_read_across_blocks(self):
+        with patch('core.uploads.STREAM_BLOCK_SIZE', 2):
+            self.assertEqual(self.write(0, b'%PDF-1.4 abc'), 12)
+
+    def test_bad_signature_read_across_blocks(self):
+        with patch('core.uploads.STREAM_BLOCK_SIZE', 2):
+            with self.assertRaises(ValidationError):
+                self.write(0, b'%PDX-1.4 abc')
+
+    def test_first_chunk_must_carry_the_whole_signature(self):
+        with self.assertRaises(ValidationError):
+            self.write(0, b'%PD')
+
+    def test_unchecked_types_skip_the_signature(self):
+        self.upload.filename = 'cv.txt'
+        self.assertEqual(self.write(0, b'plain text!!'), 12)
+
+    def test_short_body_is_refused(self):
+        with self.assertRaises(ValidationError):
+            self.write(0, b'%PDF', length=6)
+        self.upload.refresh_from_db()
+        self.assertEqual(self.upload.offset, 0)
@@ -0,0 +1,85 @@
+from unittest.mock import patch
+
+import fakeredis  # type: ignore
+from django.db import DatabaseError  # type: ignore
+from django.test import TestCase, override_settings  # type: ignore
+from redis.exceptions import ConnectionError  # type: ignore
+
+from core import counters
+from core.counters import FLUSH_LOCK_KEY, PENDING_VIEWS_KEY, flush_advert_views
+from core.models import JobAdvert, User
+
+
+@override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}, SECURE_SSL_REDIRECT=False
+)
+class AdvertViewCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        employer = User.objects.create_user(username='employer', password='x' * 10, user_type='employer')
+        cls.advert, cls.other = (
+            JobAdvert.objects.create(
+                employer=employer, title=title, description='-', requirements='-', location='Remote'
+            )
+            for title in ('Backend', 'Frontend')
+        )
+
+    def setUp(self):
+        self.redis = fakeredis.FakeRedis(server=fakeredis.FakeServer())
+        patcher = patch.object(counters, 'get_redis', return_value=self.redis)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def view(self, advert, times=1):
+        for _ in range(times):
+            response = self.client.get(f'/api/adverts/{advert.pk}/')
+            self.assertEqual(response.status_code, 200)
+        return response.json()['views_count']
+
+    def stored_views(self):
+        return dict(JobAdvert.objects.values_list('pk', 'views_count'))
+
+    def flushing_keys(self):
+        return list(self.redis.scan_iter(match=f'{PENDING_VIEWS_KEY}:flushing:*'))
+
+    def test_views_are_buffered_until_flushed(self):
+        self.assertEqual(self.view(self.advert, times=3), 3)
+        self.view(self.other)
+        self.assertEqual(self.stored_views(), {self.advert.pk: 0, self.other.pk: 0})
+
+        self.assertEqual(flush_advert_views(), 4)
+        self.assertEqual(self.stored_views(), {self.advert.pk: 3, self.other.pk: 1})
+        self.assertEqual(self.flushing_keys(), [])
+        self.assertEqual(flush_advert_views(), 0)
+        # Stored and buffered views add up
+        self.assertEqual(self.view(self.advert), 4)
+
+    def test_a_failed_flush_puts_its_views_back(self):
+        self.view(self.advert, times=2)
+        with patch.object(counters.transaction, 'atomic', side_effect=DatabaseError):
+            with self.assertRaises(DatabaseError):
+                flush_advert_views()
+        self.assertEqual(self.flushing_keys(), [])
+        self.assertEqual(flush_advert_views(), 2)
+        self.assertEqual(self.stored_views()[self.advert.pk], 2)
+
+    def test_views_left_by_a_dead_flush_are_flushed_next_time(self):
+        self.redis.hset(f'{PENDING_VIEWS_KEY}:flushing:dead', self.advert.pk, 5)
+        self.view(self.advert)
+        self.assertEqual(flush_advert_views(), 6)
+        self.assertEqual(self.stored_views()[self.advert.pk], 6)
+        self.assertEqual(self.flushing_keys(), [])
+
+    def test_one_flush_at_a_time(self):
+        self.view(self.advert)
+        lock = self.redis.lock(FLUSH_LOCK_KEY)
+        lock.acquire()
+        self.assertEqual(flush_advert_views(), 0)
+        lock.release()
+        self.assertEqual(flush_advert_views(), 1)
+
+    def test_views_are_written_through_without_redis(self):
+        with patch.object(counters, 'get_redis', side_effect=ConnectionError):
+            self.assertEqual(self.view(self.advert, times=2), 2)
+        self.assertEqual(self.stored_views()[self.advert.pk], 2)
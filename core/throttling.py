@@ -0,0 +1,156 @@
+"""
+Token-bucket throttles kept in Redis.
+
+Each throttled view checks one bucket per identity (client IP, signed-in
+user, or the username being tried at login). A bucket holds up to N tokens
+and refills at N per period, for rates written DRF style: ``'10/min'`` allows
+bursts of 10 and 10 more each minute, and ``'5/15m'`` 5 per quarter hour.
+Rates come from ``DEFAULT_THROTTLE_RATES`` under ``<scope>.<identity>``, and an
+identity without a rate isn't checked.
+
+All of a request's buckets are refilled, checked and drawn from by one Lua
+script, so a check costs one round trip. A request is only charged when
+every bucket has a token, which keeps rejected requests from draining the
+buckets they did pass. Rejections carry ``Retry-After``. Throttling is
+skipped, with a warning, while Redis is unavailable.
+"""
+
+import hashlib
+import logging
+import math
+import re
+from functools import lru_cache
+
+from rest_framework.permissions import SAFE_METHODS  # type: ignore
+from rest_framework.settings import api_settings  # type: ignore
+from rest_framework.throttling import BaseThrottle  # type: ignore
+
+from .counters import get_redis
+
+logger = logging.getLogger(__name__)
+
+THROTTLE_KEY_PREFIX = 'throttle'
+
+# KEYS: one hash per bucket. ARGV: capacity and refill rate (tokens per
+# second) for each key in turn. Returns {1, '0'} when the request may go
+# ahead, else {0, seconds until it could}; the wait is a string because
+# Redis truncates Lua numbers to integers.
+TOKEN_BUCKET_LUA = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local levels = {}
+local wait = 0
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    local bucket = redis.call('HMGET', key, 'tokens', 'at')
+    local tokens = tonumber(bucket[1]) or capacity
+    local at = tonumber(bucket[2]) or now
+    tokens = math.min(capacity, tokens + math.max(0, now - at) * rate)
+    levels[i] = tokens
+    if tokens < 1 then
+        wait = math.max(wait, (1 - tokens) / rate)
+    end
+end
+if wait > 0 then
+    return {0, tostring(wait)}
+end
+for i, key in ipairs(KEYS) do
+    local capacity = tonumber(ARGV[2 * i - 1])
+    local rate = tonumber(ARGV[2 * i])
+    redis.call('HSET', key, 'tokens', tostring(levels[i] - 1), 'at', tostring(now))
+    -- Gone once it would have refilled anyway
+    redis.call('PEXPIRE', key, math.ceil(capacity / rate * 1000))
+end
+return {1, '0'}
+"""
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+RATE_RE = re.compile(r'^(\d+)/(\d*)([smhd])[a-z]*$')
+
+
+@lru_cache(maxsize=None)
+def parse_rate(rate):
+    """Return ``(capacity, tokens per second)`` for a rate such as ``'10/min'``."""
+    match = RATE_RE.match(rate.strip())
+    if match is None:
+        raise ValueError(f'Invalid throttle rate {rate!r}')
+    count, multiplier, unit = match.groups()
+    capacity = int(count)
+    return capacity, capacity / (int(multiplier or 1) * PERIODS[unit])
+
+
+@lru_cache(maxsize=None)
+def _script():
+    return get_redis().register_script(TOKEN_BUCKET_LUA)
+
+
+def take(buckets):
+    """
+    Draw a token from each of ``buckets``, ``(key, rate)`` pairs, if all have
+    one. Return ``(allowed, seconds to wait)``.
+    """
+    keys, args = [], []
+    for key, rate in buckets:
+        keys.append(key)
+        args.extend(parse_rate(rate))
+    allowed, wait = _script()(keys=keys, args=args)
+    return bool(allowed), float(wait)
+
+
+class TokenBucketThrottle(BaseThrottle):
+    """Throttle unsafe requests to a view by the buckets of ``get_identities()``."""
+    scope = None
+
+    def get_identities(self, request, view):
+        """Map identity names (``ip``, ``user``...) to the value identifying this request."""
+        return {'ip': self.get_ident(request)}
+
+    def allow_request(self, request, view):
+        self.wait_time = None
+        if request.method in SAFE_METHODS:
+            return True
+        rates = api_settings.DEFAULT_THROTTLE_RATES
+        buckets = [
+            (f'{THROTTLE_KEY_PREFIX}:{self.scope}:{name}:{value}', rates[f'{self.scope}.{name}'])
+            for name, value in self.get_identities(request, view).items()
+            if value and rates.get(f'{self.scope}.{name}')
+        ]
+        if not buckets:
+            return True
+        try:
+            allowed, wait = take(buckets)
+        except Exception as e:
+            logger.warning('Could not check %s throttle: %s', self.scope, e)
+            return True
+        self.wait_time = math.ceil(wait) if not allowed else None
+        return allowed
+
+    def wait(self):
+        return self.wait_time
+
+
+class LoginThrottle(TokenBucketThrottle):
+    """Per client IP, and per account so spreading guesses over IPs doesn't help."""
+    scope = 'login'
+
+    def get_identities(self, request, view):
+        username = request.data.get('username') if hasattr(request.data, 'get') else None
+        identities = super().get_identities(request, view)
+        if isinstance(username, str) and username:
+            identities['user'] = hashlib.sha256(username.lower().encode()).hexdigest()[:32]
+        return identities
+
+
+class RegisterThrottle(TokenBucketThrottle):
+    scope = 'register'
+
+
+class ApplyThrottle(TokenBucketThrottle):
+    scope = 'apply'
+
+    def get_identities(self, request, view):
+        identities = super().get_identities(request, view)
+        if request.user.is_authenticated:
+            identities['user'] = request.user.pk
+        return identities
@@ -0,0 +1,147 @@
+"""
+Resized renditions of profile pictures.
+
+Avatars in advert and applicant lists only need a few hundred pixels, so
+after a picture is uploaded a Celery task crops it to a square and renders
+each size in ``RENDITION_SIZES`` as WebP and as JPEG (for clients without
+WebP). The stored names land in ``User.profile_picture_renditions`` as
+``{size: {format: name}}``; until then the field is empty and clients fall
+back to ``profile_picture``. A replaced or deleted picture is deleted along
+with its renditions.
+"""
+
+import logging
+import posixpath
+from io import BytesIO
+
+from django.core.files.base import ContentFile  # type: ignore
+from django.db import transaction  # type: ignore
+from PIL import Image, ImageOps, UnidentifiedImageError  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+# Square edge in pixels, largest first: each size is resized from the one before
+RENDITION_SIZES = {
+    'large': 512,
+    'medium': 256,
+    'small': 64,
+}
+RENDITION_FORMATS = (
+    ('webp', 'WEBP', {'quality': 80, 'method': 4}),
+    ('jpg', 'JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+)
+RENDITION_EXTENSIONS = tuple(extension for extension, _format, _options in RENDITION_FORMATS)
+
+
+def _storage():
+    from .models import User
+
+    return User._meta.get_field('profile_picture').storage
+
+
+def _open(name):
+    with _storage().open(name, 'rb') as file:
+        image = Image.open(file)
+        # JPEGs can decode straight at a fraction of their size
+        largest = max(RENDITION_SIZES.values())
+        image.draft('RGB', (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        has_alpha = image.mode in ('RGBA', 'LA', 'PA') or 'transparency' in image.info
+        return image.convert('RGBA' if has_alpha else 'RGB')
+
+
+def _encode(image, format, options):
+    if format == 'JPEG' and image.mode == 'RGBA':
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image, mask=image.getchannel('A'))
+        image = background
+    buffer = BytesIO()
+    image.save(buffer, format, **options)
+    return ContentFile(buffer.getvalue())
+
+
+def render_renditions(name):
+    """Render and store every rendition of the picture ``name``; return their names."""
+    image = _open(name)
+    width, height = image.size
+    side = min(width, height)
+    box = ((width - side) // 2, (height - side) // 2, (width + side) // 2, (height + side) // 2)
+    stem = posixpath.splitext(name)[0]
+    storage = _storage()
+    renditions = {}
+    for label, size in RENDITION_SIZES.items():
+        # Never upscale a small picture
+        size = min(size, side)
+        image = image.resize((size, size), Image.Resampling.LANCZOS, box=box, reducing_gap=2.0)
+        box = None
+        renditions[label] = {
+            extension: storage.save(f'{stem}-{label}.{extension}', _encode(image, format, options))
+            for extension, format, options in RENDITION_FORMATS
+        }
+    return renditions
+
+
+def render_profile_picture(user_id, name):
+    """
+    Render the renditions of ``user_id``'s picture ``name`` unless it was
+    replaced meanwhile or already has them; return whether it rendered.
+    """
+    from .models import User
+
+    current = User.objects.filter(pk=user_id, profile_picture=name).values_list(
+        'profile_picture_renditions', flat=True
+    ).first()
+    if current is None or current:
+        return False
+    try:
+        renditions = render_renditions(name)
+    except (OSError, UnidentifiedImageError, Image.DecompressionBombError) as e:
+        logger.warning('Could not render profile picture %s: %s', name, e)
+        return False
+    if not User.objects.filter(pk=user_id, profile_picture=name, profile_picture_renditions={}).update(
+        profile_picture_renditions=renditions
+    ):
+        # Replaced while rendering, or rendered by a duplicate task
+        _delete(_rendition_names(renditions))
+        return False
+    return True
+
+
+def schedule_renditions(user_id, name):
+    """Render a new profile picture's renditions in the background once the transaction commits."""
+    from .tasks import render_profile_picture_task
+
+    transaction.on_commit(lambda: _enqueue(render_profile_picture_task, user_id, name))
+
+
+def _enqueue(task, user_id, name):
+    try:
+        task.delay(user_id, name)
+    except Exception as e:
+        # Without a broker, render inline rather than never
+        logger.warning('Could not queue %s: %s', task.name, e)
+        render_profile_picture(user_id, name)
+
+
+def delete_picture(name, renditions):
+    """
+    Delete a replaced or deleted profile picture ``name`` and its
+    ``renditions`` (a ``profile_picture_renditions`` value) once the
+    transaction commits.
+    """
+    names = ([name] if name else []) + _rendition_names(renditions)
+    if names:
+        transaction.on_commit(lambda: _delete(names))
+
+
+def _rendition_names(renditions):
+    return [name for formats in (renditions or {}).values() for name in formats.values()]
+
+
+def _delete(names):
+    storage = _storage()
+    for name in names:
+        try:
+            storage.delete(name)
+        except Exception as e:
+            logger.warning('Could not delete profile picture file %s: %s', name, e)
@@ -0,0 +1,159 @@
+"""
+Resumable chunked uploads.
+
+A client declares the file (name, size, purpose) and gets a token, then
+sends the bytes in ``PATCH`` requests, each carrying an ``Upload-Offset``
+header and a raw body. Every chunk is streamed straight into a staging file
+at its offset, so a request only holds a worker for one chunk, and a
+dropped connection resumes from the last offset the server acknowledged.
+Size and extension limits are enforced when the upload is declared, and
+the first chunk must carry the file type's signature.
+
+Once complete, the token is passed to the apply or profile endpoint in
+place of a multipart file.
+"""
+
+import logging
+import os
+from datetime import timedelta
+
+from django.conf import settings  # type: ignore
+from django.core.files import File  # type: ignore
+from django.db import transaction  # type: ignore
+from django.utils import timezone  # type: ignore
+from django.utils.translation import gettext_lazy as _  # type: ignore
+from rest_framework.exceptions import ValidationError  # type: ignore
+
+logger = logging.getLogger(__name__)
+
+STREAM_BLOCK_SIZE = 64 * 1024
+
+# Leading bytes each file type must start with; types not listed aren't checked
+SIGNATURES = {
+    'pdf': (b'%PDF',),
+    'doc': (b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1',),
+    'docx': (b'PK\x03\x04',),
+    'png': (b'\x89PNG\r\n\x1a\n',),
+    'jpg': (b'\xff\xd8\xff',),
+    'jpeg': (b'\xff\xd8\xff',),
+    'gif': (b'GIF87a', b'GIF89a'),
+}
+SIGNATURE_LENGTH = max(len(signature) for signatures in SIGNATURES.values() for signature in signatures)
+
+
+def allowed_extensions(purpose):
+    if purpose == 'profile_picture':
+        return settings.ALLOWED_IMAGE_EXTENSIONS
+    return settings.ALLOWED_FILE_EXTENSIONS
+
+
+def extension(filename):
+    return os.path.splitext(filename)[1].lstrip('.').lower()
+
+
+def staging_path(upload):
+    return os.path.join(settings.UPLOAD_STAGING_ROOT, f'{upload.token.hex}.part')
+
+
+def check_signature(upload, head):
+    signatures = SIGNATURES.get(extension(upload.filename))
+    if signatures and not head.startswith(signatures):
+        # Resending won't help; drop the upload
+        discard(upload)
+        raise ValidationError({'detail': _("File content does not match its .%(extension)s extension.") % {
+            'extension': extension(upload.filename),
+        }})
+
+
+def create_staging_file(upload):
+    os.makedirs(settings.UPLOAD_STAGING_ROOT, exist_ok=True)
+    open(staging_path(upload), 'wb').close()
+
+
+def write_chunk(upload, offset, stream, length):
+    """
+    Write ``length`` bytes from ``stream`` into the staging file at
+    ``offset`` and return the new offset. Returns None when another request
+    moved the upload past ``offset`` first.
+    """
+    from .models import ChunkedUpload
+
+    with open(staging_path(upload), 'r+b') as target:
+        target.seek(offset)
+        remaining = length
+        head = b''
+        while remaining:
+            block = stream.read(min(STREAM_BLOCK_SIZE, remaining))
+            if not block:
+                raise ValidationError({'detail': _("The chunk ended before Content-Length bytes.")})
+            if offset == 0 and len(head) < SIGNATURE_LENGTH:
+                head += block[:SIGNATURE_LENGTH - len(head)]
+                if len(head) == SIGNATURE_LENGTH or remaining == len(block):
+                    check_signature(upload, head)
+            target.write(block)
+            remaining -= len(block)
+
+    # Chunks are written at their offset, so a retried chunk just rewrites the same bytes
+    new_offset = offset + length
+    updated = ChunkedUpload.objects.filter(pk=upload.pk, offset=offset).update(offset=new_offset)
+    if not updated:
+        return None
+    upload.offset = new_offset
+    return new_offset
+
+
+class StagedFile(File):
+    """A completed upload's staging file, which storage may move rather than copy."""
+
+    def temporary_file_path(self):
+        return self.file.name
+
+
+def open_upload(upload):
+    return StagedFile(open(staging_path(upload), 'rb'), name=upload.filename)
+
+
+def store_upload(upload):
+    """Move a completed resume upload into content-addressed storage; return its name."""
+    from .files import store
+
+    with open_upload(upload) as staged:
+        name = store(staged)
+    discard(upload)
+    return name
+
+
+def save_upload(upload, field_file):
+    """Save a completed upload into ``field_file`` (without saving its model)."""
+    with open_upload(upload) as staged:
+        field_file.save(os.path.basename(upload.filename), staged, save=False)
+    discard(upload)
+
+
+def discard(upload):
+    """Delete ``upload`` and, once committed, its staging file."""
+    path = staging_path(upload)
+    upload.delete()
+    transaction.on_commit(lambda: _remove(path))
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning('Could not remove staging file %s: %s', path, e)
+
+
+def purge_expired_uploads():
+    """Delete uploads older than ``UPLOAD_EXPIRY`` seconds; return how many."""
+    from .models import ChunkedUpload
+
+    cutoff = timezone.now() - timedelta(seconds=settings.UPLOAD_EXPIRY)
+    purged = 0
+    for upload in ChunkedUpload.objects.filter(created_at__lt=cutoff).iterator():
+        with transaction.atomic():
+            discard(upload)
+        purged += 1
+    return purged
@@ -1,20 +1,37 @@
 from django.urls import path  # type: ignore
+from rest_framework_simplejwt.views import TokenRefreshView  # type: ignore
 from . import views
 
 urlpatterns = [
     path('auth/register/', views.RegisterView.as_view(), name='register'),
     path('auth/login/', views.LoginView.as_view(), name='login'),
+    path('auth/token/refresh/', TokenRefreshView.as_view(), name='token-refresh'),
+    path('auth/logout/', views.LogoutView.as_view(), name='logout'),
     path('auth/profile/', views.UserProfileView.as_view(), name='profile'),
+    path('auth/profile/skills/', views.UserSkillsView.as_view(), name='profile-skills'),
+    path('users/<int:pk>/resume/', views.UserFileView.as_view(file_field='resume'), name='user-resume'),
+    path(
+        'users/<int:pk>/profile-picture/', views.ProfilePictureView.as_view(),
+        name='user-profile-picture'
+    ),
     path('adverts/', views.JobAdvertListView.as_view(), name='jobadvert-list'),
     path('adverts/<int:pk>/', views.JobAdvertDetailView.as_view(), name='jobadvert-detail'),
     path('adverts/create/', views.JobAdvertCreateView.as_view(), name='jobadvert-create'),
     path('adverts/<int:pk>/update/', views.JobAdvertUpdateView.as_view(), name='jobadvert-update'),
     path('adverts/<int:pk>/delete/', views.JobAdvertDeleteView.as_view(), name='jobadvert-delete'),
     path('adverts/<int:job_advert_id>/apply/', views.JobApplicationCreateView.as_view(), name='jobapplication-create'),
+    path('adverts/<int:pk>/applications/', views.RankedApplicationListView.as_view(), name='jobadvert-applications'),
     path('applications/', views.JobApplicationListView.as_view(), name='jobapplication-list'),
+    path('applications/export/', views.JobApplicationExportView.as_view(), name='jobapplication-export'),
     path('applications/<int:pk>/', views.JobApplicationDetailView.as_view(), name='jobapplication-detail'),
+    path('applications/<int:pk>/resume/', views.JobApplicationResumeView.as_view(), name='jobapplication-resume'),
     path('applications/<int:pk>/update/', views.JobApplicationUpdateView.as_view(), name='jobapplication-update'),
+    path('adverts/recommended/', views.RecommendedJobAdvertsView.as_view(), name='jobadvert-recommended'),
+    path('adverts/cache-stats/', views.ListingCacheStatsView.as_view(), name='jobadvert-cache-stats'),
+    path('uploads/', views.ChunkedUploadCreateView.as_view(), name='upload-create'),
+    path('uploads/<uuid:token>/', views.ChunkedUploadView.as_view(), name='upload-detail'),
     path('skills/', views.SkillListView.as_view(), name='skill-list'),
     path('categories/', views.CategoryListView.as_view(), name='category-list'),
+    path('categories/tree/', views.CategoryTreeView.as_view(), name='category-tree'),
     path('', views.ApiRootView.as_view(), name='api-root'),
 ]
@@ -1,26 +1,58 @@
-from drf_spectacular.utils import extend_schema  # type: ignore
+import os
+
+from drf_spectacular.utils import OpenApiParameter, extend_schema  # type: ignore
 from rest_framework import generics, permissions, status, filters, serializers  # type: ignore
 from rest_framework.response import Response  # type: ignore
 from rest_framework.decorators import api_view  # type: ignore
-from rest_framework_simplejwt.tokens import RefreshToken  # type: ignore
-from django_filters.rest_framework import DjangoFilterBackend  # type: ignore
+from rest_framework.exceptions import NotFound, PermissionDenied, ValidationError  # type: ignore
+from django_filters.rest_framework import DjangoFilterBackend, FilterSet, NumberFilter  # type: ignore
+from django.conf import settings  # type: ignore
+from django.db import transaction  # type: ignore
+from django.db.models import Prefetch, Q  # type: ignore
+from django.http import StreamingHttpResponse  # type: ignore
 from django.shortcuts import get_object_or_404  # type: ignore
 from django.utils import timezone  # type: ignore
+from django.utils.translation import gettext_lazy as _  # type: ignore
 
-from .models import User, JobAdvert, JobApplication, Skill, Category
+from .models import (
+    User, JobAdvert, JobApplication, Skill, Category, JobAdvertSkill, JobAdvertCategory, UserSkill, ChunkedUpload
+)
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserSerializer,
-    JobAdvertSerializer, JobAdvertCreateSerializer, JobApplicationSerializer,
-    JobApplicationCreateSerializer, SkillSerializer, CategorySerializer
+    JobAdvertSerializer, JobAdvertListSerializer, JobAdvertCreateSerializer, JobApplicationSerializer,
+    JobApplicationCreateSerializer, SkillSerializer, CategorySerializer, CategoryTreeSerializer, UserSkillSerializer,
+    RecommendedJobAdvertSerializer, RankedApplicationSerializer, ChunkedUploadSerializer, LogoutSerializer
 )
 from .tasks import send_application_notification_email, send_welcome_email
+from .cache import (
+    ADVERT_LIST_NAMESPACE, AnonymousListCacheMixin, CATEGORIES_NAMESPACE, SKILLS_NAMESPACE, get_generation, get_stats,
+    normalize_query
+)
+from .categories import advert_counts, category_tree, subtree_ids
+from .conditional import (
+    AdvertListETagMixin, ConditionalGetMixin, VersionedListETagMixin, counter_window, make_etag
+)
+from .counters import record_advert_view
+from .downloads import serve
+from .exports import STREAMS, export_rows
+from .facets import FacetCountsMixin
+from .fieldsets import SparseFieldsetMixin
+from .pagination import KeysetCursorPagination
+from .recommendations import recommend_adverts
+from .revocation import RevocableRefreshToken
+from .renderers import CSVStreamRenderer, FileRenderer, NDJSONStreamRenderer, ORJSONRenderer
 from .permissions import IsOwnerOrReadOnly
+from .search import JobAdvertSearchFilter, SearchOrderingFilter
+from .throttling import ApplyThrottle, LoginThrottle, RegisterThrottle
+from .thumbnails import RENDITION_EXTENSIONS, RENDITION_SIZES
+from .uploads import discard, write_chunk
 
 
 class RegisterView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [RegisterThrottle]
 
     def perform_create(self, serializer):
         user = serializer.save()
@@ -36,13 +68,14 @@ class RegisterView(generics.CreateAPIView):
 class LoginView(generics.GenericAPIView):
     serializer_class = UserLoginSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_classes = [LoginThrottle]
 
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
         
-        refresh = RefreshToken.for_user(user)
+        refresh = RevocableRefreshToken.for_user(user)
         
         return Response({
             'user': UserSerializer(user).data,
@@ -51,35 +84,74 @@ class LoginView(generics.GenericAPIView):
         })
 
 
+class LogoutView(generics.GenericAPIView):
+    """Revoke the given refresh token and the access token the request carries."""
+    serializer_class = LogoutSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.validated_data['refresh'].revoke()
+        request.auth.revoke()
+        return Response(status=status.HTTP_205_RESET_CONTENT)
+
+
 class UserProfileView(generics.RetrieveUpdateAPIView):
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_object(self):
-        return self.request.user
+        # request.user only carries the cached authentication fields
+        return User.objects.get(pk=self.request.user.pk)
 
 
-class JobAdvertListView(generics.ListAPIView):
-    serializer_class = JobAdvertSerializer
+# Columns needed by JobAdvertListSerializer; the large text fields stay on disk
+ADVERT_LIST_FIELDS = (
+    'id', 'title', 'location', 'job_type', 'experience_level', 'salary_min',
+    'salary_max', 'salary_currency', 'is_remote', 'application_deadline',
+    'is_active', 'views_count', 'applications_count', 'created_at',
+    'employer__id', 'employer__username', 'employer__company_name',
+)
+
+
+def advert_list_queryset():
+    """Active adverts with just what JobAdvertListSerializer reads."""
+    return JobAdvert.objects.filter(is_active=True).select_related('employer').only(
+        *ADVERT_LIST_FIELDS
+    ).prefetch_related(
+        Prefetch('skills', queryset=JobAdvertSkill.objects.select_related('skill').only(
+            'job_advert_id', 'importance_level', 'skill__id', 'skill__name'
+        )),
+        Prefetch('categories', queryset=JobAdvertCategory.objects.select_related('category').only(
+            'job_advert_id', 'category__id', 'category__name'
+        )),
+    )
+
+
+class JobAdvertListView(
+    AdvertListETagMixin, AnonymousListCacheMixin, FacetCountsMixin, SparseFieldsetMixin, generics.ListAPIView
+):
+    serializer_class = JobAdvertListSerializer
     permission_classes = [permissions.AllowAny]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
+    pagination_class = KeysetCursorPagination
+    filter_backends = [DjangoFilterBackend, JobAdvertSearchFilter, SearchOrderingFilter]
     filterset_fields = ['job_type', 'experience_level', 'is_remote', 'is_active']
-    search_fields = ['title', 'description', 'requirements', 'location']
-    ordering_fields = ['created_at', 'salary_min', 'salary_max', 'views_count']
+    ordering_fields = ['created_at', 'salary_min', 'salary_max', 'views_count', 'relevance']
     ordering = ['-created_at']
 
     def get_queryset(self):
-        queryset = JobAdvert.objects.filter(is_active=True).prefetch_related('skills__skill', 'categories__category')
+        queryset = advert_list_queryset()
         
         # Filter by skills
         skills = self.request.query_params.getlist('skills')
         if skills:
             queryset = queryset.filter(skills__skill_id__in=skills).distinct()
         
-        # Filter by categories
+        # Filter by categories, subcategories included
         categories = self.request.query_params.getlist('categories')
         if categories:
-            queryset = queryset.filter(categories__category_id__in=categories).distinct()
+            queryset = queryset.filter(categories__category_id__in=subtree_ids(categories)).distinct()
         
         # Filter by salary range
         min_salary = self.request.query_params.get('min_salary')
@@ -97,15 +169,48 @@ class JobAdvertListView(generics.ListAPIView):
         return queryset
 
 
-class JobAdvertDetailView(generics.RetrieveAPIView):
+class JobAdvertDetailView(ConditionalGetMixin, SparseFieldsetMixin, generics.RetrieveAPIView):
     serializer_class = JobAdvertSerializer
     permission_classes = [permissions.AllowAny]
-    queryset = JobAdvert.objects.filter(is_active=True)
+    queryset = JobAdvert.objects.filter(is_active=True).select_related('employer').prefetch_related(
+        'skills__skill', 'categories__category'
+    )
+
+    def get_etag(self, request):
+        # Weak: views_count is buffered and may trail by a counter window
+        self.validators = JobAdvert.objects.filter(pk=self.kwargs['pk'], is_active=True).values_list(
+            'updated_at', 'applications_count'
+        ).first()
+        if self.validators is None:
+            return None
+        try:
+            # Skill and category edits bump the listing generation, not updated_at
+            generation = get_generation()
+        except Exception:
+            return None
+        updated_at, applications_count = self.validators
+        # JSON and msgpack bodies, and each ?fields= selection, are different representations
+        return make_etag(
+            'advert', self.kwargs['pk'], updated_at.isoformat(), applications_count, generation, counter_window(),
+            request.accepted_renderer.format, normalize_query(request.query_params), weak=True,
+        )
+
+    def get_last_modified(self, request):
+        return self.validators[0] if self.validators else None
+
+    def get(self, request, *args, **kwargs):
+        response = super().get(request, *args, **kwargs)
+        if response.status_code == 304:
+            # A revalidated view is still a view
+            record_advert_view(self.kwargs['pk'])
+        return response
 
     def retrieve(self, request, *args, **kwargs):
         instance = self.get_object()
-        instance.views_count += 1
-        instance.save()
+        # Views are buffered in Redis and flushed by flush_advert_view_counts
+        views = record_advert_view(instance.pk)
+        if 'views_count' not in instance.get_deferred_fields():
+            instance.views_count += views
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
@@ -140,39 +245,224 @@ class JobAdvertDeleteView(generics.DestroyAPIView):
 
 
 
-class JobApplicationListView(generics.ListAPIView):
+def application_queryset():
+    """Applications with everything JobApplicationSerializer reads."""
+    return JobApplication.objects.select_related('job_seeker', 'job_advert__employer').prefetch_related(
+        Prefetch('job_advert__skills', queryset=JobAdvertSkill.objects.select_related('skill')),
+        Prefetch('job_advert__categories', queryset=JobAdvertCategory.objects.select_related('category')),
+    )
+
+
+class JobApplicationFilter(FilterSet):
+    job_advert_id = NumberFilter(field_name='job_advert_id')
+
+    class Meta:
+        model = JobApplication
+        fields = ['status', 'job_advert_id']
+
+
+class JobApplicationListView(SparseFieldsetMixin, generics.ListAPIView):
+    """
+    Application inbox. Job seekers see their own applications; employers see
+    applications to any of their adverts, optionally narrowed by
+    ``job_advert_id`` and ``status``.
+    """
     serializer_class = JobApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter, filters.OrderingFilter]
-    filterset_fields = ['status']
+    pagination_class = KeysetCursorPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_class = JobApplicationFilter
     ordering_fields = ['applied_at', 'updated_at']
     ordering = ['-applied_at']
 
-   
     def get_queryset(self):
         if getattr(self, "swagger_fake_view", False):
             return JobApplication.objects.none()
-        if not self.request.user.is_authenticated:
+        user = self.request.user
+        if user.user_type == 'employer':
+            # Denormalized employer column, served by jobapp_employer_*_idx
+            return application_queryset().filter(employer=user)
+        return application_queryset().filter(job_seeker=user)
+
+
+class JSONErrorsMixin:
+    """For views answering with files: errors are JSON whichever format was asked for."""
+
+    def handle_exception(self, exc):
+        request = self.request
+        request.accepted_renderer, request.accepted_media_type = ORJSONRenderer(), ORJSONRenderer.media_type
+        return super().handle_exception(exc)
+
+
+class JobApplicationExportView(JSONErrorsMixin, generics.GenericAPIView):
+    """
+    Every application to the employer's adverts as a streamed CSV (default)
+    or NDJSON file, picked with ``Accept`` or ``?format=csv|ndjson``.
+    Accepts the inbox's ``job_advert_id`` and ``status`` filters.
+    """
+    serializer_class = EmptySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [CSVStreamRenderer, NDJSONStreamRenderer]
+    filter_backends = [DjangoFilterBackend]
+    filterset_class = JobApplicationFilter
+    pagination_class = None
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):
+            return JobApplication.objects.none()
+        return JobApplication.objects.filter(employer=self.request.user)
+
+    def get(self, request):
+        if request.user.user_type != 'employer':
+            raise PermissionDenied(_("Only employers can export applications."))
+        renderer = request.accepted_renderer
+        rows = export_rows(self.filter_queryset(self.get_queryset()), request)
+        response = StreamingHttpResponse(
+            STREAMS[renderer.format](rows), content_type=f'{renderer.media_type}; charset={renderer.charset}'
+        )
+        filename = f'applications-{timezone.now():%Y%m%d}.{renderer.format}'
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        # Let a fronting nginx pass chunks straight through
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+
+class FileDownloadView(JSONErrorsMixin, generics.GenericAPIView):
+    """
+    Base for views answering with the file in ``file_field`` of one object
+    from ``get_queryset()``, which decides who may read it. Range requests
+    and sendfile offload are handled by ``core.downloads``.
+    """
+    serializer_class = EmptySerializer
+    permission_classes = [permissions.IsAuthenticated]
+    renderer_classes = [ORJSONRenderer, FileRenderer]
+    filter_backends = []
+    file_field = None
+
+    def get_file(self, obj):
+        return getattr(obj, self.file_field)
+
+    def get_filename(self, obj, field_file):
+        return None
+
+    def get(self, request, *args, **kwargs):
+        obj = self.get_object()
+        field_file = self.get_file(obj)
+        if not field_file:
+            raise NotFound(_("No file has been uploaded."))
+        try:
+            return serve(request, field_file, self.get_filename(obj, field_file))
+        except FileNotFoundError:
+            raise NotFound(_("The file is no longer available."))
+
+
+class JobApplicationResumeView(FileDownloadView):
+    """An application's resume, for the applicant and the advert's employer."""
+    file_field = 'resume'
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):
             return JobApplication.objects.none()
-        return JobApplication.objects.filter(user_type=self.request.user.user_type)
+        user = self.request.user
+        return JobApplication.objects.filter(Q(job_seeker=user) | Q(employer=user)).only('id', 'resume')
 
+    def get_filename(self, obj, field_file):
+        return f'application-{obj.pk}-resume{os.path.splitext(field_file.name)[1]}'
 
 
-class JobApplicationDetailView(generics.RetrieveAPIView):
+class UserFileView(FileDownloadView):
+    """
+    A user's profile resume or picture, for the user and employers they
+    have applied to.
+    """
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):
+            return User.objects.none()
+        user = self.request.user
+        applicants = JobApplication.objects.filter(employer=user).values('job_seeker')
+        return User.objects.filter(Q(pk=user.pk) | Q(pk__in=applicants)).only('id', 'username', self.file_field)
+
+    def get_filename(self, obj, field_file):
+        return f'{obj.username}-{self.file_field.replace("_", "-")}{os.path.splitext(field_file.name)[1]}'
+
+
+@extend_schema(parameters=[
+    OpenApiParameter('size', str, enum=list(RENDITION_SIZES), description='A square rendition instead of the original'),
+    # Not "format", which DRF reads to pick a renderer
+    OpenApiParameter('image_format', str, enum=list(RENDITION_EXTENSIONS),
+                     description='Rendition format (default webp)'),
+])
+class ProfilePictureView(UserFileView):
+    """A user's profile picture, or one of its renditions with ``?size=``."""
+    file_field = 'profile_picture'
+
+    def get_queryset(self):
+        return super().get_queryset().only('id', 'username', 'profile_picture', 'profile_picture_renditions')
+
+    def get_file(self, obj):
+        size = self.request.query_params.get('size')
+        if not size:
+            return obj.profile_picture
+        extension = self.request.query_params.get('image_format', RENDITION_EXTENSIONS[0])
+        if size not in RENDITION_SIZES:
+            raise ValidationError({'size': _("Choose from %(sizes)s.") % {'sizes': ', '.join(RENDITION_SIZES)}})
+        if extension not in RENDITION_EXTENSIONS:
+            raise ValidationError(
+                {'image_format': _("Choose from %(formats)s.") % {'formats': ', '.join(RENDITION_EXTENSIONS)}}
+            )
+        name = obj.profile_picture_renditions.get(size, {}).get(extension)
+        if not name:
+            raise NotFound(_("This size hasn't been rendered yet."))
+        field = User._meta.get_field('profile_picture')
+        return field.attr_class(obj, field, name)
+
+    def get_filename(self, obj, field_file):
+        size = self.request.query_params.get('size')
+        if not size:
+            return super().get_filename(obj, field_file)
+        return f'{obj.username}-profile-picture-{size}{os.path.splitext(field_file.name)[1]}'
+
+
+class RankedApplicationListView(SparseFieldsetMixin, generics.ListAPIView):
+    """
+    Applications to one of the employer's adverts, best skill match first.
+    Scores are precomputed by core.ranking, so this is one indexed query.
+    """
+    serializer_class = RankedApplicationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetCursorPagination
+    filter_backends = [DjangoFilterBackend, filters.OrderingFilter]
+    filterset_fields = ['status']
+    ordering_fields = ['match_score', 'applied_at']
+    ordering = ['-match_score']
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):
+            return JobApplication.objects.none()
+        advert = get_object_or_404(JobAdvert.objects.only('id'), pk=self.kwargs['pk'], employer=self.request.user)
+        return JobApplication.objects.filter(job_advert=advert).select_related('job_seeker').only(
+            'id', 'status', 'match_score', 'resume', 'applied_at', 'job_seeker__id',
+            'job_seeker__username', 'job_seeker__first_name', 'job_seeker__last_name', 'job_seeker__location',
+        )
+
+
+class JobApplicationDetailView(SparseFieldsetMixin, generics.RetrieveAPIView):
     serializer_class = JobApplicationSerializer
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
         if user.user_type == 'employer':
-            return JobApplication.objects.filter(job_advert__employer=user)
+            return application_queryset().filter(job_advert__employer=user)
         else:
-            return JobApplication.objects.filter(job_seeker=user)
+            return application_queryset().filter(job_seeker=user)
 
 
 class JobApplicationCreateView(generics.CreateAPIView):
     serializer_class = JobApplicationCreateSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_classes = [ApplyThrottle]
 
     def create(self, request, *args, **kwargs):
         job_advert_id = kwargs.get('job_advert_id')
@@ -197,7 +487,7 @@ class JobApplicationCreateView(generics.CreateAPIView):
             pass
         
         return Response(
-            JobApplicationSerializer(serializer.instance).data,
+            JobApplicationSerializer(serializer.instance, context=self.get_serializer_context()).data,
             status=status.HTTP_201_CREATED,
             headers=headers
         )
@@ -215,18 +505,155 @@ class JobApplicationUpdateView(generics.UpdateAPIView):
             return JobApplication.objects.filter(job_seeker=user)
 
 
-class SkillListView(generics.ListAPIView):
+class UserSkillsView(SparseFieldsetMixin, generics.ListAPIView):
+    """
+    The signed-in user's skill profile. PUT replaces the whole list.
+    """
+    serializer_class = UserSkillSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = None
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):
+            return UserSkill.objects.none()
+        return UserSkill.objects.filter(user=self.request.user).select_related('skill').order_by('skill__name')
+
+    def put(self, request):
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        levels = {item['skill'].pk: item['proficiency_level'] for item in serializer.validated_data}
+        with transaction.atomic():
+            UserSkill.objects.filter(user=request.user).delete()
+            UserSkill.objects.bulk_create([
+                UserSkill(user=request.user, skill_id=skill_id, proficiency_level=level)
+                for skill_id, level in levels.items()
+            ])
+        return self.list(request)
+
+
+class RecommendedJobAdvertsView(SparseFieldsetMixin, generics.GenericAPIView):
+    """
+    Active adverts ranked by how well their skills match the job seeker's
+    skill profile. Adverts already applied to are left out.
+    """
+    serializer_class = RecommendedJobAdvertSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    default_limit = 20
+    max_limit = 100
+
+    def get(self, request):
+        if request.user.user_type != 'job_seeker':
+            raise PermissionDenied(_("Only job seekers get recommendations."))
+        try:
+            limit = min(int(request.query_params.get('limit', self.default_limit)), self.max_limit)
+            if limit < 1:
+                raise ValueError
+        except ValueError:
+            raise ValidationError({'limit': _("Must be a positive integer.")})
+
+        matches = recommend_adverts(request.user, limit)
+        adverts = self.sparse_queryset(advert_list_queryset()).in_bulk([advert_id for advert_id, _score in matches])
+        results = []
+        for advert_id, score in matches:
+            # The matrix can trail the database briefly; skip adverts gone since
+            if advert_id in adverts:
+                adverts[advert_id].match_score = score
+                results.append(adverts[advert_id])
+        return Response({'results': self.get_serializer(results, many=True).data})
+
+
+class ChunkedUploadCreateView(generics.CreateAPIView):
+    """
+    Start a resumable upload by declaring the file's name, size and purpose.
+    Send the bytes to the returned token's endpoint; see ``core.uploads``.
+    """
+    serializer_class = ChunkedUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+
+
+class ChunkedUploadView(generics.RetrieveDestroyAPIView):
+    """
+    GET reports how many bytes arrived, PATCH appends the next chunk (raw
+    body, ``Upload-Offset`` header) and DELETE cancels the upload.
+    """
+    serializer_class = ChunkedUploadSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    lookup_field = 'token'
+
+    def get_queryset(self):
+        if getattr(self, "swagger_fake_view", False):
+            return ChunkedUpload.objects.none()
+        return ChunkedUpload.objects.filter(user=self.request.user)
+
+    def offset_response(self, upload, status_code=status.HTTP_200_OK):
+        return Response(self.get_serializer(upload).data, status=status_code, headers={'Upload-Offset': str(upload.offset)})
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.offset_response(self.get_object())
+
+    def patch(self, request, *args, **kwargs):
+        upload = self.get_object()
+        try:
+            offset = int(request.headers['Upload-Offset'])
+            length = int(request.META['CONTENT_LENGTH'])
+        except (KeyError, ValueError):
+            raise ValidationError({'detail': _("Upload-Offset and Content-Length headers are required.")})
+        if offset != upload.offset:
+            # Resume from where the server actually is
+            return self.offset_response(upload, status.HTTP_409_CONFLICT)
+        if length < 1 or length > settings.UPLOAD_MAX_CHUNK_SIZE or offset + length > upload.size:
+            return Response(
+                {'detail': _("Chunks must be 1 to %(max)d bytes and end within the declared size.") % {
+                    'max': settings.UPLOAD_MAX_CHUNK_SIZE,
+                }},
+                status=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            )
+        if write_chunk(upload, offset, request.stream, length) is None:
+            upload.refresh_from_db()
+            return self.offset_response(upload, status.HTTP_409_CONFLICT)
+        return self.offset_response(upload)
+
+    def perform_destroy(self, instance):
+        discard(instance)
+
+
+class ListingCacheStatsView(generics.GenericAPIView):
+    serializer_class = EmptySerializer
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        return Response(get_stats())
+
+
+class SkillListView(VersionedListETagMixin, SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = SkillSerializer
+    etag_namespace = SKILLS_NAMESPACE
     permission_classes = [permissions.AllowAny]
     queryset = Skill.objects.all()
 
 
-class CategoryListView(generics.ListAPIView):
+class CategoryListView(VersionedListETagMixin, SparseFieldsetMixin, generics.ListAPIView):
     serializer_class = CategorySerializer
+    etag_namespace = CATEGORIES_NAMESPACE
     permission_classes = [permissions.AllowAny]
     queryset = Category.objects.all()
 
 
+class CategoryTreeView(VersionedListETagMixin, generics.ListAPIView):
+    """Every category nested under its parent, counting active adverts in it or any subcategory."""
+    serializer_class = CategoryTreeSerializer
+    # Category edits bump the listing generation as well, and so do the advert changes behind the counts
+    etag_namespace = ADVERT_LIST_NAMESPACE
+    permission_classes = [permissions.AllowAny]
+    pagination_class = None
+    filter_backends = []
+    queryset = Category.objects.all()
+
+    def list(self, request, *args, **kwargs):
+        roots = category_tree(list(self.get_queryset()), advert_counts())
+        return Response(self.get_serializer(roots, many=True).data)
+
+
 @extend_schema(exclude=True)
 class ApiRootView(generics.GenericAPIView):
     permission_classes = [permissions.AllowAny]
@@ -238,7 +665,12 @@ class ApiRootView(generics.GenericAPIView):
             'auth': {
                 'register': '/auth/register/',
                 'login': '/auth/login/',
+                'refresh': '/api/auth/token/refresh/',
+                'logout': '/api/auth/logout/',
                 'profile': '/auth/profile/',
+                'skills': '/auth/profile/skills/',
+                'user_resume': '/api/users/{id}/resume/',
+                'user_profile_picture': '/api/users/{id}/profile-picture/',
             },
             'job_adverts': {
                 'list': '/api/adverts/',
@@ -246,12 +678,20 @@ class ApiRootView(generics.GenericAPIView):
                 'create': '/api/adverts/create/',
                 'update': '/api/adverts/{id}/update/',
                 'delete': '/api/adverts/{id}/delete/',
+                'recommended': '/api/adverts/recommended/',
+                'ranked_applications': '/api/adverts/{id}/applications/',
             },
             'applications': {
                 'list': '/api/applications/',
                 'detail': '/api/applications/{id}/',
                 'create': '/api/adverts/{id}/apply/',
                 'update': '/api/applications/{id}/update/',
+                'export': '/api/applications/export/',
+                'resume': '/api/applications/{id}/resume/',
+            },
+            'uploads': {
+                'create': '/api/uploads/',
+                'detail': '/api/uploads/{token}/',
             },
             'skills': '/api/skills/',
         'categories': '/api/categories/',